@@ -18,6 +18,23 @@ WIN_TITLE = "ao Locator Follow Rig Tool"
 # control names
 CHK_FREEZE = "chkFreeze"
 BTN_APPLY  = "aoLocatorFollowRigTool_btnApply"
+OPT_MODE   = "aoLocatorFollowRigTool_optMode"
+TXT_CSV    = "aoLocatorFollowRigTool_txtCsv"
+OPT_RIG    = "aoLocatorFollowRigTool_optRig"
+
+# mode menu label -> pair mode (None: single rig from 2 selected)
+MODES = [
+    ("2つ選択 (1リグ)", None),
+    ("一括: 交互選択 (ドライバー, ターゲット, ...)", system.PAIRS_ALTERNATING),
+    ("一括: 1ドライバー → 複数ターゲット", system.PAIRS_ONE_TO_MANY),
+    ("一括: CSV (driver,target)", "csv"),
+]
+
+# rig menu label -> rig mode
+RIG_MODES = [
+    ("parentConstraint", system.RIG_CONSTRAINT),
+    ("マトリクス (offsetParentMatrix / 軽量)", system.RIG_MATRIX),
+]
 
 
 def _close_existing():
@@ -27,7 +44,42 @@ def _close_existing():
 
 def _on_apply(*args):
     do_freeze = cmds.checkBox(CHK_FREEZE, q=True, v=True)
-    system.build_follow_rig(do_freeze=do_freeze)
+    mode = MODES[cmds.optionMenu(OPT_MODE, q=True, select=True) - 1][1]
+    rig_mode = RIG_MODES[cmds.optionMenu(OPT_RIG, q=True, select=True) - 1][1]
+
+    if mode is None:
+        system.build_follow_rig(do_freeze=do_freeze, mode=rig_mode)
+        return
+
+    if mode == "csv":
+        path = cmds.textFieldButtonGrp(TXT_CSV, q=True, text=True).strip()
+        if not path:
+            cmds.warning("[ao] CSV ファイルを指定してください")
+            return
+        try:
+            pairs = system.read_pairs_csv(path)
+        except (OSError, ValueError) as e:
+            # missing / unreadable file, or not UTF-8 / malformed CSV
+            cmds.warning(f"[ao] CSV を読み込めません: {path} ({e})")
+            return
+    else:
+        pairs = system.pairs_from_selection(mode)
+
+    if not pairs:
+        cmds.warning("[ao] ペアがありません（選択または CSV を確認してください）")
+        return
+    system.build_follow_rigs(pairs, do_freeze=do_freeze, mode=rig_mode)
+
+
+def _on_mode_changed(*args):
+    is_csv = MODES[cmds.optionMenu(OPT_MODE, q=True, select=True) - 1][1] == "csv"
+    cmds.textFieldButtonGrp(TXT_CSV, e=True, enable=is_csv)
+
+
+def _on_browse_csv(*args):
+    picked = cmds.fileDialog2(fileFilter="CSV (*.csv)", fileMode=1, caption="driver,target CSV") or []
+    if picked:
+        cmds.textFieldButtonGrp(TXT_CSV, e=True, text=picked[0])
 
 
 def run():
@@ -35,7 +87,7 @@ def run():
     _close_existing()
 
     # window
-    cmds.window(WIN_NAME, title=WIN_TITLE, sizeable=True, widthHeight=(300, 160))
+    cmds.window(WIN_NAME, title=WIN_TITLE, sizeable=True, widthHeight=(300, 250))
 
     # --- layout
     # 画像みたいにシンプルに：タイトル / apply / フリーズチェック
@@ -44,6 +96,24 @@ def run():
     cmds.text(label=WIN_TITLE, align="center")
     cmds.separator(style="none", height=6)
 
+    cmds.optionMenu(OPT_MODE, label="", changeCommand=_on_mode_changed)
+    for label, _ in MODES:
+        cmds.menuItem(label=label)
+
+    cmds.optionMenu(OPT_RIG, label="")
+    for label, _ in RIG_MODES:
+        cmds.menuItem(label=label)
+
+    cmds.textFieldButtonGrp(
+        TXT_CSV,
+        label="CSV",
+        buttonLabel="...",
+        columnWidth3=(30, 220, 30),
+        adjustableColumn=2,
+        enable=False,
+        buttonCommand=_on_browse_csv
+    )
+
     cmds.button(
         BTN_APPLY,
         label="apply",
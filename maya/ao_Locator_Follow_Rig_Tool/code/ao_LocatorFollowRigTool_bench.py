@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+ao_LocatorFollowRigTool_bench.py
+
+Locator Follow Rig Tool - benchmark scene generator (dev only, not installed)
+- Builds N animated drivers + N targets (under an offset parent) per rig mode
+- Builds the follow rigs with build_follow_rigs (RIG_CONSTRAINT / RIG_MATRIX)
+- Compares nodes added, build time / cmds calls and evaluation cost per frame
+  (timeline stepped with currentTime, every target worldMatrix pulled with one dgeval)
+- Checks both modes end on the same target positions
+- Deletes the scratch nodes afterwards
+- Runs in Maya (Script Editor / mayapy) or in plain Python against ao_devtools/ao_fake_cmds
+  (the stand-in does not evaluate: only node counts and build calls mean anything there;
+  evaluation cost and the position check can only be measured in Maya, elsewhere they print n/a)
+
+Usage (Maya):
+    import ao_LocatorFollowRigTool_bench as bench
+    bench.bench_modes(count=1000, frames=100)
+
+Usage (plain Python, no Maya license):
+    python maya/ao_Locator_Follow_Rig_Tool/code/ao_LocatorFollowRigTool_bench.py 1000
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+_DEVTOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "ao_devtools")
+if _DEVTOOLS_DIR not in sys.path:
+    sys.path.append(_DEVTOOLS_DIR)
+
+try:
+    import maya.cmds as cmds
+except ImportError:
+    # plain Python: run against the in-memory stand-in
+    import ao_fake_cmds
+    cmds = ao_fake_cmds.install()
+
+import ao_cmds_trace
+import ao_LocatorFollowRigTool_system as system
+
+
+SCRATCH_GROUP = "aoFollowBench_grp"
+TARGET_PARENT = "aoFollowBenchTargets_grp"
+MODES = (system.RIG_CONSTRAINT, system.RIG_MATRIX)
+
+
+# ----------------------------
+# Scratch scene
+# ----------------------------
+
+def build_bench_scene(count: int, frames: int = 100) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    `count` drivers keyed over 1..frames (translate + rotate) and `count` targets
+    under one offset parent (so matrix mode needs the parent inverse).
+    Returns (scratch group long name, (driver, target) long name pairs).
+    """
+    grp = cmds.createNode("transform", name=SCRATCH_GROUP)
+    target_parent = cmds.createNode("transform", name=TARGET_PARENT, parent=grp)
+    cmds.xform(target_parent, translation=(0.0, 5.0, 0.0))
+
+    drivers: List[str] = []
+    targets: List[str] = []
+    for i in range(count):
+        drivers.append(cmds.createNode("transform", name=f"aoFollowBench_drv_{i}", parent=grp))
+        targets.append(cmds.createNode("transform", name=f"aoFollowBench_tgt_{i}", parent=target_parent))
+
+    for i, (d, t) in enumerate(zip(drivers, targets)):
+        cmds.xform(d, translation=(float(i % 100), 0.0, float(i // 100)))
+        cmds.xform(t, translation=(float(i % 100), 1.0, float(i // 100)))
+        cmds.setKeyframe(d, attribute="translateY", time=1, value=0.0)
+        cmds.setKeyframe(d, attribute="translateY", time=frames, value=10.0)
+        cmds.setKeyframe(d, attribute="rotateY", time=1, value=0.0)
+        cmds.setKeyframe(d, attribute="rotateY", time=frames, value=90.0)
+
+    grp_long = cmds.ls(grp, long=True)[0]
+    return grp_long, list(zip(cmds.ls(drivers, long=True) or [], cmds.ls(targets, long=True) or []))
+
+
+def _delete_rigs(grp: str, results: Sequence[system.FollowRigResult]) -> None:
+    doomed = [grp]
+    for r in results:
+        doomed.extend(n for n in [r.group] + r.utility_nodes if n)
+    doomed = [n for n in doomed if cmds.objExists(n)]
+    if doomed:
+        cmds.delete(doomed)
+
+
+# ----------------------------
+# Measuring
+# ----------------------------
+
+def _node_types() -> Dict[str, str]:
+    listed = cmds.ls(long=True, showType=True) or []
+    return dict(zip(listed[0::2], listed[1::2]))
+
+
+def _added_nodes(before: Dict[str, str]) -> Dict[str, int]:
+    """
+    Node count per type for nodes that were not in `before`.
+    """
+    counts: Dict[str, int] = {}
+    for node, node_type in _node_types().items():
+        if node not in before:
+            counts[node_type] = counts.get(node_type, 0) + 1
+    return counts
+
+
+def _time_playback(targets: Sequence[str], frames: int) -> float:
+    """
+    Seconds per frame to step 1..frames and pull every target worldMatrix.
+    """
+    plugs = [f"{t}.worldMatrix" for t in targets]
+    cmds.currentTime(1, update=True)
+    t0 = time.perf_counter()
+    for frame in range(1, frames + 1):
+        cmds.currentTime(frame, update=True)
+        cmds.dgeval(plugs)
+    return (time.perf_counter() - t0) / max(1, frames)
+
+
+def _evaluation_mode() -> str:
+    try:
+        return str(cmds.evaluationManager(q=True, mode=True)[0])
+    except Exception:
+        return "n/a"
+
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+
+def bench_modes(count: int = 1000, frames: int = 100, modes: Sequence[str] = MODES) -> List[Dict[str, object]]:
+    """
+    Build the same scene once per rig mode and compare
+    nodes added, build time, cmds calls and evaluation cost per frame.
+    Evaluation cost (frame_seconds) is only measured in Maya: without an evaluation
+    manager (the stand-in) it is None and printed as n/a.
+    """
+    rows: List[Dict[str, object]] = []
+    final_positions: Dict[str, List[float]] = {}
+    evaluation = _evaluation_mode()
+    evaluated = evaluation != "n/a"
+
+    for mode in modes:
+        grp, pairs = build_bench_scene(count, frames)
+        results: List[system.FollowRigResult] = []
+        try:
+            before = _node_types()
+            with ao_cmds_trace.trace_cmds(system) as stats:
+                t0 = time.perf_counter()
+                results = system.build_follow_rigs(pairs, do_freeze=True, mode=mode)
+                build_seconds = time.perf_counter() - t0
+            added = _added_nodes(before)
+
+            targets = [t for _, t in pairs]
+            per_frame = None
+            if evaluated:
+                per_frame = _time_playback(targets, frames)
+                final_positions[mode] = cmds.xform(targets, q=True, ws=True, t=True) or []
+
+            rows.append({
+                "mode": mode,
+                "rigs": sum(1 for r in results if r.ok),
+                "nodes": sum(added.values()),
+                "node_types": added,
+                "calls": stats.total_calls,
+                "build_seconds": build_seconds,
+                "frame_seconds": per_frame,
+            })
+        finally:
+            _delete_rigs(grp, results)
+
+    print(f"=== ao_LocatorFollowRigTool bench: {count} rigs, {frames} frames, evaluation: {evaluation} ===")
+    for r in rows:
+        types = ", ".join(f"{k}={v}" for k, v in sorted(r["node_types"].items(), key=lambda kv: -kv[1]))
+        if r["frame_seconds"] is None:
+            frame = f"{'n/a':>8} ms/frame ({'n/a':>7} fps)"
+        else:
+            fps = 1.0 / r["frame_seconds"] if r["frame_seconds"] else 0.0
+            frame = f"{r['frame_seconds'] * 1000.0:8.3f} ms/frame ({fps:7.1f} fps)"
+        print(f"{r['mode']:<12} rigs: {r['rigs']:>6}  nodes: {r['nodes']:>7}  calls: {r['calls']:>7}  "
+              f"build: {r['build_seconds'] * 1000.0:10.2f} ms  eval: {frame}  ({types})")
+
+    if len(final_positions) > 1:
+        first, *others = final_positions.values()
+        deviation = max((abs(a - b) for other in others for a, b in zip(first, other)), default=0.0)
+        print(f"max target position difference between modes at frame {frames}: {deviation:.6f}")
+    elif not evaluated and len(modes) > 1:
+        print(f"max target position difference between modes at frame {frames}: n/a (not evaluated)")
+
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Manual test (Script Editor / command line)
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    _args = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    bench_modes(*_args[:2])
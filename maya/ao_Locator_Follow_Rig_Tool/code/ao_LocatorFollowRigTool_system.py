@@ -10,63 +10,429 @@ Core system:
 - ParentConstraints (ALL keepOffset ON)
     Selection1 -> group
     locator    -> Selection2
+- Or matrix mode (mode=RIG_MATRIX): no constraints, driven through offsetParentMatrix
+    Selection1.worldMatrix -> group.offsetParentMatrix (direct, offset folded into the group)
+    locator.worldMatrix    -> Selection2.offsetParentMatrix (multMatrix, or direct)
+  keep-offset matrices are computed once at build time. Unlike parentConstraint,
+  the matrix chain also follows the driver's scale (and shear)
+- Optional cmds call tracing (run_follow_rig(trace=True), needs ao_devtools/ao_cmds_trace)
+- Batch build for many pairs (build_follow_rigs): one undo chunk,
+  one matrix query for every target (matrix mode: also one for the target locals
+  and one for the drivers), one freeze for every group
+    pairs from selection: alternating (driver, target, driver, target ...)
+                          or one driver -> many targets
+    pairs from CSV: driver,target per row
 """
 
+import csv
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
 import maya.cmds as cmds
 
+try:
+    import ao_cmds_trace
+except ImportError:  # ao_devtools not on sys.path -> trace is ignored
+    ao_cmds_trace = None
+
+
+# How a selection is split into (driver, target) pairs
+PAIRS_ALTERNATING = "alternating"  # driver1, target1, driver2, target2, ...
+PAIRS_ONE_TO_MANY = "one_to_many"  # driver, target1, target2, ...
+
+# How the group / target follow
+RIG_CONSTRAINT = "constraint"  # two parentConstraints (keepOffset ON)
+RIG_MATRIX = "matrix"  # offsetParentMatrix connections, no constraint nodes
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+
+@dataclass
+class FollowRigResult:
+    locator: Optional[str]
+    group: Optional[str]
+    freeze: bool
+    status: str  # "built" / "failed"
+    message: str = ""
+    cmds_stats: Optional[Any] = None  # ao_cmds_trace.CmdsStats when trace=True
+    driver: Optional[str] = None  # Selection1 (drives the group)
+    target: Optional[str] = None  # Selection2 (driven by the locator)
+    mode: str = RIG_CONSTRAINT
+    utility_nodes: List[str] = field(default_factory=list)  # multMatrix nodes (RIG_MATRIX, target side only)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "built"
+
 
-def _get_transform(node: str) -> str:
-    """Return transform even if a shape is selected."""
-    if not node or not cmds.objExists(node):
-        return node
+def _get_transforms(nodes: Sequence[str]) -> Dict[str, Tuple[Optional[str], str]]:
+    """
+    Resolve each name on its own (one ls per distinct name).
+    Returns {name: (transform long name, "")} or {name: (None, reason)}
+    when the name matches no node or more than one.
+    A shape resolves to its transform (parent read off the long path).
+    """
+    out: Dict[str, Tuple[Optional[str], str]] = {}
+    for name in dict.fromkeys(nodes):
+        listed = (cmds.ls(name, long=True, showType=True) or []) if name else []
+        if not listed:
+            out[name] = (None, f"not found: {name}")
+        elif len(listed) > 2:
+            out[name] = (None, f"more than one node matches: {name}")
+        elif listed[1] == "transform" or listed[0].count("|") < 2:
+            out[name] = (listed[0], "")
+        else:
+            out[name] = (listed[0].rsplit("|", 1)[0], "")
+    return out
 
-    if cmds.nodeType(node) == "transform":
-        return node
 
-    parent = cmds.listRelatives(node, parent=True, fullPath=True) or []
-    return parent[0] if parent else node
+def pairs_from_selection(mode: str = PAIRS_ALTERNATING) -> List[Tuple[str, str]]:
+    """
+    (driver, target) pairs from the current selection order.
+    PAIRS_ALTERNATING with an odd count: the last node has no target, a warning names it.
+    """
+    sel = cmds.ls(sl=True, long=True) or []
+    if mode == PAIRS_ONE_TO_MANY:
+        return [(sel[0], target) for target in sel[1:]]
+    if len(sel) % 2:
+        cmds.warning(f"[ao] 選択数が奇数です。最後のノードはペアにならないためリグを作りません: {sel[-1]}")
+    return list(zip(sel[0::2], sel[1::2]))
+
+
+def read_pairs_csv(path: str) -> List[Tuple[str, str]]:
+    """
+    (driver, target) per CSV row; a header row "driver,target" is skipped.
+    Raises OSError if the file cannot be opened, ValueError if it cannot be parsed.
+    """
+    pairs: List[Tuple[str, str]] = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        try:
+            for row in reader:
+                cells = [c.strip() for c in row]
+                if len(cells) < 2 or not cells[0] or cells[0].startswith("#"):
+                    continue
+                if not pairs and (cells[0].lower(), cells[1].lower()) == ("driver", "target"):
+                    continue
+                pairs.append((cells[0], cells[1]))
+        except csv.Error as e:  # not a ValueError subclass
+            raise ValueError(f"{path}:{reader.line_num}: {e}") from e
+    return pairs
 
 
-def build_follow_rig(do_freeze: bool = True):
+def build_follow_rig(do_freeze: bool = True, mode: str = RIG_CONSTRAINT):
     """
     Execute rig build from current selection.
     Returns (locator, group) or (None, None) on failure.
     """
+    result = run_follow_rig(do_freeze=do_freeze, mode=mode)
+    return result.locator, result.group
+
+
+def run_follow_rig(do_freeze: bool = True, trace: bool = False, mode: str = RIG_CONSTRAINT) -> FollowRigResult:
+    """
+    Same as build_follow_rig, but returns a FollowRigResult.
+    trace=True records the cmds calls of the build in result.cmds_stats.
+    """
+    with _traced(trace) as stats:
+        result = _build(do_freeze, mode)
+    result.cmds_stats = stats
+    return result
+
+
+def build_follow_rigs(
+    pairs: Sequence[Tuple[str, str]],
+    do_freeze: bool = True,
+    trace: bool = False,
+    mode: str = RIG_CONSTRAINT,
+) -> List[FollowRigResult]:
+    """
+    Build one follow rig per (driver, target) pair, all in one undo chunk.
+    - Each node name resolved on its own, every target matrix read in one xform query
+      (matrix mode: target locals and driver worlds in one query each), every group
+      frozen in one makeIdentity
+    - A failing pair is cleaned up and reported; the other pairs are still built
+    Returns one FollowRigResult per pair, in pair order.
+    """
+    with _traced(trace) as stats:
+        results = _build_pairs(list(pairs), do_freeze, mode)
+    for r in results:
+        r.cmds_stats = stats
+
+    built = sum(1 for r in results if r.ok)
+    print(f"[ao] Done: {built}/{len(results)} rigs, freeze={do_freeze}, mode={mode}")
+    for r in results:
+        if not r.ok:
+            cmds.warning(f"[ao] Failed: {r.driver} -> {r.target}: {r.message}")
+    return results
+
+
+@contextmanager
+def _traced(trace: bool) -> Iterator[Optional[Any]]:
+    """
+    Record the cmds calls of this module (yields CmdsStats), or yields None.
+    """
+    if not trace:
+        yield None
+        return
+
+    if ao_cmds_trace is None:
+        cmds.warning("[ao] ao_cmds_trace が見つかりません（計測なしで実行）")
+        yield None
+        return
+
+    with ao_cmds_trace.trace_cmds(sys.modules[__name__]) as stats:
+        yield stats
+    for line in stats.report():
+        print(f"[ao] {line}")
+
+
+def _build(do_freeze: bool, mode: str) -> FollowRigResult:
     sel = cmds.ls(sl=True, long=True) or []
     if len(sel) != 2:
         cmds.warning("[ao] 2つ選択してください（Selection1 → Selection2）")
-        return None, None
+        return FollowRigResult(None, None, do_freeze, "failed", "selection count != 2", mode=mode)
+
+    result = _build_pairs([(sel[0], sel[1])], do_freeze, mode)[0]
+    if result.ok:
+        print(f"[ao] Done: locator={result.locator}, group={result.group}, freeze={do_freeze}")
+    else:
+        cmds.warning(f"[ao] Failed: {result.message}")
+    return result
 
-    sel1 = _get_transform(sel[0])
-    sel2 = _get_transform(sel[1])
+
+def _build_pairs(pairs: List[Tuple[str, str]], do_freeze: bool, mode: str = RIG_CONSTRAINT) -> List[FollowRigResult]:
+    """
+    Shared build for one or many pairs (one undo chunk).
+    1. resolve transforms (each name on its own), read every target world matrix (one query;
+       matrix mode: every target local and driver world matrix too, one query each)
+    2. locator + group per pair, group snapped to its target
+    3. freeze every group at once (optional)
+    4. constraints (ALL keepOffset ON): driver -> group, locator -> target
+       or matrix connections (_connect_matrix_rig)
+    """
+    if mode not in (RIG_CONSTRAINT, RIG_MATRIX):
+        raise ValueError(f"unknown rig mode: {mode}")
+
+    resolved = _get_transforms([name for pair in pairs for name in pair])
+    drivers = [resolved[d][0] for d, _ in pairs]
+    targets = [resolved[t][0] for _, t in pairs]
+    results = [
+        FollowRigResult(None, None, do_freeze, "failed", driver=d or src_d, target=t or src_t, mode=mode)
+        for (src_d, src_t), d, t in zip(pairs, drivers, targets)
+    ]
+    valid = []
+    for i, (d, t) in enumerate(zip(drivers, targets)):
+        if d is None or t is None:
+            results[i].message = resolved[pairs[i][0] if d is None else pairs[i][1]][1]
+        elif d == t:
+            results[i].message = "driver and target are the same node"
+        else:
+            valid.append(i)
+    if not valid:
+        return results
 
     cmds.undoInfo(openChunk=True)
     try:
-        # unique names
-        locator = cmds.spaceLocator(name="follow_loc#")[0]
-        grp = cmds.group(locator, name="follow_grp#")
-
-        # snap group to Selection2 (world matrix)
-        m = cmds.xform(sel2, q=True, ws=True, m=True)
-        cmds.xform(grp, ws=True, m=m)
+        # world matrices of every target, 16 values each
+        matrices = _query_matrices([targets[i] for i in valid], world=True)
+        # matrix mode offsets: target locals and driver worlds, read before anything is built
+        target_locals: List[float] = []
+        driver_matrices: List[float] = []
+        if mode == RIG_MATRIX:
+            target_locals = _query_matrices([targets[i] for i in valid], world=False)
+            driver_matrices = _query_matrices([drivers[i] for i in valid], world=True)
 
-        # optional freeze
-        if do_freeze:
-            cmds.makeIdentity(grp, apply=True, t=True, r=True, s=True, n=False)
+        # locator + group per pair (unique names), group snapped to its target
+        built = []  # (pair index, position in valid)
+        for k, i in enumerate(valid):
+            r = results[i]
+            try:
+                r.locator = cmds.spaceLocator(name="follow_loc#")[0]
+                r.group = cmds.group(r.locator, name="follow_grp#")
+                cmds.xform(r.group, ws=True, m=matrices[16 * k:16 * k + 16])
+                built.append((i, k))
+            except Exception as e:
+                _discard(r, str(e))
 
-        # constraints (ALL keepOffset ON)
-        cmds.parentConstraint(sel1, grp, mo=True)
-        cmds.parentConstraint(locator, sel2, mo=True)
+        # optional freeze, every group in one call
+        if do_freeze and built:
+            cmds.makeIdentity([results[i].group for i, _ in built], apply=True, t=True, r=True, s=True, n=False)
 
-        # select locator for convenience
-        cmds.select(locator, r=True)
+        # constraints (ALL keepOffset ON) or matrix connections
+        for i, k in built:
+            r = results[i]
+            try:
+                if mode == RIG_MATRIX:
+                    # the group sits at the world root: its local matrix is the snap, or identity once frozen
+                    group_local = _IDENTITY if do_freeze else matrices[16 * k:16 * k + 16]
+                    _connect_matrix_rig(
+                        r, drivers[i], targets[i],
+                        group_local,
+                        driver_matrices[16 * k:16 * k + 16],
+                        target_locals[16 * k:16 * k + 16],
+                    )
+                else:
+                    cmds.parentConstraint(drivers[i], r.group, mo=True)
+                    cmds.parentConstraint(r.locator, targets[i], mo=True)
+                r.status = "built"
+            except Exception as e:
+                _discard(r, str(e))
 
-        print(f"[ao] Done: locator={locator}, group={grp}, freeze={do_freeze}")
-        return locator, grp
+        # select the locators for convenience
+        locators = [r.locator for r in results if r.ok]
+        if locators:
+            cmds.select(locators, r=True)
 
     except Exception as e:
-        cmds.warning(f"[ao] Failed: {e}")
-        return None, None
+        # unexpected (e.g. the freeze): nothing of this batch is kept
+        for i in valid:
+            _discard(results[i], str(e))
 
     finally:
         cmds.undoInfo(closeChunk=True)
+
+    return results
+
+
+def _query_matrices(nodes: List[str], world: bool) -> List[float]:
+    """
+    16 values per node (world or local matrix) in one xform query,
+    one query per node if the batched result cannot be matched up.
+    """
+    values = cmds.xform(nodes, q=True, ws=world, m=True) or []
+    if len(values) != 16 * len(nodes):
+        values = []
+        for node in nodes:
+            values.extend(cmds.xform(node, q=True, ws=world, m=True))
+    return values
+
+
+def _connect_matrix_rig(
+    result: FollowRigResult,
+    driver: str,
+    target: str,
+    group_local: Sequence[float],
+    driver_matrix: Sequence[float],
+    target_local: Sequence[float],
+) -> None:
+    """
+    Matrix mode for one built pair (all matrices read at build time, no query here).
+    - group:  local matrix = group_local * inverse(driver world at build),
+              driver.worldMatrix -> offsetParentMatrix directly (the group stays at
+              the world root, so no parent inverse and no multMatrix)
+    - target: offsetParentMatrix = inverse(target local at build) * locator.worldMatrix
+              * target.parentInverseMatrix
+              (the locator sits on the target at build time, so the target does not move)
+    Identity offsets without a parent inverse become direct connections (no multMatrix).
+    The target's translate / rotate / scale channels are left untouched; the group's
+    channels hold the keep-offset (also after freeze).
+    Same motion as the two keepOffset constraints while the driver is not scaled:
+    parentConstraint ignores the driver's scale, the matrix chain follows it.
+    """
+    cmds.xform(result.group, m=_mult_matrix(group_local, _inverse_matrix(driver_matrix)))
+    cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{result.group}.offsetParentMatrix")
+
+    inputs = [(_inverse_matrix(target_local), None), (None, f"{result.locator}.worldMatrix[0]")]
+    if target.count("|") > 1:
+        inputs.append((None, f"{target}.parentInverseMatrix[0]"))
+    _drive_offset_parent_matrix(result, target, inputs, "targetMult")
+
+
+def _drive_offset_parent_matrix(
+    result: FollowRigResult,
+    node: str,
+    inputs: List[Tuple[Optional[Sequence[float]], Optional[str]]],
+    suffix: str,
+) -> None:
+    """
+    node.offsetParentMatrix = product of inputs, each (constant matrix, None) or (None, source plug).
+    Identity constants are dropped; a single plug is connected directly.
+    New multMatrix nodes are added to result.utility_nodes (deleted by _discard).
+    """
+    inputs = [(m, plug) for m, plug in inputs if plug or not _is_identity(m)]
+    dest = f"{node}.offsetParentMatrix"
+
+    if len(inputs) == 1 and inputs[0][1]:
+        cmds.connectAttr(inputs[0][1], dest)
+        return
+
+    mult = cmds.createNode("multMatrix", name=f"{result.group.rsplit('|', 1)[-1]}_{suffix}")
+    result.utility_nodes.append(mult)
+    for k, (m, plug) in enumerate(inputs):
+        if plug:
+            cmds.connectAttr(plug, f"{mult}.matrixIn[{k}]")
+        else:
+            cmds.setAttr(f"{mult}.matrixIn[{k}]", *m, type="matrix")
+    cmds.connectAttr(f"{mult}.matrixSum", dest)
+
+
+def _inverse_matrix(m: Sequence[float]) -> List[float]:
+    """
+    Inverse of a Maya transform matrix (16 values, row-major, translation in 12..14).
+    Affine only: the upper 3x3 is inverted, then the translation.
+    """
+    a, b, c = m[0], m[1], m[2]
+    d, e, f = m[4], m[5], m[6]
+    g, h, i = m[8], m[9], m[10]
+    co = (e * i - f * h, c * h - b * i, b * f - c * e,
+          f * g - d * i, a * i - c * g, c * d - a * f,
+          d * h - e * g, b * g - a * h, a * e - b * d)
+    det = a * co[0] + b * co[3] + c * co[6]
+    if abs(det) < 1e-12:
+        raise ValueError("matrix is not invertible (zero scale)")
+    r = [v / det for v in co]
+    tx, ty, tz = m[12], m[13], m[14]
+    return [
+        r[0], r[1], r[2], 0.0,
+        r[3], r[4], r[5], 0.0,
+        r[6], r[7], r[8], 0.0,
+        -(tx * r[0] + ty * r[3] + tz * r[6]),
+        -(tx * r[1] + ty * r[4] + tz * r[7]),
+        -(tx * r[2] + ty * r[5] + tz * r[8]),
+        1.0,
+    ]
+
+
+def _mult_matrix(a: Sequence[float], b: Sequence[float]) -> List[float]:
+    """
+    a * b for row-major 4x4 matrices (Maya order: a is applied first).
+    """
+    return [
+        sum(a[4 * row + k] * b[4 * k + col] for k in range(4))
+        for row in range(4)
+        for col in range(4)
+    ]
+
+
+def _is_identity(m: Sequence[float], tolerance: float = 1e-9) -> bool:
+    return all(abs(v - w) <= tolerance for v, w in zip(m, _IDENTITY))
+
+
+def _discard(result: FollowRigResult, message: str) -> None:
+    """
+    Delete what was created for a failed pair and mark it failed.
+    """
+    for node in (result.group, result.locator):
+        try:
+            if node and cmds.objExists(node):
+                cmds.delete(node)
+                break  # the locator goes with its group
+        except Exception:
+            pass
+    for node in result.utility_nodes:
+        try:
+            if cmds.objExists(node):
+                cmds.delete(node)
+        except Exception:
+            pass
+    result.utility_nodes = []
+    result.locator = None
+    result.group = None
+    result.status = "failed"
+    result.message = message
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+ao_cmds_trace.py
+
+Opt-in maya.cmds tracing (dev)
+- Swaps the `cmds` global of a system module for a timing proxy
+- Records call count, cumulative time and the slowest calls per command
+- Used by ao_renamer_poc_system / ao_LocatorFollowRigTool_system (trace=True)
+  and by the benchmark scripts
+
+Usage:
+    import ao_cmds_trace
+    import ao_renamer_poc_system as renamer_system
+
+    with ao_cmds_trace.trace_cmds(renamer_system) as stats:
+        renamer_system.run_rename(renamer_system.RenameInput(prefix="geo"))
+    print("\\n".join(stats.report()))
+"""
+
+from __future__ import annotations
+
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+
+# ----------------------------
+# Stats
+# ----------------------------
+
+class CmdsStats:
+    """
+    Per-command call statistics of one traced run.
+    """
+
+    def __init__(self, keep_slowest: int = 5):
+        self.keep_slowest = max(0, int(keep_slowest))
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        # command -> min-heap of (seconds, call repr), at most keep_slowest entries
+        self.slowest: Dict[str, List[Tuple[float, str]]] = {}
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def record(self, name: str, elapsed: float, args: tuple, kwargs: dict) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+
+        if not self.keep_slowest:
+            return
+        heap = self.slowest.setdefault(name, [])
+        if len(heap) < self.keep_slowest:
+            heapq.heappush(heap, (elapsed, _call_repr(name, args, kwargs)))
+        elif elapsed > heap[0][0]:
+            heapq.heapreplace(heap, (elapsed, _call_repr(name, args, kwargs)))
+
+    def merge(self, other: "CmdsStats") -> None:
+        for name, count in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + count
+            self.seconds[name] = self.seconds.get(name, 0.0) + other.seconds.get(name, 0.0)
+            for entry in other.slowest.get(name, []):
+                heap = self.slowest.setdefault(name, [])
+                heapq.heappush(heap, entry)
+                if len(heap) > self.keep_slowest:
+                    heapq.heappop(heap)
+
+    def report(self, limit: int = 10) -> List[str]:
+        """
+        Text lines, commands sorted by cumulative time.
+        """
+        lines = [f"cmds: {self.total_calls} calls, {self.total_seconds * 1000.0:.2f} ms"]
+        ranked = sorted(self.calls, key=lambda n: self.seconds.get(n, 0.0), reverse=True)
+        for name in ranked[:limit]:
+            count = self.calls[name]
+            total = self.seconds.get(name, 0.0)
+            lines.append(f"  {name:<20} calls: {count:>7}  total: {total * 1000.0:10.2f} ms  avg: {total / count * 1e6:9.1f} us")
+            for elapsed, call in sorted(self.slowest.get(name, []), reverse=True):
+                lines.append(f"      {elapsed * 1000.0:8.2f} ms  {call}")
+        return lines
+
+
+def _call_repr(name: str, args: tuple, kwargs: dict, limit: int = 120) -> str:
+    parts = [_short_repr(a) for a in args]
+    parts += [f"{k}={_short_repr(v)}" for k, v in kwargs.items()]
+    text = f"{name}({', '.join(parts)})"
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _short_repr(value) -> str:
+    if isinstance(value, (list, tuple)) and len(value) > 3:
+        return f"[{len(value)} items]"
+    return repr(value)
+
+
+# ----------------------------
+# Proxy
+# ----------------------------
+
+class TracedCmds:
+    """
+    Stand-in for the cmds module: forwards every command and records its timing.
+    """
+
+    def __init__(self, module, stats: CmdsStats):
+        self._module = module
+        self._stats = stats
+        self._wrappers: Dict[str, object] = {}
+
+    def __getattr__(self, name: str):
+        wrapper = self._wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+
+        stats = self._stats
+
+        def _wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.record(name, time.perf_counter() - t0, args, kwargs)
+
+        self._wrappers[name] = _wrapper
+        return _wrapper
+
+
+@contextmanager
+def trace_cmds(*modules, keep_slowest: int = 5) -> Iterator[CmdsStats]:
+    """
+    Trace the cmds calls of the given modules (each must have a module-level `cmds`).
+    Already traced modules are left alone, so nested traces count each call once.
+    """
+    stats = CmdsStats(keep_slowest=keep_slowest)
+    swapped = []
+    try:
+        for module in modules:
+            original = module.cmds
+            if isinstance(original, TracedCmds):
+                continue
+            module.cmds = TracedCmds(original, stats)
+            swapped.append((module, original))
+        yield stats
+    finally:
+        for module, original in reversed(swapped):
+            module.cmds = original
@@ -0,0 +1,694 @@
+# -*- coding: utf-8 -*-
+"""
+ao_fake_cmds.py
+
+In-memory maya.cmds stand-in (dev only)
+- Pure Python scene graph (DAG + DG nodes, uuid, selection, fileInfo)
+- Attributes are stored values only: connectAttr records the connection, nothing is evaluated
+- Covers the cmds subset used by the toolbox system modules
+- cmds.file open / save of plain .ma text (createNode, rename -uid, fileInfo lines only)
+- install() registers it as "maya.cmds" so system modules import it unchanged
+
+Not a Maya emulator: only the behaviour the tools rely on is modelled.
+
+Usage (plain Python):
+    import ao_fake_cmds
+    ao_fake_cmds.install()
+    scene = ao_fake_cmds.reset()
+    import ao_renamer_poc_system
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import itertools
+import os
+import re
+import shlex
+import sys
+import types
+import uuid as _uuid
+from typing import Dict, Iterable, List, Optional
+
+
+# ----------------------------
+# Scene model
+# ----------------------------
+
+SHAPE_TYPES = {"mesh", "nurbsCurve", "nurbsSurface", "locator", "camera"}
+DAG_TYPES = SHAPE_TYPES | {"transform", "joint", "parentConstraint"}
+# exactType -> inherited types (ls -type includes derived types)
+TYPE_PARENTS = {
+    "joint": ("transform",),
+    "parentConstraint": ("transform",),
+}
+
+_LEGAL_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_IDENTITY = [1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0]
+
+
+class _Node:
+    __slots__ = ("uuid", "name", "type", "parent", "children", "matrix", "attrs")
+
+    def __init__(self, name: str, node_type: str, parent: Optional["_Node"] = None):
+        self.uuid = str(_uuid.uuid4()).upper()
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children: List[_Node] = []
+        self.matrix = list(_IDENTITY)
+        self.attrs: Dict[str, object] = {}
+
+    @property
+    def is_dag(self) -> bool:
+        return self.type in DAG_TYPES
+
+    def path(self) -> str:
+        if not self.is_dag:
+            return self.name
+        parts = []
+        n: Optional[_Node] = self
+        while n is not None:
+            parts.append(n.name)
+            n = n.parent
+        return "|" + "|".join(reversed(parts))
+
+
+class FakeScene:
+    def __init__(self):
+        self.nodes: Dict[str, _Node] = {}   # uuid -> node (insertion ordered)
+        self.by_name: Dict[str, List[_Node]] = {}
+        self.selection: List[_Node] = []
+        self.file_info: Dict[str, str] = {}
+        self.undo_chunks = 0
+        self.undo_depth = 0
+        self.undo_flushes = 0
+        self.refresh_suspended = False
+        self.script_jobs: Dict[int, tuple] = {}  # job number -> (event, callback)
+        self.scene_name = ""
+        self.connections: Dict[tuple, tuple] = {}  # (dest uuid, attr) -> (source uuid, attr)
+        self.current_time = 1.0
+
+    # --- bookkeeping
+    def _index(self, node: _Node) -> None:
+        self.by_name.setdefault(node.name, []).append(node)
+
+    def _unindex(self, node: _Node) -> None:
+        lst = self.by_name.get(node.name, [])
+        if node in lst:
+            lst.remove(node)
+        if not lst:
+            self.by_name.pop(node.name, None)
+
+    def add(self, name: str, node_type: str, parent: Optional[_Node] = None) -> _Node:
+        node = _Node(name, node_type, parent)
+        if parent is not None:
+            parent.children.append(node)
+        self.nodes[node.uuid] = node
+        self._index(node)
+        return node
+
+    def set_name(self, node: _Node, name: str) -> None:
+        self._unindex(node)
+        node.name = name
+        self._index(node)
+        self.fire("NameChanged")
+
+    def fire(self, event: str) -> None:
+        for job_event, callback in list(self.script_jobs.values()):
+            if job_event == event:
+                callback()
+
+    def reparent(self, node: _Node, parent: Optional[_Node]) -> None:
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+
+    def delete(self, node: _Node) -> None:
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        doomed = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            doomed.append(n)
+            stack.extend(n.children)
+        for n in doomed:
+            self._unindex(n)
+            self.nodes.pop(n.uuid, None)
+        gone = set(id(n) for n in doomed)
+        self.selection = [n for n in self.selection if id(n) not in gone]
+        uuids = set(n.uuid for n in doomed)
+        self.connections = {
+            dst: src for dst, src in self.connections.items()
+            if dst[0] not in uuids and src[0] not in uuids
+        }
+
+    # --- name resolution
+    def resolve(self, name: str) -> List[_Node]:
+        if not name:
+            return []
+        name = name.split(".", 1)[0]
+        if name in self.nodes:
+            return [self.nodes[name]]
+        if "|" in name:
+            parts = [p for p in name.split("|") if p]
+            if not parts:
+                return []
+            out = []
+            for cand in self.by_name.get(parts[-1], []):
+                if not cand.is_dag:
+                    continue
+                chain = []
+                n = cand
+                while n is not None and len(chain) < len(parts):
+                    chain.append(n.name)
+                    n = n.parent
+                if list(reversed(chain)) != parts:
+                    continue
+                if name.startswith("|") and n is not None:
+                    continue
+                out.append(cand)
+            return out
+        return list(self.by_name.get(name, []))
+
+    def resolve_one(self, name: str) -> _Node:
+        found = self.resolve(name)
+        if not found:
+            raise ValueError(f"No object matches name: {name}")
+        if len(found) > 1:
+            raise ValueError(f"More than one object matches name: {name}")
+        return found[0]
+
+    def display(self, node: _Node, long: bool) -> str:
+        if long or not node.is_dag:
+            return node.path() if long else node.name
+        if len(self.by_name.get(node.name, [])) == 1:
+            return node.name
+        return node.path()
+
+    def unique_name(self, base: str) -> str:
+        """Expand '#' or append digits until the name is unused."""
+        if "#" in base:
+            for i in itertools.count(1):
+                cand = base.replace("#", str(i))
+                if cand not in self.by_name:
+                    return cand
+        if base not in self.by_name:
+            return base
+        stem = base.rstrip("0123456789")
+        for i in itertools.count(1):
+            cand = f"{stem}{i}"
+            if cand not in self.by_name:
+                return cand
+        return base
+
+
+SCENE = FakeScene()
+
+
+def reset() -> FakeScene:
+    """Start a new empty scene."""
+    global SCENE
+    SCENE = FakeScene()
+    return SCENE
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def _flatten(args: Iterable) -> List[str]:
+    out: List[str] = []
+    for a in args:
+        if a is None:
+            continue
+        if isinstance(a, (list, tuple)):
+            out.extend(_flatten(a))
+        else:
+            out.append(str(a))
+    return out
+
+
+def _match_type(node: _Node, type_filter, exact) -> bool:
+    if exact is not None:
+        types_ = exact if isinstance(exact, (list, tuple)) else [exact]
+        return node.type in types_
+    if type_filter is not None:
+        types_ = type_filter if isinstance(type_filter, (list, tuple)) else [type_filter]
+        for t in types_:
+            if node.type == t or t in TYPE_PARENTS.get(node.type, ()):
+                return True
+            if t == "shape" and node.type in SHAPE_TYPES:
+                return True
+        return False
+    return True
+
+
+def _pattern_nodes(pattern: str) -> List[_Node]:
+    if any(ch in pattern for ch in "*?["):
+        if "|" in pattern:
+            return [n for n in SCENE.nodes.values() if fnmatch.fnmatchcase(n.path(), pattern)]
+        return [n for n in SCENE.nodes.values() if fnmatch.fnmatchcase(n.name, pattern)]
+    return SCENE.resolve(pattern)
+
+
+# ----------------------------
+# cmds subset
+# ----------------------------
+
+def ls(*args, **kwargs):
+    sl = kwargs.get("selection", kwargs.get("sl", False))
+    long = kwargs.get("long", kwargs.get("l", False))
+    show_type = kwargs.get("showType", kwargs.get("st", False))
+    want_uuid = kwargs.get("uuid", False)
+    type_filter = kwargs.get("type", kwargs.get("typ"))
+    exact = kwargs.get("exactType", kwargs.get("et"))
+    if kwargs.get("transforms", kwargs.get("tr", False)):
+        type_filter = "transform"
+    if kwargs.get("shapes", kwargs.get("s", False)):
+        type_filter = "shape"
+    dag_only = kwargs.get("dag", False)
+
+    patterns = _flatten(args)
+    if sl:
+        nodes = list(SCENE.selection)
+        if patterns:
+            wanted = set(id(n) for p in patterns for n in _pattern_nodes(p))
+            nodes = [n for n in nodes if id(n) in wanted]
+    elif patterns:
+        nodes = []
+        seen = set()
+        for p in patterns:
+            for n in _pattern_nodes(p):
+                if id(n) not in seen:
+                    seen.add(id(n))
+                    nodes.append(n)
+    else:
+        nodes = list(SCENE.nodes.values())
+
+    out: List[str] = []
+    for n in nodes:
+        if dag_only and not n.is_dag:
+            continue
+        if not _match_type(n, type_filter, exact):
+            continue
+        out.append(n.uuid if want_uuid else SCENE.display(n, long))
+        if show_type:
+            out.append(n.type)
+    return out
+
+
+def objExists(name):
+    return bool(SCENE.resolve(str(name)))
+
+
+def nodeType(name, **kwargs):
+    return SCENE.resolve_one(str(name)).type
+
+
+def listRelatives(*args, **kwargs):
+    full = kwargs.get("fullPath", kwargs.get("f", False))
+    type_filter = kwargs.get("type")
+    out: List[str] = []
+    seen = set()
+    for name in _flatten(args):
+        node = SCENE.resolve_one(name)
+        if kwargs.get("parent", kwargs.get("p", False)):
+            rel = [node.parent] if node.parent is not None else []
+        elif kwargs.get("allDescendents", kwargs.get("ad", False)):
+            rel = []
+            stack = list(reversed(node.children))
+            while stack:
+                c = stack.pop()
+                rel.append(c)
+                stack.extend(reversed(c.children))
+            rel.reverse()
+        else:
+            rel = list(node.children)
+            if kwargs.get("shapes", kwargs.get("s", False)):
+                rel = [c for c in rel if c.type in SHAPE_TYPES]
+        for r in rel:
+            if type_filter is not None and not _match_type(r, type_filter, None):
+                continue
+            if id(r) in seen:
+                continue
+            seen.add(id(r))
+            out.append(r.path() if full else SCENE.display(r, False))
+    return out or None
+
+
+def _name_clashes(node: _Node, name: str) -> bool:
+    """
+    DAG names must be unique among siblings; DG names across the scene.
+    """
+    for other in SCENE.by_name.get(name, []):
+        if other is node:
+            continue
+        if not node.is_dag or not other.is_dag or other.parent is node.parent:
+            return True
+    return False
+
+
+def rename(*args, **kwargs):
+    flat = _flatten(args)
+    if len(flat) == 1:
+        if not SCENE.selection:
+            raise RuntimeError("No object selected to rename.")
+        node, new_name = SCENE.selection[0], flat[0]
+    else:
+        node, new_name = SCENE.resolve_one(flat[0]), flat[1]
+    if not _LEGAL_NAME_RE.match(new_name.split(":")[-1]):
+        raise RuntimeError(f"New name has no legal characters: {new_name}")
+    if new_name == node.name:
+        return SCENE.display(node, False)
+    if _name_clashes(node, new_name):
+        # Maya keeps the rename and bumps the trailing number instead
+        stem = new_name.rstrip("0123456789")
+        for i in itertools.count(1):
+            cand = f"{stem}{i}"
+            if not _name_clashes(node, cand):
+                new_name = cand
+                break
+    SCENE.set_name(node, new_name)
+    return SCENE.display(node, False)
+
+
+def createNode(node_type, name=None, parent=None, **kwargs):
+    name = name or kwargs.get("n")
+    parent = parent or kwargs.get("p")
+    p = SCENE.resolve_one(parent) if parent else None
+    node = SCENE.add(SCENE.unique_name(name or f"{node_type}#"), node_type, p)
+    if node.is_dag:
+        SCENE.fire("DagObjectCreated")
+    return SCENE.display(node, False)
+
+
+def spaceLocator(name="locator#", **kwargs):
+    name = kwargs.get("n", name)
+    t = SCENE.add(SCENE.unique_name(name), "transform")
+    SCENE.add(SCENE.unique_name(t.name.rstrip("0123456789") + "Shape" + t.name[len(t.name.rstrip("0123456789")):]), "locator", t)
+    return [t.name]
+
+
+def group(*args, **kwargs):
+    name = kwargs.get("name", kwargs.get("n", "group#"))
+    grp = SCENE.add(SCENE.unique_name(name), "transform")
+    for child in _flatten(args):
+        SCENE.reparent(SCENE.resolve_one(child), grp)
+    return grp.name
+
+
+def parent(*args, **kwargs):
+    flat = _flatten(args)
+    target = None if kwargs.get("world", kwargs.get("w", False)) else SCENE.resolve_one(flat.pop())
+    nodes = [SCENE.resolve_one(c) for c in flat]
+    for n in nodes:
+        SCENE.reparent(n, target)
+    return [SCENE.display(n, False) for n in nodes]
+
+
+def xform(*args, **kwargs):
+    flat = _flatten(args) or [n.path() for n in SCENE.selection]
+    nodes = [SCENE.resolve_one(n) for n in flat]
+    if kwargs.get("q", kwargs.get("query", False)):
+        out: List[float] = []
+        for n in nodes:
+            if kwargs.get("m", kwargs.get("matrix", False)):
+                out.extend(n.matrix)
+            elif kwargs.get("t", kwargs.get("translation", False)):
+                out.extend(n.matrix[12:15])
+            elif kwargs.get("rp", kwargs.get("rotatePivot", False)):
+                out.extend(n.matrix[12:15])
+        return out
+    for n in nodes:
+        if "m" in kwargs or "matrix" in kwargs:
+            n.matrix = [float(v) for v in kwargs.get("m", kwargs.get("matrix"))]
+        if "t" in kwargs or "translation" in kwargs:
+            t = kwargs.get("t", kwargs.get("translation"))
+            n.matrix[12:15] = [float(v) for v in t]
+    return None
+
+
+def makeIdentity(*args, **kwargs):
+    for name in _flatten(args):
+        SCENE.resolve_one(name).matrix = list(_IDENTITY)
+
+
+def parentConstraint(*args, **kwargs):
+    flat = _flatten(args)
+    driven = SCENE.resolve_one(flat[-1])
+    c = SCENE.add(SCENE.unique_name(f"{driven.name}_parentConstraint1"), "parentConstraint", driven)
+    c.attrs["targets"] = flat[:-1]
+    return [c.name]
+
+
+def _plug(name: str):
+    node_name, _, attr = name.partition(".")
+    if not attr:
+        raise ValueError(f"Not a plug: {name}")
+    return SCENE.resolve_one(node_name), attr
+
+
+def getAttr(name, **kwargs):
+    node, attr = _plug(name)
+    if attr == "matrix":
+        return list(node.matrix)
+    if attr not in node.attrs:
+        raise ValueError(f"No attribute: {name}")
+    return node.attrs[attr]
+
+
+def setAttr(name, *values, **kwargs):
+    node, attr = _plug(name)
+    if (node.uuid, attr) in SCENE.connections:
+        raise RuntimeError(f"The attribute '{name}' is locked or connected and cannot be modified.")
+    node.attrs[attr] = list(values) if len(values) > 1 else values[0]
+
+
+def connectAttr(source, destination, **kwargs):
+    src, src_attr = _plug(source)
+    dst, dst_attr = _plug(destination)
+    key = (dst.uuid, dst_attr)
+    if key in SCENE.connections and not kwargs.get("force", kwargs.get("f", False)):
+        raise RuntimeError(f"'{destination}' already has an incoming connection.")
+    SCENE.connections[key] = (src.uuid, src_attr)
+
+
+def listConnections(name, **kwargs):
+    node, attr = _plug(name)
+    src = SCENE.connections.get((node.uuid, attr))
+    if src is None:
+        return None
+    src_node = SCENE.nodes[src[0]]
+    return [f"{SCENE.display(src_node, False)}.{src[1]}" if kwargs.get("plugs", kwargs.get("p", False))
+            else SCENE.display(src_node, False)]
+
+
+def setKeyframe(*args, **kwargs):
+    # keys are not evaluated: only checks the nodes exist
+    for name in _flatten(args):
+        SCENE.resolve_one(name)
+    return len(_flatten(args))
+
+
+def currentTime(*args, **kwargs):
+    if args:
+        SCENE.current_time = float(args[0])
+    return SCENE.current_time
+
+
+def dgeval(*args, **kwargs):
+    # nothing to evaluate in the stand-in
+    for name in _flatten(args):
+        SCENE.resolve_one(name)
+
+
+def select(*args, **kwargs):
+    flat = _flatten(args)
+    if kwargs.get("clear", kwargs.get("cl", False)):
+        SCENE.selection = []
+    else:
+        nodes = [SCENE.resolve_one(n) for n in flat]
+        if kwargs.get("add", False):
+            SCENE.selection.extend(n for n in nodes if n not in SCENE.selection)
+        else:
+            SCENE.selection = nodes
+    SCENE.fire("SelectionChanged")
+
+
+def delete(*args, **kwargs):
+    for name in _flatten(args):
+        for n in SCENE.resolve(name):
+            SCENE.delete(n)
+
+
+def undoInfo(*args, **kwargs):
+    if kwargs.get("openChunk", False):
+        SCENE.undo_depth += 1
+        SCENE.undo_chunks += 1
+    if kwargs.get("closeChunk", False):
+        SCENE.undo_depth -= 1
+    if kwargs.get("q", kwargs.get("query", False)):
+        return True
+    return None
+
+
+def flushUndo(*args, **kwargs):
+    SCENE.undo_flushes += 1
+
+
+def refresh(*args, **kwargs):
+    if kwargs.get("q", kwargs.get("query", False)) and "suspend" in kwargs:
+        return SCENE.refresh_suspended
+    if "suspend" in kwargs:
+        SCENE.refresh_suspended = bool(kwargs["suspend"])
+
+
+def fileInfo(*args, **kwargs):
+    if kwargs.get("q", kwargs.get("query", False)):
+        if args:
+            val = SCENE.file_info.get(args[0])
+            return [val] if val is not None else []
+        return list(itertools.chain.from_iterable(SCENE.file_info.items()))
+    if kwargs.get("remove", kwargs.get("rm")):
+        SCENE.file_info.pop(kwargs.get("remove", kwargs.get("rm")), None)
+        return None
+    if len(args) == 2:
+        SCENE.file_info[args[0]] = str(args[1])
+    return None
+
+
+def scriptJob(*args, **kwargs):
+    """event=[name, callable] / exists=job / kill=job (events fire synchronously)."""
+    if "event" in kwargs:
+        event, callback = kwargs["event"]
+        job = max(SCENE.script_jobs, default=0) + 1
+        SCENE.script_jobs[job] = (event, callback)
+        return job
+    if "exists" in kwargs:
+        return kwargs["exists"] in SCENE.script_jobs
+    if "kill" in kwargs:
+        SCENE.script_jobs.pop(kwargs["kill"], None)
+    return None
+
+
+def file(*args, **kwargs):
+    """
+    open= (with force) / new= / rename= / save= / query sceneName.
+    Only .ma text is read and written: createNode, rename -uid and fileInfo lines.
+    """
+    global SCENE
+    if kwargs.get("q", kwargs.get("query", False)):
+        if kwargs.get("sceneName", kwargs.get("sn", False)):
+            return SCENE.scene_name
+        return None
+    if kwargs.get("new", False):
+        reset()
+        return ""
+    if kwargs.get("open", kwargs.get("o", False)):
+        path = str(args[0])
+        scene = FakeScene()
+        _read_ma(scene, path)
+        scene.scene_name = os.path.abspath(path)
+        SCENE = scene
+        return scene.scene_name
+    if "rename" in kwargs or "rn" in kwargs:
+        SCENE.scene_name = os.path.abspath(kwargs.get("rename", kwargs.get("rn")))
+        return SCENE.scene_name
+    if kwargs.get("save", kwargs.get("s", False)):
+        if not SCENE.scene_name:
+            raise RuntimeError("Scene has no name; rename it before saving.")
+        _write_ma(SCENE, SCENE.scene_name)
+        return SCENE.scene_name
+    return None
+
+
+def _read_ma(scene: FakeScene, path: str) -> None:
+    if not path.lower().endswith(".ma"):
+        raise RuntimeError(f"Only .ma text is supported by the stand-in: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        text = "\n".join(line for line in f if not line.lstrip().startswith("//"))
+
+    last: Optional[_Node] = None
+    for statement in text.split(";"):
+        try:
+            words = shlex.split(statement, comments=False)
+        except ValueError:
+            continue
+        if not words:
+            continue
+        cmd = words[0]
+        if cmd == "createNode":
+            # valued flags only; switches like -s / -ss are skipped
+            flags = {w: v for w, v in zip(words[2:], words[3:]) if w in ("-n", "-name", "-p", "-parent")}
+            parent = flags.get("-p") or flags.get("-parent")
+            name = flags.get("-n") or flags.get("-name") or f"{words[1]}1"
+            last = scene.add(name, words[1], scene.resolve_one(parent) if parent else None)
+        elif cmd == "rename" and words[1:2] == ["-uid"] and last is not None:
+            scene.nodes.pop(last.uuid, None)
+            last.uuid = words[2]
+            scene.nodes[last.uuid] = last
+        elif cmd == "fileInfo" and len(words) >= 3:
+            scene.file_info[words[1]] = words[2]
+
+
+def _write_ma(scene: FakeScene, path: str) -> None:
+    lines = ["//Maya ASCII scene", f"//Name: {os.path.basename(path)}"]
+    for key, value in scene.file_info.items():
+        lines.append(f'fileInfo "{key}" "{value}";')
+
+    # parents before children: roots in scene order, then depth first
+    ordered: List[_Node] = []
+    stack = [n for n in reversed(list(scene.nodes.values())) if n.parent is None]
+    while stack:
+        n = stack.pop()
+        ordered.append(n)
+        stack.extend(reversed(n.children))
+
+    for n in ordered:
+        parent = f' -p "{n.parent.path()}"' if n.parent is not None else ""
+        lines.append(f'createNode {n.type} -n "{n.name}"{parent};')
+        lines.append(f'\trename -uid "{n.uuid}";')
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n// End of " + os.path.basename(path) + "\n")
+
+
+def warning(*args, **kwargs):
+    print("# Warning: " + " ".join(str(a) for a in args))
+
+
+def evalDeferred(fn, **kwargs):
+    if callable(fn):
+        fn()
+
+
+def getPanel(*args, **kwargs):
+    # no UI in the stand-in
+    return []
+
+
+# ----------------------------
+# Install
+# ----------------------------
+
+def install() -> types.ModuleType:
+    """
+    Register this module as maya.cmds.
+    Call before importing a system module; real Maya should never call this.
+    """
+    mod = sys.modules[__name__]
+    if "maya" not in sys.modules:
+        maya_pkg = types.ModuleType("maya")
+        maya_pkg.__path__ = []
+        sys.modules["maya"] = maya_pkg
+    sys.modules["maya"].cmds = mod
+    sys.modules["maya.cmds"] = mod
+    return mod
+
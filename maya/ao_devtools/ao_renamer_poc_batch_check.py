@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_batch_check.py
+
+Renamer PoC - batch renamer check against the stand-in (dev only, no Maya)
+- Copies fixtures/renamer_batch to a temp folder (the fixtures are never written)
+- Runs ao_renamer_poc_batch.main(--fake) in rule, search / replace (--node-type) and mapping modes
+- Default cameras keep their names in every mode
+- Checks outputs, journals, the report, --dry-run, --resume and a 2-worker run
+- scenes/a/shot.ma and scenes/b/shot.ma share a file name: their outputs and
+  journals must stay apart
+
+Usage:
+    python maya/ao_devtools/ao_renamer_poc_batch_check.py
+Exit code 0 when every check passes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Callable, Dict, List
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_RENAMER_DIR = os.path.join(_THIS_DIR, os.pardir, "ao_renamer_poc")
+FIXTURES_DIR = os.path.join(_THIS_DIR, "fixtures", "renamer_batch")
+for _path in (_THIS_DIR, _RENAMER_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+import ao_fake_cmds
+import ao_renamer_poc_batch as batch
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def _transforms(path: str) -> List[str]:
+    """
+    Short transform names of a .ma file (read with the stand-in).
+    """
+    ao_fake_cmds.install()
+    ao_fake_cmds.file(path, open=True, force=True)
+    return sorted(ao_fake_cmds.ls(type="transform") or [])
+
+
+def _report(path: str) -> Dict[str, dict]:
+    """
+    {relative file: row} of a batch report.
+    """
+    rows: Dict[str, dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            rows[os.path.relpath(row["file"], os.path.dirname(path))] = row
+    return rows
+
+
+def _run(work: str, *args: str) -> int:
+    return batch.main([os.path.join(work, "scenes"), *args, "--fake"])
+
+
+# ----------------------------
+# Checks
+# ----------------------------
+
+def check_rule(work: str) -> None:
+    out = os.path.join(work, "out")
+    journals = os.path.join(work, "journals")
+    report = os.path.join(work, "rule.jsonl")
+    code = _run(work, "--prefix", "geo", "--base", "box", "--select", "old_*",
+                "--output-dir", out, "--journal-dir", journals, "--report", report, "--workers", "1")
+    assert code == 0, f"exit code {code}"
+
+    rows = _report(report)
+    assert sorted(rows) == ["scenes/a/shot.ma", "scenes/b/shot.ma", "scenes/props.ma"], sorted(rows)
+    assert all(r["status"] == batch.STATUS_DONE for r in rows.values()), rows
+
+    # same file name in two folders: two outputs, two journals
+    a, b = os.path.join(out, "a", "shot.ma"), os.path.join(out, "b", "shot.ma")
+    assert rows["scenes/a/shot.ma"]["output"] == a and rows["scenes/b/shot.ma"]["output"] == b, rows
+    assert _transforms(a) == ["GEO_box_01", "GEO_box_02", "GEO_box_03", "persp", "props", "top"], _transforms(a)
+    assert _transforms(b) == ["GEO_box_01", "GEO_box_02", "persp", "props", "top"], _transforms(b)
+    for name in ("a/shot.ma", "b/shot.ma", "props.ma"):
+        assert os.path.isfile(os.path.join(journals, name + ".renames.jsonl")), name
+
+    # sources are untouched
+    assert "old_box0" in _transforms(os.path.join(work, "scenes", "a", "shot.ma"))
+
+
+def check_resume(work: str) -> None:
+    report = os.path.join(work, "rule.jsonl")
+    code = _run(work, "--prefix", "geo", "--base", "box", "--select", "old_*",
+                "--output-dir", os.path.join(work, "out"), "--report", report, "--resume")
+    assert code == 0, f"exit code {code}"
+    with open(report, "r", encoding="utf-8") as f:
+        assert len(f.readlines()) == 3, "resume reprocessed done files"
+
+
+def check_mapping_revert(work: str) -> None:
+    out_a = os.path.join(work, "out", "a", "shot.ma")
+    journal = os.path.join(work, "journals", "a", "shot.ma.renames.jsonl")
+    code = batch.main([out_a, "--mapping", journal, "--revert", "--in-place",
+                       "--report", os.path.join(work, "revert.jsonl"), "--fake"])
+    assert code == 0, f"exit code {code}"
+    assert _transforms(out_a) == ["old_box0", "old_box1", "old_box2", "persp", "props", "top"], _transforms(out_a)
+
+
+def check_mapping_csv(work: str) -> None:
+    out = os.path.join(work, "mapped")
+    code = _run(work, "--mapping", os.path.join(work, "mapping.csv"), "--output-dir", out,
+                "--report", os.path.join(work, "mapping.jsonl"))
+    assert code == 0, f"exit code {code}"
+    assert "hero_box" in _transforms(os.path.join(out, "props.ma"))
+    ao_fake_cmds.file(os.path.join(out, "props.ma"), open=True, force=True)
+    assert ao_fake_cmds.ls(type="lambert") == ["hero_mat"], ao_fake_cmds.ls(type="lambert")
+
+
+def check_search_workers(work: str) -> None:
+    code = _run(work, "--search", "^old_", "--replace", "new_", "--in-place",
+                "--report", os.path.join(work, "search.jsonl"), "--workers", "2")
+    assert code == 0, f"exit code {code}"
+    for name in ("a/shot.ma", "b/shot.ma", "props.ma"):
+        names = _transforms(os.path.join(work, "scenes", name))
+        assert not any(n.startswith("old_") for n in names) and "new_box0" in names, (name, names)
+
+
+def check_search_node_type(work: str) -> None:
+    out = os.path.join(work, "searched")
+    # a pattern matching every name: the default cameras still keep theirs
+    code = _run(work, "--search", "^", "--replace", "n_", "--output-dir", out,
+                "--report", os.path.join(work, "search_all.jsonl"))
+    assert code == 0, f"exit code {code}"
+    names = _transforms(os.path.join(out, "props.ma"))
+    assert names == ["n_old_box0", "n_props", "persp", "top"], names
+
+    code = _run(work, "--search", "^old_", "--replace", "new_", "--node-type", "lambert", "--output-dir", out,
+                "--report", os.path.join(work, "search_lambert.jsonl"))
+    assert code == 0, f"exit code {code}"
+    ao_fake_cmds.file(os.path.join(out, "props.ma"), open=True, force=True)
+    assert ao_fake_cmds.ls(type="lambert") == ["new_mat"], ao_fake_cmds.ls(type="lambert")
+    assert "old_box0" in (ao_fake_cmds.ls(type="transform") or []), "--node-type lambert renamed transforms"
+
+
+def check_dry_run(work: str) -> None:
+    journals = os.path.join(work, "dry_journals")
+    before = _transforms(os.path.join(work, "scenes", "props.ma"))
+    code = _run(work, "--prefix", "geo", "--base", "box", "--dry-run", "--journal-dir", journals,
+                "--report", os.path.join(work, "dry.jsonl"))
+    assert code == 0, f"exit code {code}"
+    rows = _report(os.path.join(work, "dry.jsonl"))
+    assert all(r["renamed"] and not r["output"] and not r["journal"] for r in rows.values()), rows
+    assert not os.path.exists(journals) or not os.listdir(journals), "dry run wrote journals"
+    assert _transforms(os.path.join(work, "scenes", "props.ma")) == before
+
+
+CHECKS: List[Callable[[str], None]] = [
+    check_rule,
+    check_resume,
+    check_mapping_revert,
+    check_mapping_csv,
+    check_search_node_type,
+    check_dry_run,
+    check_search_workers,  # last: renames the sources in place
+]
+
+
+def main() -> int:
+    work = tempfile.mkdtemp(prefix="ao_renamer_poc_batch_check_")
+    failed = 0
+    try:
+        shutil.copytree(FIXTURES_DIR, work, dirs_exist_ok=True)
+        for check in CHECKS:
+            try:
+                check(work)
+                print(f"[ok]     {check.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"[FAILED] {check.__name__}: {e}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+# -----------------------------------------------------------------------------
+# Command line entry
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(main())
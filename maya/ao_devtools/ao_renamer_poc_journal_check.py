@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_journal_check.py
+
+Renamer PoC - rename journal / mapping check against the stand-in (dev only, no Maya)
+- Journals a run, reverts it with run_mapping(revert=True) and applies it again
+- Short names repeated under different parents (|rigA|ctrl, |rigB|ctrl) and
+  SCOPE_PARENT runs must round-trip exactly, without renumbering
+- Journals are written row by row while renaming (iter_rename, search / replace)
+
+Usage:
+    python maya/ao_devtools/ao_renamer_poc_journal_check.py
+Exit code 0 when every check passes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Callable, List
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_RENAMER_DIR = os.path.join(_THIS_DIR, os.pardir, "ao_renamer_poc")
+for _path in (_THIS_DIR, _RENAMER_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+import ao_fake_cmds
+
+ao_fake_cmds.install()
+
+import ao_renamer_poc_system as renamer_system
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def _rigs() -> List[str]:
+    """
+    New scene with two rigs holding a child of the same short name; both children selected.
+    """
+    ao_fake_cmds.reset()
+    ctrls = []
+    for rig in ("rigA", "rigB"):
+        group = ao_fake_cmds.createNode("transform", name=rig)
+        child = ao_fake_cmds.createNode("transform", name=f"{rig}_ctrl", parent=group)
+        ao_fake_cmds.rename(child, "ctrl")  # createNode names are scene-unique, rename only checks siblings
+        ctrls.append(f"|{rig}|ctrl")
+    ao_fake_cmds.select(ctrls)
+    return ctrls
+
+
+def _ctrl_paths() -> List[str]:
+    return sorted(p for p in ao_fake_cmds.ls(type="transform", long=True) if p.count("|") == 2)
+
+
+def _journal_rows(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ----------------------------
+# Checks
+# ----------------------------
+
+def check_revert_repeated_short_names(work: str) -> None:
+    _rigs()
+    journal = os.path.join(work, "repeated.jsonl")
+    summary = renamer_system.run_rename(renamer_system.RenameInput(prefix="geo", journal_path=journal))
+    assert summary.renamed == 2, summary
+    assert _ctrl_paths() == ["|rigA|GEO_01", "|rigB|GEO_02"], _ctrl_paths()
+
+    summary = renamer_system.run_mapping(renamer_system.MappingInput(path=journal, revert=True))
+    assert summary.renamed == 2 and summary.failed == 0, list(summary.results)
+    assert _ctrl_paths() == ["|rigA|ctrl", "|rigB|ctrl"], _ctrl_paths()
+    assert all(r.message == "" for r in summary.results), [r.message for r in summary.results]
+
+
+def check_parent_scope_round_trip(work: str) -> None:
+    _rigs()
+    journal = os.path.join(work, "parent_scope.csv")
+    rename_input = renamer_system.RenameInput(prefix="geo", scope=renamer_system.SCOPE_PARENT, journal_path=journal)
+    renamer_system.run_rename(rename_input)
+    assert _ctrl_paths() == ["|rigA|GEO_01", "|rigB|GEO_01"], _ctrl_paths()
+
+    renamer_system.run_mapping(renamer_system.MappingInput(path=journal, revert=True))
+    assert _ctrl_paths() == ["|rigA|ctrl", "|rigB|ctrl"], _ctrl_paths()
+
+    # applying the journal again gives the journaled names back, not GEO_01 / GEO_02
+    summary = renamer_system.run_mapping(renamer_system.MappingInput(path=journal))
+    assert summary.renamed == 2, list(summary.results)
+    assert _ctrl_paths() == ["|rigA|GEO_01", "|rigB|GEO_01"], _ctrl_paths()
+
+
+def check_sibling_still_collides(work: str) -> None:
+    ctrls = _rigs()
+    ao_fake_cmds.createNode("transform", name="GEO_01", parent="rigA")
+    mapping = os.path.join(work, "sibling.csv")
+    with open(mapping, "w", encoding="utf-8", newline="") as f:
+        f.write("old,new\n" + "".join(f"{path},GEO_01\n" for path in ctrls))
+    summary = renamer_system.run_mapping(renamer_system.MappingInput(path=mapping))
+    assert summary.renamed == 2, list(summary.results)
+    # only rigA holds a GEO_01 sibling
+    assert _ctrl_paths() == ["|rigA|GEO_01", "|rigA|GEO_02", "|rigB|GEO_01"], _ctrl_paths()
+
+
+def check_journal_streamed(work: str) -> None:
+    _rigs()
+    journal = os.path.join(work, "streamed.jsonl")
+    run_iter = renamer_system.iter_rename(renamer_system.RenameInput(prefix="geo", journal_path=journal))
+    next(run_iter)
+    # stopped after one rename: that row is already on disk
+    assert [r["new"] for r in _journal_rows(journal)] == ["GEO_01"], _journal_rows(journal)
+    run_iter.close()
+    assert len(_journal_rows(journal)) == 1, _journal_rows(journal)
+
+    journal = os.path.join(work, "search.csv")
+    renamer_system.run_search_replace(renamer_system.SearchReplaceInput(pattern="^GEO_01$", replacement="ctrl", journal_path=journal))
+    renamer_system.run_mapping(renamer_system.MappingInput(path=journal, revert=True))
+    assert _ctrl_paths() == ["|rigA|GEO_01", "|rigB|ctrl"], _ctrl_paths()
+
+
+CHECKS: List[Callable[[str], None]] = [
+    check_revert_repeated_short_names,
+    check_parent_scope_round_trip,
+    check_sibling_still_collides,
+    check_journal_streamed,
+]
+
+
+def main() -> int:
+    work = tempfile.mkdtemp(prefix="ao_renamer_poc_journal_check_")
+    failed = 0
+    try:
+        for check in CHECKS:
+            try:
+                check(work)
+                print(f"[ok]     {check.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"[FAILED] {check.__name__}: {e}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+# -----------------------------------------------------------------------------
+# Command line entry
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(main())
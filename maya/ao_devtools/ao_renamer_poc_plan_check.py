@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_plan_check.py
+
+Renamer PoC - rename planning check against the stand-in (dev only, no Maya)
+- SCOPE_ROOT: roots are planned before their own descendants only, steps run in
+  plan order, selection order is kept inside every scope
+- is_plan_current: scoped plans only look at names taken inside their own scopes
+- IndexAllocator.allocate_block: merged runs, gap skipping, block at the end
+- lint_scene: duplicates are numbered after the direct fixes; 100k transforms
+  (ls answered from a prebuilt listing) stay within LINT_BUDGET_SECONDS
+- RenameResults: len(), [i] and column() agree on rows (empty slots included)
+
+Usage:
+    python maya/ao_devtools/ao_renamer_poc_plan_check.py
+Exit code 0 when every check passes.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Callable, List
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_RENAMER_DIR = os.path.join(_THIS_DIR, os.pardir, "ao_renamer_poc")
+for _path in (_THIS_DIR, _RENAMER_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+import ao_fake_cmds
+
+ao_fake_cmds.install()
+
+import ao_renamer_poc_system as renamer_system
+
+LINT_BUDGET_SECONDS = 0.75  # best of 3, Maya's own ls time not included
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def _node(name: str, parent: str = "") -> str:
+    """
+    Create a transform named exactly `name` (createNode names are scene-unique,
+    rename only checks siblings). Returns its long name.
+    """
+    node = ao_fake_cmds.createNode("transform", name="tmp_check_node", parent=parent or None)
+    ao_fake_cmds.rename(node, name)
+    return f"{parent}|{name}"
+
+
+def _rigs() -> None:
+    """
+    New scene: |rigA|ctrl_a and |rigB|GEO_01 (GEO_01 already taken under another parent).
+    """
+    ao_fake_cmds.reset()
+    _node("rigA")
+    _node("rigB")
+    _node("ctrl_a", "|rigA")
+    _node("GEO_01", "|rigB")
+
+
+# ----------------------------
+# Checks
+# ----------------------------
+
+def check_root_scope_order() -> None:
+    ao_fake_cmds.reset()
+    _node("GEO_x_05")
+    _node("n1", "|GEO_x_05")
+    _node("n2")
+    _node("n3")
+    _node("GEO_x_10", "|n3")
+    ao_fake_cmds.select(["|n2", "|n3|GEO_x_10", "|n3", "|GEO_x_05|n1", "|GEO_x_05"])
+    rename_input = renamer_system.RenameInput(prefix="geo", base_name="x", start_index=3, scope=renamer_system.SCOPE_ROOT)
+
+    plan = renamer_system.build_rename_plan(rename_input)
+    # world level keeps selection order: n2, n3, GEO_x_05 -> 03, 04, 05
+    assert [item.new_name for item in plan.items] == ["GEO_x_03", "GEO_x_03", "GEO_x_04", "GEO_x_03", "GEO_x_05"], plan.items
+    assert [i for i, _ in plan.steps] == [0, 2, 1, 4, 3], plan.steps
+
+    summary = renamer_system.run_rename(rename_input, plan)
+    assert summary.renamed == 5, list(summary.results)
+    assert all("Maya used" not in r.message for r in summary.results), [r.message for r in summary.results]
+    assert sorted(ao_fake_cmds.ls(type="transform", long=True)) == [
+        "|GEO_x_03", "|GEO_x_04", "|GEO_x_04|GEO_x_03", "|GEO_x_05", "|GEO_x_05|GEO_x_03",
+    ], ao_fake_cmds.ls(type="transform", long=True)
+
+
+def check_scoped_plan_current() -> None:
+    for scope in (renamer_system.SCOPE_PARENT, renamer_system.SCOPE_ROOT):
+        _rigs()
+        ao_fake_cmds.select(["|rigA|ctrl_a"])
+        plan = renamer_system.build_rename_plan(renamer_system.RenameInput(prefix="geo", scope=scope))
+        assert [item.new_name for item in plan.items] == ["GEO_01"], plan.items
+        # GEO_01 under rigB is another scope
+        assert renamer_system.is_plan_current(plan), scope
+
+        _node("GEO_01", "|rigA")
+        assert not renamer_system.is_plan_current(plan), scope
+
+
+def check_root_plan_current() -> None:
+    _rigs()
+    _node("deep", "|rigA")
+    ao_fake_cmds.select(["|rigA", "|rigA|ctrl_a"])
+    plan = renamer_system.build_rename_plan(renamer_system.RenameInput(prefix="geo", scope=renamer_system.SCOPE_ROOT))
+    assert renamer_system.is_plan_current(plan)
+
+    # a name taken anywhere inside the selected root makes the plan stale
+    _node("GEO_01", "|rigA|deep")
+    assert not renamer_system.is_plan_current(plan)
+
+
+def check_scene_plan_current() -> None:
+    _rigs()
+    ao_fake_cmds.select(["|rigA|ctrl_a"])
+    plan = renamer_system.build_rename_plan(renamer_system.RenameInput(prefix="geo"))
+    assert [item.new_name for item in plan.items] == ["GEO_02"], plan.items
+    assert renamer_system.is_plan_current(plan)
+
+    _node("GEO_02", "|rigB")
+    assert not renamer_system.is_plan_current(plan)
+
+
+def check_allocate_block() -> None:
+    alloc = renamer_system.IndexAllocator("GEO_arm_", 2, used=[1, 2, 3, 5, 6, 9])
+    assert alloc.gaps() == [(4, 4), (7, 8)], alloc.gaps()
+
+    # gap 4 is too small, 7..8 fits and merges 5..9 into one run
+    assert alloc.allocate_block(2) == 7
+    assert alloc.gaps() == [(4, 4)], alloc.gaps()
+    assert alloc.is_used(8) and not alloc.is_used(4)
+
+    # no gap fits: the block starts after the high-water mark
+    assert alloc.allocate_block(3) == 10
+    assert alloc.high_water_mark == 12
+    assert alloc.allocate_block(1) == 4
+    assert alloc.gaps() == [], alloc.gaps()
+
+    # start inside a used run skips to the run's end, start past the end is kept
+    assert alloc.allocate_block(2, start=5) == 13
+    assert alloc.allocate_block(2, start=20) == 20
+    assert alloc.gaps() == [(15, 19)], alloc.gaps()
+    assert alloc.allocate_block(5, start=2) == 15
+    assert alloc.gaps() == [] and alloc.high_water_mark == 21
+
+
+def check_lint_direct_fixes_first() -> None:
+    ao_fake_cmds.reset()
+    _node("GEO_arm_01")
+    _node("grp")
+    _node("GEO_arm_01", "|grp")
+    _node("geo_arm_02")
+    report = renamer_system.lint_scene()
+    planned = {item.node: item.new_name for item in report.fix_plan.items}
+    # the prefix fix keeps its index, the duplicate takes the next free one
+    assert planned == {"|geo_arm_02": "GEO_arm_02", "|grp|GEO_arm_01": "GEO_arm_03"}, planned
+
+
+def check_lint_timing() -> None:
+    names = (
+        [f"|scatter|aoBench_{i}" for i in range(60000)]
+        + [f"|crowd|BENCH_node_{2 * i + 1:02d}" for i in range(30000)]
+        + [f"|fix|geo_arm_{i:02d}" for i in range(10000)]
+    )
+    listed = [x for name in names for x in (name, "transform")]
+    scene_ls = ao_fake_cmds.ls
+
+    def ls(*args, **kwargs):
+        if kwargs.get("uuid"):
+            return [""] * len(args[0])
+        return scene_ls(*args, **kwargs) if args else list(listed)
+
+    ao_fake_cmds.reset()
+    ao_fake_cmds.ls = ls
+    try:
+        timings = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            report = renamer_system.lint_scene()
+            timings.append(time.perf_counter() - t0)
+    finally:
+        ao_fake_cmds.ls = scene_ls
+    assert report.scanned == 100000 and len(report.fix_plan.steps) == 10000, (report.scanned, len(report.fix_plan.steps))
+    assert min(timings) < LINT_BUDGET_SECONDS, f"lint_scene: {min(timings):.3f} s (budget {LINT_BUDGET_SECONDS} s)"
+
+
+def check_results_rows() -> None:
+    results = renamer_system.RenameResults(3)
+    results.set(0, renamer_system.RenameItemResult(node="GEO_01", old_name="|a", new_name="GEO_01", status="renamed", message="Used index: 1"), 1)
+    results.set(2, renamer_system.RenameItemResult(node="|c", old_name="|c", new_name=None, status="failed", message="no"))
+
+    # slot 1 is still empty: a row everywhere, None in every column, skipped by iteration
+    for name in ("node", "old_name", "new_name", "status", "message"):
+        column = results.column(name)
+        assert len(column) == len(results) == 3, (name, column)
+        assert column[1] is None, (name, column)
+    assert results.column("old_name") == ["|a", None, "|c"], results.column("old_name")
+    assert results.column("message") == ["Used index: 1", None, "no"], results.column("message")
+    assert [r.old_name for r in results] == ["|a", "|c"]
+    try:
+        results[1]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("empty slot did not raise IndexError")
+
+
+CHECKS: List[Callable[[], None]] = [
+    check_root_scope_order,
+    check_scoped_plan_current,
+    check_root_plan_current,
+    check_scene_plan_current,
+    check_allocate_block,
+    check_lint_direct_fixes_first,
+    check_lint_timing,
+    check_results_rows,
+]
+
+
+def main() -> int:
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"[ok]     {check.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[FAILED] {check.__name__}: {e}")
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+# -----------------------------------------------------------------------------
+# Command line entry
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,28 @@
 """
 ao_renamer_poc_UI.py
 
-Renamer PoC - UI module (v0.1.0)
+Renamer PoC - UI module (v0.4.4)
 - PySide6
 - Dockable via MayaQWidgetDockableMixin
 - Collect inputs and call system.run_rename()
+- Optional chunked run: system.iter_rename() driven by a QTimer, with progress / Cancel
+- Optional background planning: scene snapshot on the main thread,
+  system.plan_from_snapshot() on a concurrent.futures worker
+- Live preview: debounced on input edits, served from the system plan cache
+  (invalidated by the scene watch callbacks)
+- Results / preview in a QTableView over the result list (status filter, sorting)
 """
 
 from __future__ import annotations
 
-from typing import Optional
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
 
 import maya.cmds as cmds
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
@@ -29,6 +38,174 @@ import ao_renamer_poc_system as renamer_system
 WINDOW_TITLE = "ao_renamer_poc"
 WORKSPACE_CONTROL_NAME = "ao_renamer_pocWorkspaceControl"
 
+# Chunked run: time spent renaming per timer tick before the UI gets control back
+SLICE_SECONDS = 0.03
+
+# Background planning: how often the main thread checks the worker
+PLAN_POLL_MS = 20
+
+# Live preview: wait this long after the last edit before planning
+PREVIEW_DEBOUNCE_MS = 250
+
+# Message lines kept above the result table
+MESSAGE_LINES = 6
+
+# Result table status filter: (label, status; "" = all)
+STATUS_FILTERS = (
+    ("すべて", ""),
+    ("renamed", "renamed"),
+    ("skipped", "skipped"),
+    ("failed", "failed"),
+    ("planned (Preview)", "planned"),
+)
+
+_plan_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_plan_executor() -> ThreadPoolExecutor:
+    """
+    One shared worker: planning is pure Python, a second thread would only fight over the GIL.
+    """
+    global _plan_executor
+    if _plan_executor is None:
+        _plan_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aoRenamerPocPlan")
+    return _plan_executor
+
+
+# -----------------------------------------------------------------------------
+# Result table model
+# -----------------------------------------------------------------------------
+
+def _old_name(row) -> Optional[str]:
+    # plan items (Preview) have no old_name: the planned node is the old name
+    return getattr(row, "old_name", None) or row.node
+
+
+# (header, attribute, getter)
+RESULT_COLUMNS = (
+    ("Node", "node", lambda r: r.node),
+    ("Old Name", "old_name", _old_name),
+    ("New Name", "new_name", lambda r: r.new_name),
+    ("Status", "status", lambda r: r.status),
+    ("Message", "message", lambda r: r.message),
+)
+
+_STATUS_COLORS = {
+    "failed": QtGui.QColor(235, 110, 100),
+    "skipped": QtGui.QColor(150, 150, 150),
+}
+
+
+class RenameResultModel(QtCore.QAbstractTableModel):
+    """
+    Table over RenameResults / a list of RenamePlanItem, read by attribute (nothing copied).
+    - The view only asks for visible cells, so 100k rows cost nothing until scrolled
+    - Filter and sort keep a list of row indices instead of a QSortFilterProxyModel,
+      so no Python call per comparison
+    - RenameResults columns are read directly (no result object per row to filter / sort)
+    """
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._rows: Sequence[object] = []
+        self._known = 0  # rows of _rows already in the view bookkeeping
+        self._view: List[int] = []  # visible row -> index in _rows
+        self._status_filter = ""
+        self._sort_column = -1
+        self._sort_order = QtCore.Qt.AscendingOrder
+
+    # --- Qt model interface
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._view)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(RESULT_COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return RESULT_COLUMNS[section][0]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[self._view[index.row()]]
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            value = RESULT_COLUMNS[index.column()][2](row)
+            return "" if value is None else str(value)
+        if role == QtCore.Qt.ForegroundRole:
+            return _STATUS_COLORS.get(row.status)
+        return None
+
+    def sort(self, column: int, order=QtCore.Qt.AscendingOrder) -> None:
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._apply_sort()
+        self.layoutChanged.emit()
+
+    # --- rows
+    def set_rows(self, rows: Sequence[object]) -> None:
+        """
+        Show rows (kept by reference, not copied).
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._known = len(rows)
+        self._rebuild_view()
+        self.endResetModel()
+
+    def rows_appended(self) -> None:
+        """
+        The shown sequence grew (chunked run appends to it); the sort order is
+        re-applied on the next set_rows.
+        """
+        start, self._known = self._known, len(self._rows)
+        added = [i for i in range(start, self._known) if self._accepts(self._rows[i])]
+        if not added:
+            return
+        first = len(self._view)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(added) - 1)
+        self._view.extend(added)
+        self.endInsertRows()
+
+    def set_status_filter(self, status: str) -> None:
+        self.beginResetModel()
+        self._status_filter = status
+        self._rebuild_view()
+        self.endResetModel()
+
+    def _column(self, column: int) -> List[Optional[str]]:
+        _, attr, getter = RESULT_COLUMNS[column]
+        if hasattr(self._rows, "column") and attr != "node":
+            return self._rows.column(attr)
+        return [getter(row) for row in self._rows]
+
+    def _accepts(self, row) -> bool:
+        return not self._status_filter or row.status == self._status_filter
+
+    def _rebuild_view(self) -> None:
+        if self._status_filter or hasattr(self._rows, "column"):
+            # status None: an empty RenameResults slot, never a visible row
+            statuses = self._column(3)
+            self._view = [
+                i for i, status in enumerate(statuses)
+                if status is not None and (not self._status_filter or status == self._status_filter)
+            ]
+        else:
+            self._view = list(range(len(self._rows)))
+        self._apply_sort()
+
+    def _apply_sort(self) -> None:
+        if not 0 <= self._sort_column < len(RESULT_COLUMNS):
+            return
+        values = self._column(self._sort_column)
+        self._view.sort(
+            key=lambda i: values[i] or "",
+            reverse=self._sort_order == QtCore.Qt.DescendingOrder,
+        )
+
 
 # -----------------------------------------------------------------------------
 # Main Window
@@ -46,10 +223,43 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
         self.setMinimumWidth(360)
 
+        # Plan kept from the last Preview (applied by Rename if still current)
+        self._plan: Optional[renamer_system.RenamePlan] = None
+
+        # Chunked run state (see _start_chunked_rename)
+        self._run_plan: Optional[renamer_system.RenamePlan] = None
+        self._run_iter: Optional[Iterator[renamer_system.RenameItemResult]] = None
+        self._run_journal: List[Tuple[int, str]] = []
+        self._run_results = renamer_system.RenameResults()
+        self._cancel_requested = False
+        # Last finished chunked run (plan, journal), reverted as a whole by revert_run_btn
+        self._last_run: Optional[Tuple[renamer_system.RenamePlan, List[Tuple[int, str]]]] = None
+        self._run_timer = QtCore.QTimer(self)
+        self._run_timer.setInterval(0)
+
+        # Background planning state (see _plan_in_background)
+        self._plan_future: Optional[Future] = None
+        self._plan_done: Optional[Callable[[renamer_system.RenamePlan], None]] = None
+        self._plan_generation = 0
+        self._plan_timer = QtCore.QTimer(self)
+        self._plan_timer.setInterval(PLAN_POLL_MS)
+
+        # Live preview debounce
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+
         self._build_ui()
         self._connect_signals()
         self._refresh_version_label()
 
+        # Scene watch stays installed after the window closes, so reopening hits the cache
+        try:
+            renamer_system.install_scene_watch()
+        except Exception as e:
+            cmds.warning(f"[ao_renamer_poc] scene watch not installed: {e}")
+        self._schedule_live_preview()
+
     # -------------------------
     # UI construction
     # -------------------------
@@ -93,6 +303,9 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.suffix_le = QtWidgets.QLineEdit()
         self.suffix_le.setPlaceholderText("例: grp / jnt (自動で小文字化)")
 
+        self.template_le = QtWidgets.QLineEdit()
+        self.template_le.setPlaceholderText("空欄で標準ルール / 例: {prefix}_{parent}_{type}_{index:03}")
+
         self.start_index_sb = QtWidgets.QSpinBox()
         self.start_index_sb.setRange(1, 999999)
         self.start_index_sb.setValue(1)
@@ -101,11 +314,72 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.padding_sb.setRange(1, 6)
         self.padding_sb.setValue(2)
 
+        self.hwm_cb = QtWidgets.QCheckBox("前回の続き番号から開始 (fileInfo)")
+        self.hwm_cb.setChecked(False)
+
+        self.two_phase_cb = QtWidgets.QCheckBox("2段階リネーム (選択内の名前を再利用 / 入れ替え)")
+        self.two_phase_cb.setChecked(False)
+
+        self.non_ascii_cb = QtWidgets.QComboBox()
+        self.non_ascii_cb.addItem("置換 (_)", renamer_system.NON_ASCII_REPLACE)
+        self.non_ascii_cb.addItem("削除", renamer_system.NON_ASCII_STRIP)
+        self.non_ascii_cb.addItem("ASCII 変換 (全角英数・アクセント)", renamer_system.NON_ASCII_ASCII)
+
+        self.scope_cb = QtWidgets.QComboBox()
+        self.scope_cb.addItem("シーン全体", renamer_system.SCOPE_SCENE)
+        self.scope_cb.addItem("親ごと (兄弟内で一意)", renamer_system.SCOPE_PARENT)
+        self.scope_cb.addItem("ネームスペースごと", renamer_system.SCOPE_NAMESPACE)
+        self.scope_cb.addItem("選択ルートごと (階層内で一意)", renamer_system.SCOPE_ROOT)
+
+        self.order_cb = QtWidgets.QComboBox()
+        self.order_cb.addItem("選択順", (renamer_system.ORDER_SELECTION, "x"))
+        self.order_cb.addItem("X 座標 (ワールド)", (renamer_system.ORDER_AXIS, "x"))
+        self.order_cb.addItem("Y 座標 (ワールド)", (renamer_system.ORDER_AXIS, "y"))
+        self.order_cb.addItem("Z 座標 (ワールド)", (renamer_system.ORDER_AXIS, "z"))
+        self.order_cb.addItem("原点からの距離", (renamer_system.ORDER_DISTANCE, "x"))
+        self.order_cb.addItem("階層の深さ", (renamer_system.ORDER_DEPTH, "x"))
+        self.order_cb.addItem("現在の名前 (自然順)", (renamer_system.ORDER_NATURAL, "x"))
+
+        self.order_reverse_cb = QtWidgets.QCheckBox("逆順で番号を振る")
+        self.order_reverse_cb.setChecked(False)
+
+        self.engine_cb = QtWidgets.QComboBox()
+        self.engine_cb.addItem("cmds", renamer_system.ENGINE_CMDS)
+        self.engine_cb.addItem("OpenMaya 2 (一括 doIt)", renamer_system.ENGINE_API)
+        self.engine_cb.setToolTip(
+            "OpenMaya 2 のリネームは 1 回の Ctrl+Z でまとめて取り消せます。\n"
+            "(ao_renamer_poc_undo_plugin を自動でロード。ロードできない場合は cmds で実行)"
+        )
+
+        self.trace_cb = QtWidgets.QCheckBox("cmds 呼び出しを計測 (ao_cmds_trace)")
+        self.trace_cb.setChecked(False)
+
+        self.chunked_cb = QtWidgets.QCheckBox("分割実行 (進捗表示 / キャンセル可)")
+        self.chunked_cb.setChecked(False)
+
+        self.background_cb = QtWidgets.QCheckBox("バックグラウンドで名前を計画 (大量選択向け)")
+        self.background_cb.setChecked(False)
+
+        self.live_cb = QtWidgets.QCheckBox("ライブプレビュー (入力変更時に自動更新)")
+        self.live_cb.setChecked(True)
+
         form.addRow("Prefix", self.prefix_le)
         form.addRow("BaseName", self.base_le)
         form.addRow("Suffix", self.suffix_le)
+        form.addRow("Template", self.template_le)
         form.addRow("Start Index", self.start_index_sb)
         form.addRow("Padding", self.padding_sb)
+        form.addRow("", self.hwm_cb)
+        form.addRow("", self.two_phase_cb)
+        form.addRow("Non-ASCII", self.non_ascii_cb)
+        form.addRow("Scope", self.scope_cb)
+        form.addRow("Order", self.order_cb)
+        form.addRow("", self.order_reverse_cb)
+        form.addRow("Engine", self.engine_cb)
+        form.addRow("", self.trace_cb)
+        form.addRow("", self.chunked_cb)
+        form.addRow("", self.background_cb)
+        form.addRow("", self.live_cb)
 
         main_layout.addLayout(form)
 
@@ -122,13 +396,64 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
         main_layout.addLayout(btn_row)
 
-        # Result / log
-        self.log_te = QtWidgets.QPlainTextEdit()
-        self.log_te.setReadOnly(True)
-        self.log_te.setMinimumHeight(140)
-        self.log_te.setPlaceholderText("ここに結果が表示されます。")
-
-        main_layout.addWidget(self.log_te, 1)
+        # A chunked run is one undo chunk per slice -> the whole run is reverted from its journal
+        self.revert_run_btn = QtWidgets.QPushButton("Revert (last chunked run)")
+        self.revert_run_btn.setEnabled(False)
+        main_layout.addWidget(self.revert_run_btn)
+
+        # Chunked run progress (hidden while idle)
+        progress_row = QtWidgets.QHBoxLayout()
+        progress_row.setSpacing(8)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+
+        progress_row.addWidget(self.progress_bar, 1)
+        progress_row.addWidget(self.cancel_btn)
+
+        self.progress_widget = QtWidgets.QWidget()
+        self.progress_widget.setLayout(progress_row)
+        progress_row.setContentsMargins(0, 0, 0, 0)
+        self.progress_widget.setVisible(False)
+        main_layout.addWidget(self.progress_widget)
+
+        # Messages (last few lines only)
+        self._messages = deque(maxlen=MESSAGE_LINES)
+        self.message_label = QtWidgets.QLabel("ここに結果が表示されます。")
+        self.message_label.setWordWrap(True)
+        self.message_label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        main_layout.addWidget(self.message_label)
+
+        # Result table
+        filter_row = QtWidgets.QHBoxLayout()
+        filter_row.setSpacing(8)
+        self.status_filter_cb = QtWidgets.QComboBox()
+        for label, status in STATUS_FILTERS:
+            self.status_filter_cb.addItem(label, status)
+        filter_row.addWidget(QtWidgets.QLabel("Status"))
+        filter_row.addWidget(self.status_filter_cb, 1)
+        main_layout.addLayout(filter_row)
+
+        self.result_model = RenameResultModel(self)
+        self.result_view = QtWidgets.QTableView()
+        self.result_view.setModel(self.result_model)
+        self.result_view.setMinimumHeight(140)
+        self.result_view.setSortingEnabled(True)
+        self.result_view.sortByColumn(-1, QtCore.Qt.AscendingOrder)  # plan order until a header is clicked
+        self.result_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.result_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.result_view.setWordWrap(False)
+        # fixed row height: no per-row size hint queries
+        v_header = self.result_view.verticalHeader()
+        v_header.setVisible(False)
+        v_header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        v_header.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        h_header = self.result_view.horizontalHeader()
+        h_header.setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        h_header.setStretchLastSection(True)
+
+        main_layout.addWidget(self.result_view, 1)
 
         # Footer small note
         self.note_label = QtWidgets.QLabel("対象: 選択中の transform のみ / 重複は連番で回避")
@@ -138,6 +463,23 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
     def _connect_signals(self) -> None:
         self.preview_btn.clicked.connect(self.on_preview)
         self.rename_btn.clicked.connect(self.on_rename)
+        self.cancel_btn.clicked.connect(self.on_cancel)
+        self.revert_run_btn.clicked.connect(self.on_revert_run)
+        self._run_timer.timeout.connect(self._on_run_tick)
+        self._plan_timer.timeout.connect(self._on_plan_poll)
+        self._preview_timer.timeout.connect(self._live_preview)
+        self.status_filter_cb.currentIndexChanged.connect(
+            lambda *_: self.result_model.set_status_filter(self.status_filter_cb.currentData())
+        )
+
+        for le in (self.prefix_le, self.base_le, self.suffix_le, self.template_le):
+            le.textChanged.connect(self._schedule_live_preview)
+        for sb in (self.start_index_sb, self.padding_sb):
+            sb.valueChanged.connect(self._schedule_live_preview)
+        for cb in (self.hwm_cb, self.two_phase_cb, self.order_reverse_cb, self.live_cb):
+            cb.toggled.connect(self._schedule_live_preview)
+        for combo in (self.non_ascii_cb, self.scope_cb, self.order_cb):
+            combo.currentIndexChanged.connect(self._schedule_live_preview)
 
     def _refresh_version_label(self) -> None:
         try:
@@ -150,28 +492,57 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
     # -------------------------
 
     def _collect_inputs(self) -> renamer_system.RenameInput:
+        order, order_axis = self.order_cb.currentData()
         return renamer_system.RenameInput(
             prefix=self.prefix_le.text(),
             base_name=self.base_le.text(),
             suffix=self.suffix_le.text(),
             start_index=int(self.start_index_sb.value()),
             padding=int(self.padding_sb.value()),
+            use_high_water_mark=self.hwm_cb.isChecked(),
+            engine=self.engine_cb.currentData(),
+            two_phase=self.two_phase_cb.isChecked(),
+            template=self.template_le.text().strip(),
+            non_ascii=self.non_ascii_cb.currentData(),
+            scope=self.scope_cb.currentData(),
+            order=order,
+            order_axis=order_axis,
+            order_reverse=self.order_reverse_cb.isChecked(),
+            trace=self.trace_cb.isChecked(),
         )
 
     def _log(self, text: str, clear: bool = False) -> None:
+        """
+        Short status messages; results go to the table (_show_results).
+        """
         if clear:
-            self.log_te.setPlainText(text)
-        else:
-            current = self.log_te.toPlainText().rstrip()
-            if current:
-                self.log_te.setPlainText(current + "\n" + text)
-            else:
-                self.log_te.setPlainText(text)
-
-        # scroll to end
-        cursor = self.log_te.textCursor()
-        cursor.movePosition(cursor.End)
-        self.log_te.setTextCursor(cursor)
+            self._messages.clear()
+        self._messages.extend(text.splitlines() or [""])
+        self.message_label.setText("\n".join(self._messages))
+
+    def _show_results(self, rows: Sequence[object]) -> None:
+        self.result_model.set_rows(rows)
+
+    def _log_summary(self, summary: renamer_system.RenameSummary, title: str = "=== Rename Result ===") -> None:
+        lines = []
+        lines.append(f"{title}  v{renamer_system.__version__}")
+        lines.append(f"selected: {summary.total_selected} / targets(transform): {summary.total_targets}")
+        lines.append(f"renamed: {summary.renamed}  skipped: {summary.skipped}  failed: {summary.failed}")
+
+        if summary.cmds_stats is not None:
+            # full report goes to the Script Editor
+            report = summary.cmds_stats.report()
+            print("\n".join(report))
+            lines.append(report[0] + " (詳細は Script Editor)")
+
+        self._log("\n".join(lines), clear=True)
+        self._show_results(summary.results)
+
+    def _set_running(self, running: bool) -> None:
+        self.preview_btn.setEnabled(not running)
+        self.rename_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        self.progress_widget.setVisible(running)
 
     def _warn_dialog(self, title: str, message: str) -> None:
         QtWidgets.QMessageBox.warning(self, title, message)
@@ -191,21 +562,52 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 self._warn_dialog("No Selection", "何も選択されていません。")
                 return
 
-            # system preview
-            pairs = renamer_system.preview_names(inp)
-            if not pairs:
-                self._log("Preview: 対象 transform がありません。", clear=True)
-                return
+            self._preview(inp)
 
-            lines = ["=== Preview ==="]
-            for node, new_name in pairs:
-                lines.append(f"{node}  ->  {new_name}")
+        except Exception as e:
+            self._log(f"[Preview Failed] {e}", clear=False)
 
-            self._log("\n".join(lines), clear=True)
+    def _schedule_live_preview(self, *args) -> None:
+        if self.live_cb.isChecked():
+            self._preview_timer.start()  # restarts the debounce window
 
+    def _live_preview(self) -> None:
+        """
+        Debounced preview: silent when nothing is selected or a run / plan is in progress.
+        """
+        if not self.live_cb.isChecked() or self._run_iter is not None:
+            return
+        if self._plan_future is not None:
+            self._preview_timer.start()
+            return
+
+        try:
+            if not cmds.ls(selection=True):
+                return
+            self._preview(self._collect_inputs())
         except Exception as e:
             self._log(f"[Preview Failed] {e}", clear=False)
 
+    def _preview(self, inp: renamer_system.RenameInput) -> None:
+        # system plan cache first (no Maya call if inputs and scene are unchanged)
+        plan = renamer_system.peek_cached_plan(inp)
+        if plan is None and self.background_cb.isChecked():
+            self._plan_in_background(inp, self._show_preview)
+            return
+
+        # keep the plan so Rename does not plan again
+        self._show_preview(plan or renamer_system.cached_rename_plan(inp))
+
+    def _show_preview(self, plan: renamer_system.RenamePlan) -> None:
+        self._plan = plan
+        self._show_results(plan.items)
+        if not plan.items:
+            self._log("Preview: 対象 transform がありません。", clear=True)
+            return
+
+        failed = sum(1 for item in plan.items if item.status == "failed")
+        self._log(f"=== Preview ===\nplanned: {len(plan.items) - failed}  failed: {failed}", clear=True)
+
     def on_rename(self) -> None:
         """
         Execute rename via system.run_rename()
@@ -217,27 +619,206 @@ class AoRenamerPocWindow(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 self._warn_dialog("No Selection", "何も選択されていません。")
                 return
 
-            summary = renamer_system.run_rename(inp)
+            plan = self._plan
+            self._plan = None
+            if plan is not None and (plan.inputs != inp or not renamer_system.is_plan_current(plan)):
+                plan = None
 
-            lines = []
-            lines.append("=== Rename Result ===")
-            lines.append(f"version: v{renamer_system.__version__}")
-            lines.append(f"selected: {summary.total_selected} / targets(transform): {summary.total_targets}")
-            lines.append(f"renamed: {summary.renamed}  skipped: {summary.skipped}  failed: {summary.failed}")
-            lines.append("")
+            if plan is None and self.background_cb.isChecked():
+                self._plan_in_background(inp, lambda p: self._apply_plan(inp, p, check_current=True))
+                return
 
-            for r in summary.results:
-                if r.status == "renamed":
-                    lines.append(f"[OK] {r.old_name} -> {r.new_name} ({r.message})")
-                elif r.status == "skipped":
-                    lines.append(f"[SKIP] {r.old_name} ({r.message})")
-                else:
-                    lines.append(f"[FAIL] {r.old_name} ({r.message})")
+            self._apply_plan(inp, plan)
 
-            self._log("\n".join(lines), clear=True)
+        except Exception as e:
+            self._log(f"[Rename Failed] {e}", clear=False)
+
+    def _apply_plan(
+        self,
+        inp: renamer_system.RenameInput,
+        plan: Optional[renamer_system.RenamePlan],
+        check_current: bool = False,
+    ) -> None:
+        """
+        Rename on the main thread (blocking or chunked).
+        check_current: the plan comes from the worker, the scene may have changed meanwhile.
+        """
+        if check_current and plan is not None and not renamer_system.is_plan_current(plan):
+            self._log("[Rename Failed] 計画中にシーンが変更されました。もう一度実行してください。", clear=False)
+            return
+
+        if self.chunked_cb.isChecked():
+            self._start_chunked_rename(inp, plan)
+            return
 
+        summary = renamer_system.run_rename(inp, plan=plan)
+        self._log_summary(summary)
+
+    def on_cancel(self) -> None:
+        """
+        Stop the chunked run at the next tick and roll it back,
+        or drop the result of a background plan.
+        """
+        if self._plan_future is not None:
+            self._finish_background_plan()
+            self._log("=== Planning Cancelled ===", clear=False)
+            return
+
+        self._cancel_requested = True
+        self.cancel_btn.setEnabled(False)
+
+    def on_revert_run(self) -> None:
+        """
+        Revert the last finished chunked run from its journal (one undo chunk).
+        """
+        if self._last_run is None:
+            return
+        (plan, journal), self._last_run = self._last_run, None
+        self.revert_run_btn.setEnabled(False)
+        try:
+            reverted = renamer_system.rollback_rename(plan, journal)
+            self._log(f"=== Revert (chunked run) ===\nreverted: {reverted} rename step(s)", clear=False)
+        except Exception as e:
+            self._log(f"[Revert Failed] {e}", clear=False)
+
+    # -------------------------
+    # Background planning
+    # -------------------------
+
+    def _plan_in_background(
+        self,
+        inp: renamer_system.RenameInput,
+        on_done: Callable[[renamer_system.RenamePlan], None],
+    ) -> None:
+        """
+        Snapshot the scene here (Maya calls stay on the main thread), plan on the
+        worker, and hand the plan to on_done from a QTimer poll on the main thread.
+        """
+        self._plan_generation = renamer_system.scene_generation()
+        snapshot = renamer_system.take_scene_snapshot(inp)
+        self._plan_future = _get_plan_executor().submit(renamer_system.plan_from_snapshot, inp, snapshot)
+        self._plan_done = on_done
+
+        self.progress_bar.setRange(0, 0)  # busy indicator
+        self._set_running(True)
+        self._log(f"Planning {len(snapshot.targets)} node(s)...", clear=True)
+        self._plan_timer.start()
+
+    def _on_plan_poll(self) -> None:
+        future = self._plan_future
+        if future is None:
+            self._plan_timer.stop()
+            return
+        if not future.done():
+            return
+
+        on_done = self._plan_done
+        self._finish_background_plan()
+        try:
+            plan = future.result()
+            renamer_system.remember_plan(plan, self._plan_generation)
+            on_done(plan)
+        except Exception as e:
+            self._log(f"[Plan Failed] {e}", clear=False)
+
+    def _finish_background_plan(self) -> None:
+        # a running worker cannot be interrupted; its result is simply dropped
+        self._plan_timer.stop()
+        self._plan_future = None
+        self._plan_done = None
+        self._set_running(False)
+
+    # -------------------------
+    # Chunked run
+    # -------------------------
+
+    def _start_chunked_rename(self, inp: renamer_system.RenameInput, plan: Optional[renamer_system.RenamePlan]) -> None:
+        """
+        Plan, then rename SLICE_SECONDS at a time from a QTimer so the UI keeps repainting.
+        Each slice is its own undo chunk, opened and closed inside the tick, so nothing
+        the user does in Maya between slices joins the run's undo steps. The whole run
+        is reverted from the journal: Cancel while running, revert_run_btn afterwards.
+        """
+        if plan is None:
+            plan = renamer_system.build_rename_plan(inp)
+
+        self._run_plan = plan
+        self._run_journal = []
+        self._run_results = renamer_system.RenameResults()
+        self._run_iter = renamer_system.iter_rename(inp, plan=plan, journal=self._run_journal)
+        self._cancel_requested = False
+        self._last_run = None
+        self.revert_run_btn.setEnabled(False)
+
+        self.progress_bar.setRange(0, max(1, len(plan.items)))
+        self.progress_bar.setValue(0)
+        self._set_running(True)
+        self._log(f"Renaming {len(plan.items)} node(s)...", clear=True)
+        self._show_results(self._run_results)
+        self._run_timer.start()
+
+    def _on_run_tick(self) -> None:
+        if self._run_iter is None:
+            self._run_timer.stop()
+            return
+
+        if self._cancel_requested:
+            self._finish_chunked_rename(cancelled=True)
+            return
+
+        finished = False
+        deadline = time.perf_counter() + SLICE_SECONDS
+        cmds.undoInfo(openChunk=True)
+        try:
+            while time.perf_counter() < deadline:
+                self._run_results.append(next(self._run_iter))
+        except StopIteration:
+            finished = True
+        except Exception as e:
+            self._log(f"[Rename Failed] {e}", clear=False)
+            self._cancel_requested = True
+        finally:
+            # one chunk per slice: never left open while Maya handles other input
+            cmds.undoInfo(closeChunk=True)
+
+        self.result_model.rows_appended()
+        self.progress_bar.setValue(len(self._run_results))
+        if finished:
+            self._finish_chunked_rename(cancelled=False)
+
+    def _finish_chunked_rename(self, cancelled: bool) -> None:
+        self._run_timer.stop()
+        if self._run_iter is None:
+            return
+        run_iter, self._run_iter = self._run_iter, None
+        plan, self._run_plan = self._run_plan, None
+
+        try:
+            if cancelled:
+                run_iter.close()
+                reverted = renamer_system.rollback_rename(plan, self._run_journal)
+                self._log(f"=== Rename Cancelled ===\nrolled back: {reverted} rename step(s)", clear=True)
+                self._show_results([])
+            else:
+                if self._run_journal:
+                    self._last_run = (plan, self._run_journal)
+                    self.revert_run_btn.setEnabled(True)
+                self._log_summary(renamer_system.summarize_results(plan, self._run_results))
         except Exception as e:
             self._log(f"[Rename Failed] {e}", clear=False)
+        finally:
+            self._run_journal = []
+            self._run_results = renamer_system.RenameResults()
+            self._set_running(False)
+
+    def closeEvent(self, event) -> None:
+        # window closed mid-run: keep what was renamed (no undo chunk is open between slices)
+        self._finish_chunked_rename(cancelled=False)
+        super().closeEvent(event)
+
+    def dockCloseEventTriggered(self) -> None:
+        # docked workspaceControl closed (MayaQWidgetDockableMixin hook, no closeEvent)
+        self._finish_chunked_rename(cancelled=False)
 
 
 # -----------------------------------------------------------------------------
@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_batch.py
+
+Renamer PoC - headless batch renamer (mayapy)
+- Applies one rename rule, regex search / replace (any --node-type) or mapping file to many .ma / .mb files
+- Default cameras (persp / top / front / side and their shapes) are never renamed by a rule or a search
+- Files are spread over a process pool; each worker starts maya.standalone once
+- Per-file results are appended to one JSONL report as soon as each file finishes
+- --resume skips files the report already lists as done (rerun after a crash)
+- Optional per-file rename journal (revert later with --mapping <journal> --revert)
+- Outputs and journals keep each file's path relative to the inputs' common folder
+  (scenes/a/shot.ma and scenes/b/shot.ma -> out/a/shot.ma, out/b/shot.ma)
+- --fake runs the workers against ao_devtools/ao_fake_cmds (plain .ma text only, no Maya)
+
+Usage:
+    mayapy ao_renamer_poc_batch.py scenes/ --prefix geo --base prop --output-dir out/ --report report.jsonl
+    mayapy ao_renamer_poc_batch.py scenes/*.ma --search "^old_" --replace "new_" --in-place --workers 4
+    mayapy ao_renamer_poc_batch.py scenes/ --search "^lambert" --replace "mat_" --node-type lambert --in-place
+    mayapy ao_renamer_poc_batch.py scenes/ --mapping renames.csv --in-place --resume --report report.jsonl
+
+Report rows (one JSON object per file):
+    {"file", "status": "done" / "failed", "renamed", "skipped", "failed", "targets",
+     "seconds", "output", "journal", "error"}
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEVTOOLS_DIR = os.path.join(_THIS_DIR, os.pardir, "ao_devtools")
+
+# Set by _init_worker (maya.cmds cannot be imported before maya.standalone / the stand-in)
+cmds = None
+renamer_system = None
+
+
+MODE_RULE = "rule"
+MODE_SEARCH = "search"
+MODE_MAPPING = "mapping"
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+SCENE_EXTENSIONS = (".ma", ".mb")
+# Default cameras (transforms and shapes) are never renamed, by a rule or a search
+DEFAULT_EXCLUDE = ("persp", "top", "front", "side")
+DEFAULT_EXCLUDE_SHAPES = tuple(name + "Shape" for name in DEFAULT_EXCLUDE)
+
+
+# ----------------------------
+# Data structures
+# ----------------------------
+
+@dataclass
+class BatchJob:
+    """
+    What every worker does to each file (plain values only: sent to spawned workers).
+    """
+    mode: str = MODE_RULE  # MODE_RULE / MODE_SEARCH / MODE_MAPPING
+    options: Dict[str, Any] = field(default_factory=dict)  # RenameInput / SearchReplaceInput / MappingInput fields
+    select: Tuple[str, ...] = ("*",)  # MODE_RULE: ls patterns of the transforms to rename
+    output_dir: str = ""  # save renamed copies here
+    in_place: bool = False  # overwrite the source files
+    dry_run: bool = False  # rename in memory only: no save, no journal
+    journal_dir: str = ""  # write <scene>.renames.jsonl here per file
+    root: str = ""  # output / journal paths are relative to this folder (run_batch: common folder of the files)
+    fake: bool = False  # ao_fake_cmds instead of maya.standalone
+
+
+@dataclass
+class FileResult:
+    file: str
+    status: str  # STATUS_DONE / STATUS_FAILED
+    renamed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    targets: int = 0
+    seconds: float = 0.0
+    output: str = ""
+    journal: str = ""
+    error: str = ""
+
+
+# ----------------------------
+# Public API
+# ----------------------------
+
+def run_batch(
+    files: Sequence[str],
+    job: BatchJob,
+    report_path: str,
+    workers: int = 1,
+    resume: bool = False,
+) -> List[FileResult]:
+    """
+    Process files with `workers` processes (1: in this process, no pool).
+    Each result is appended to report_path (JSONL) and flushed as soon as it arrives,
+    so a crash loses at most the files in flight; resume=True skips files the
+    report already has as done.
+    """
+    files = [os.path.abspath(f) for f in files]
+    if files and not job.root:
+        job = replace(job, root=input_root(files))
+    done = _done_files(report_path) if resume else set()
+    pending = [f for f in files if f not in done]
+    results: List[FileResult] = []
+
+    with open(report_path, "a" if resume else "w", encoding="utf-8") as report:
+        for result in _iter_results(pending, job, workers):
+            report.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            report.flush()
+            results.append(result)
+
+    return results
+
+
+def input_root(files: Sequence[str]) -> str:
+    """
+    Common folder of the files: outputs and journals mirror the layout below it,
+    so equal file names in different folders never share an output path.
+    """
+    return os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+
+
+def find_scene_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand files, directories (recursive) and glob patterns to .ma / .mb files, sorted.
+    """
+    found: List[str] = []
+    for path in paths:
+        matches = glob.glob(path) if any(ch in path for ch in "*?[") else [path]
+        for match in matches:
+            if os.path.isdir(match):
+                for root, _, names in os.walk(match):
+                    found.extend(os.path.join(root, n) for n in names if n.lower().endswith(SCENE_EXTENSIONS))
+            elif match.lower().endswith(SCENE_EXTENSIONS):
+                found.append(match)
+    return sorted(dict.fromkeys(os.path.abspath(f) for f in found))
+
+
+# ----------------------------
+# Workers
+# ----------------------------
+
+def _iter_results(files: List[str], job: BatchJob, workers: int) -> Iterator[FileResult]:
+    if not files:
+        return
+
+    if workers <= 1:
+        _init_worker(job.fake)
+        for path in files:
+            yield process_file(path, job)
+        return
+
+    # spawn: every worker is a fresh interpreter that starts its own Maya
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(job.fake,)) as pool:
+        futures = {pool.submit(process_file, path, job): path for path in files}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool as e:
+                # a worker died (Maya crash): report what is left as failed, --resume retries them
+                yield FileResult(file=futures[future], status=STATUS_FAILED, error=f"worker crashed: {e}")
+            except Exception as e:
+                yield FileResult(file=futures[future], status=STATUS_FAILED, error=str(e))
+
+
+def _init_worker(fake: bool) -> None:
+    """
+    Start Maya (or the stand-in) once per process and import the system module.
+    """
+    global cmds, renamer_system
+    if renamer_system is not None:
+        return
+
+    for path in (_THIS_DIR, _DEVTOOLS_DIR if fake else None):
+        if path and path not in sys.path:
+            sys.path.append(path)
+
+    if fake:
+        import ao_fake_cmds
+        ao_fake_cmds.install()
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+
+    import maya.cmds
+    import ao_renamer_poc_system
+
+    cmds = maya.cmds
+    renamer_system = ao_renamer_poc_system
+
+
+def process_file(path: str, job: BatchJob) -> FileResult:
+    """
+    Open one scene, rename, save (unless dry_run, or neither output_dir nor in_place), in the current process.
+    Errors become a failed FileResult; they never stop the batch.
+    """
+    _init_worker(job.fake)
+    t0 = time.perf_counter()
+    result = FileResult(file=path, status=STATUS_DONE)
+
+    try:
+        relative = os.path.relpath(path, job.root or os.path.dirname(path))
+        # dry run: the renamed scene is dropped, nothing is written
+        if job.journal_dir and not job.dry_run:
+            result.journal = os.path.join(job.journal_dir, relative + ".renames.jsonl")
+            os.makedirs(os.path.dirname(result.journal), exist_ok=True)
+
+        cmds.file(path, open=True, force=True)
+        plan, run = _plan_file(job, result.journal)
+        summary = run(plan)  # the journal is written while renaming
+
+        result.renamed = summary.renamed
+        result.skipped = summary.skipped
+        result.failed = summary.failed
+        result.targets = summary.total_targets
+
+        if not job.dry_run:
+            if job.output_dir or job.in_place:
+                result.output = path if job.in_place else os.path.join(job.output_dir, relative)
+                if result.output != path:
+                    os.makedirs(os.path.dirname(result.output), exist_ok=True)
+                    cmds.file(rename=result.output)
+                cmds.file(save=True, force=True, type=_file_type(result.output))
+
+    except Exception as e:
+        result.status = STATUS_FAILED
+        result.error = str(e)
+
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+def _plan_file(job: BatchJob, journal_path: str = ""):
+    """
+    (plan, run) for the opened scene; run(plan) applies it and returns a RenameSummary.
+    No undo chunk or refresh suspension: there is no undo queue or viewport in batch.
+    journal_path: written row by row by the run ("" = no journal).
+    """
+    options = dict(job.options, undo_chunk=False, suspend_refresh=False, journal_path=journal_path)
+
+    if job.mode == MODE_SEARCH:
+        inp = renamer_system.SearchReplaceInput(**options)
+        return renamer_system.build_search_replace_plan(inp), lambda plan: renamer_system.run_search_replace(inp, plan=plan)
+
+    if job.mode == MODE_MAPPING:
+        inp = renamer_system.MappingInput(**options)
+        return renamer_system.build_mapping_plan(inp), lambda plan: renamer_system.run_mapping(inp, plan=plan)
+
+    # rule: no interactive selection, select the matching transforms instead
+    targets = cmds.ls(list(job.select), type="transform", long=True) or []
+    targets = [t for t in targets if t.rsplit("|", 1)[-1] not in DEFAULT_EXCLUDE]
+    if targets:
+        cmds.select(targets, replace=True)
+    else:
+        cmds.select(clear=True)
+    inp = renamer_system.RenameInput(**options)
+    return renamer_system.build_rename_plan(inp), lambda plan: renamer_system.run_rename(inp, plan=plan)
+
+
+def _file_type(path: str) -> str:
+    return "mayaBinary" if path.lower().endswith(".mb") else "mayaAscii"
+
+
+def _done_files(report_path: str) -> set:
+    """
+    Files the report already lists as done (a torn last line from a crash is ignored).
+    """
+    done = set()
+    if not os.path.exists(report_path):
+        return done
+    with open(report_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(row, dict) and row.get("status") == STATUS_DONE:
+                done.add(row.get("file"))
+    return done
+
+
+# ----------------------------
+# Command line
+# ----------------------------
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch rename over many Maya scene files (mayapy).")
+    parser.add_argument("paths", nargs="+", help=".ma / .mb files, directories or glob patterns")
+
+    rule = parser.add_argument_group("rule (default mode: rename the selected transforms by RenameInput)")
+    rule.add_argument("--prefix", default="")
+    rule.add_argument("--base", default="")
+    rule.add_argument("--suffix", default="")
+    rule.add_argument("--template", default="")
+    rule.add_argument("--start-index", type=int, default=1)
+    rule.add_argument("--padding", type=int, default=2)
+    rule.add_argument("--scope", default="scene", choices=("scene", "parent", "namespace", "root"))
+    rule.add_argument("--order", default="selection", choices=("selection", "axis", "distance", "depth", "natural"))
+    rule.add_argument("--select", action="append", help="ls pattern of transforms to rename (repeatable, default: all)")
+
+    search = parser.add_argument_group("search / replace")
+    search.add_argument("--search", help="regex matched against each node name of --node-type")
+    search.add_argument("--replace", default="")
+    search.add_argument("--node-type", default="transform", help="ls type filter: transform, joint, mesh, shadingEngine, ...")
+
+    mapping = parser.add_argument_group("mapping")
+    mapping.add_argument("--mapping", help="JSONL / CSV mapping or rename journal")
+    mapping.add_argument("--revert", action="store_true", help="apply the mapping new -> old")
+
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument("--output-dir", help="save renamed copies here")
+    out.add_argument("--in-place", action="store_true", help="overwrite the source files")
+    out.add_argument("--dry-run", action="store_true", help="rename in memory only: no save, no journal")
+
+    parser.add_argument("--journal-dir", default="", help="write a rename journal per file")
+    parser.add_argument("--report", default="ao_renamer_poc_batch_report.jsonl")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--resume", action="store_true", help="skip files the report lists as done")
+    parser.add_argument("--fake", action="store_true", help="use ao_devtools/ao_fake_cmds (.ma text, no Maya)")
+    return parser.parse_args(argv)
+
+
+def _job_from_args(args: argparse.Namespace) -> BatchJob:
+    if args.search is not None and args.mapping:
+        raise SystemExit("--search and --mapping cannot be combined")
+
+    if args.search is not None:
+        mode = MODE_SEARCH
+        options: Dict[str, Any] = {
+            "pattern": args.search,
+            "replacement": args.replace,
+            "node_type": args.node_type,
+            "ignore": DEFAULT_EXCLUDE + DEFAULT_EXCLUDE_SHAPES,
+        }
+    elif args.mapping:
+        mode = MODE_MAPPING
+        options = {"path": os.path.abspath(args.mapping), "revert": args.revert}
+    else:
+        mode = MODE_RULE
+        options = {
+            "prefix": args.prefix,
+            "base_name": args.base,
+            "suffix": args.suffix,
+            "template": args.template,
+            "start_index": args.start_index,
+            "padding": args.padding,
+            "scope": args.scope,
+            "order": args.order,
+        }
+
+    return BatchJob(
+        mode=mode,
+        options=options,
+        select=tuple(args.select or ("*",)),
+        output_dir=os.path.abspath(args.output_dir) if args.output_dir else "",
+        in_place=args.in_place,
+        dry_run=args.dry_run,
+        journal_dir=os.path.abspath(args.journal_dir) if args.journal_dir else "",
+        fake=args.fake,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    job = _job_from_args(args)
+    files = find_scene_files(args.paths)
+    if not files:
+        print("[ao_renamer_poc_batch] no .ma / .mb files found")
+        return 1
+
+    for folder in (job.output_dir, job.journal_dir):
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    t0 = time.perf_counter()
+    results = run_batch(files, job, args.report, workers=args.workers, resume=args.resume)
+    failed = [r for r in results if r.status != STATUS_DONE]
+
+    print(f"[ao_renamer_poc_batch] files: {len(files)}, processed: {len(results)}, "
+          f"skipped (resume): {len(files) - len(results)}, failed: {len(failed)}, "
+          f"renamed nodes: {sum(r.renamed for r in results)}, "
+          f"time: {time.perf_counter() - t0:.1f} s, report: {args.report}")
+    for r in failed:
+        print(f"  [failed] {r.file}: {r.error}")
+    return 1 if failed else 0
+
+
+# -----------------------------------------------------------------------------
+# Command line entry (mayapy)
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_bench.py
+
+Renamer PoC - benchmark suite
+- Builds N transform + shape pairs under a scratch group
+  (plus N/2 nodes already using the rename pattern, every other index)
+- Times _filter_transforms / preview_names / run_rename and counts Maya calls
+  (ao_devtools/ao_cmds_trace)
+- Naming convention lint over the whole scene (bench_lint)
+- Index ordering modes: one batched position query + sort (bench_ordering)
+- Per-result memory of RenameSummary.results (bench_result_memory, tracemalloc)
+- Deletes the scratch nodes afterwards
+- Runs in Maya (Script Editor) or in plain Python against ao_devtools/ao_fake_cmds
+
+Usage (Maya):
+    import ao_renamer_poc_bench as bench
+    bench.bench_suite()
+
+Usage (plain Python, no Maya license):
+    python maya/ao_renamer_poc/ao_renamer_poc_bench.py 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+_DEVTOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "ao_devtools")
+if _DEVTOOLS_DIR not in sys.path:
+    sys.path.append(_DEVTOOLS_DIR)
+
+try:
+    import maya.cmds as cmds
+except ImportError:
+    # plain Python: run against the in-memory stand-in
+    import ao_fake_cmds
+    cmds = ao_fake_cmds.install()
+
+import ao_cmds_trace
+import ao_renamer_poc_system as renamer_system
+
+
+SCRATCH_GROUP = "aoRenamerPocBench_grp"
+CROWD_GROUP = "aoRenamerPocBenchCrowd_grp"
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+# ----------------------------
+# Scratch scene
+# ----------------------------
+
+def _build_scatter(count: int) -> Tuple[str, List[str]]:
+    """
+    Create `count` transform + mesh pairs under one group.
+    Returns (group long name, shape long names).
+    """
+    grp = cmds.createNode("transform", name=SCRATCH_GROUP)
+    shapes: List[str] = []
+    for i in range(count):
+        t = cmds.createNode("transform", name=f"aoBench_{i}", parent=grp)
+        shapes.append(cmds.createNode("mesh", name=f"aoBench_{i}Shape", parent=t))
+    grp_long = cmds.ls(grp, long=True)[0]
+    return grp_long, cmds.ls(shapes, long=True) or []
+
+
+def _build_crowd(count: int, head: str, padding: int) -> str:
+    """
+    Occupy every other index of the rename pattern (collisions for the allocator).
+    Returns the group long name.
+    """
+    grp = cmds.createNode("transform", name=CROWD_GROUP)
+    for i in range(count):
+        cmds.createNode("transform", name=f"{head}{str(2 * i + 1).zfill(padding)}", parent=grp)
+    return cmds.ls(grp, long=True)[0]
+
+
+def _delete_scatter(grp: str) -> None:
+    if cmds.objExists(grp):
+        cmds.delete(grp)
+
+
+# ----------------------------
+# Measuring
+# ----------------------------
+
+def _measure(label: str, size: int, func: Callable[[], object]) -> Dict[str, object]:
+    with ao_cmds_trace.trace_cmds(renamer_system) as stats:
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "bench": label,
+        "size": size,
+        "calls": stats.total_calls,
+        "counts": dict(stats.calls),
+        "cmds_seconds": stats.total_seconds,
+        "seconds": elapsed,
+    }
+
+
+def _print_rows(title: str, rows: List[Dict[str, object]]) -> None:
+    print(f"=== ao_renamer_poc bench: {title} ===")
+    for r in rows:
+        top = ", ".join(f"{k}={v}" for k, v in sorted(r["counts"].items(), key=lambda kv: -kv[1])[:4])
+        print(f"{r['bench']:<20} size: {r['size']:>7}  calls: {r['calls']:>7}  time: {r['seconds'] * 1000.0:10.2f} ms  ({top})")
+
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+
+def bench_suite(sizes: Sequence[int] = DEFAULT_SIZES) -> List[Dict[str, object]]:
+    """
+    _filter_transforms / preview_names / run_rename at each size.
+    Call counts should stay flat for the first two and grow by one
+    cmds.rename per node for run_rename.
+    """
+    rows: List[Dict[str, object]] = []
+    inp = renamer_system.RenameInput(prefix="bench", base_name="node", padding=2)
+
+    for size in sizes:
+        grp, shapes = _build_scatter(size)
+        crowd = _build_crowd(size // 2, "BENCH_node_", inp.padding)
+        try:
+            cmds.select(shapes, replace=True)
+            rows.append(_measure("_filter_transforms", size, lambda: renamer_system._filter_transforms(shapes)))
+            rows.append(_measure("preview_names", size, lambda: renamer_system.preview_names(inp)))
+            rows.append(_measure("run_rename", size, lambda: renamer_system.run_rename(inp)))
+        finally:
+            _delete_scatter(grp)
+            _delete_scatter(crowd)
+
+    _print_rows("suite", rows)
+    return rows
+
+
+def bench_filter_transforms(sizes: Sequence[int] = (100, 1000, 10000)) -> List[Dict[str, object]]:
+    """
+    Time _filter_transforms over a selection of shapes and count Maya calls.
+    The call count should stay the same for every size.
+    """
+    rows: List[Dict[str, object]] = []
+
+    for size in sizes:
+        grp, shapes = _build_scatter(size)
+        try:
+            rows.append(_measure("_filter_transforms", size, lambda: renamer_system._filter_transforms(shapes)))
+        finally:
+            _delete_scatter(grp)
+
+    _print_rows("_filter_transforms", rows)
+    return rows
+
+
+def bench_rename_options(size: int = 5000) -> List[Dict[str, object]]:
+    """
+    Time run_rename with undo chunk / refresh suspension switched on and off.
+    """
+    rows: List[Dict[str, object]] = []
+
+    for undo_chunk in (False, True):
+        for suspend_refresh in (False, True):
+            grp, shapes = _build_scatter(size)
+            try:
+                cmds.select(shapes, replace=True)
+                inp = renamer_system.RenameInput(
+                    prefix="bench",
+                    base_name="node",
+                    undo_chunk=undo_chunk,
+                    suspend_refresh=suspend_refresh,
+                )
+                label = f"undo={int(undo_chunk)} suspend={int(suspend_refresh)}"
+                rows.append(_measure(label, size, lambda: renamer_system.run_rename(inp)))
+            finally:
+                _delete_scatter(grp)
+
+    _print_rows("run_rename options", rows)
+    return rows
+
+
+def bench_search_replace(sizes: Sequence[int] = (10000, 100000)) -> List[Dict[str, object]]:
+    """
+    build_search_replace_plan / run_search_replace over `size` transforms
+    (2 * size nodes with their shapes). Planning stays at three ls calls.
+    """
+    rows: List[Dict[str, object]] = []
+    inp = renamer_system.SearchReplaceInput(pattern=r"^aoBench_", replacement="aoBenchRe_")
+
+    for size in sizes:
+        grp, _ = _build_scatter(size)
+        try:
+            plan_box: List[renamer_system.RenamePlan] = []
+            rows.append(_measure("search_replace plan", size, lambda: plan_box.append(renamer_system.build_search_replace_plan(inp))))
+            rows.append(_measure("search_replace run", size, lambda: renamer_system.run_search_replace(inp, plan=plan_box[0])))
+        finally:
+            _delete_scatter(grp)
+
+    _print_rows("search / replace", rows)
+    return rows
+
+
+def bench_lint(sizes: Sequence[int] = (10000, 100000)) -> List[Dict[str, object]]:
+    """
+    lint_scene over `size` scratch transforms (none of which follow the convention,
+    so every node gets a planned fix) plus the crowd of conforming names.
+    """
+    rows: List[Dict[str, object]] = []
+
+    for size in sizes:
+        grp, _ = _build_scatter(size)
+        crowd = _build_crowd(size // 2, "BENCH_node_", 2)
+        try:
+            rows.append(_measure("lint_scene", size, lambda: renamer_system.lint_scene()))
+        finally:
+            _delete_scatter(grp)
+            _delete_scatter(crowd)
+
+    _print_rows("lint", rows)
+    return rows
+
+
+def bench_ordering(size: int = 50000) -> List[Dict[str, object]]:
+    """
+    build_rename_plan over `size` scattered transforms with each RenameInput.order.
+    Spatial orders add one xform call whatever the size.
+    """
+    rows: List[Dict[str, object]] = []
+    orders = (
+        renamer_system.ORDER_SELECTION,
+        renamer_system.ORDER_AXIS,
+        renamer_system.ORDER_DISTANCE,
+        renamer_system.ORDER_DEPTH,
+        renamer_system.ORDER_NATURAL,
+    )
+
+    grp, shapes = _build_scatter(size)
+    try:
+        for i, shape in enumerate(shapes):
+            cmds.xform(shape.rsplit("|", 1)[0], translation=((i * 7919) % size, (i * 104729) % size, i))
+        cmds.select(shapes, replace=True)
+        for order in orders:
+            inp = renamer_system.RenameInput(prefix="bench", base_name="node", order=order)
+            rows.append(_measure(f"plan order={order}", size, lambda: renamer_system.build_rename_plan(inp)))
+    finally:
+        _delete_scatter(grp)
+
+    _print_rows("ordering", rows)
+    return rows
+
+
+@dataclass
+class _PlainResult:
+    """
+    Per-object result layout before RenameResults (regular dataclass, __dict__ per object).
+    """
+    node: str
+    old_name: str
+    new_name: Optional[str]
+    status: str
+    message: str = ""
+
+
+def _traced_bytes(build: Callable[[], object]) -> Tuple[object, int]:
+    """
+    (object, bytes still allocated by build() once it returns).
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return obj, after - before
+
+
+def bench_result_memory(size: int = 100000) -> List[Dict[str, object]]:
+    """
+    Bytes per result for one run over `size` nodes:
+    RenameResults (as returned), the same results as slotted RenameItemResult
+    objects, and as regular dataclass objects with their own strings.
+    Plan strings (old paths, planned names) are shared and not counted.
+    """
+    grp, shapes = _build_scatter(size)
+    try:
+        cmds.select(shapes, replace=True)
+        inp = renamer_system.RenameInput(prefix="bench", base_name="node")
+        plan = renamer_system.build_rename_plan(inp)
+
+        results = renamer_system._apply_plan_cmds(plan)
+        objects, objects_bytes = _traced_bytes(lambda: list(results))
+
+        def _store() -> renamer_system.RenameResults:
+            store = renamer_system.RenameResults(len(objects))
+            for i, r in enumerate(objects):
+                store.set(i, r, plan.items[i].index)
+            return store
+
+        store, store_bytes = _traced_bytes(_store)
+        _, plain_bytes = _traced_bytes(lambda: [
+            _PlainResult(r.node, r.old_name, "".join(r.new_name or ""), r.status, "".join(r.message))
+            for r in objects
+        ])
+    finally:
+        _delete_scatter(grp)
+
+    n = max(1, len(store))
+    rows = [
+        {"layout": "RenameResults (columns)", "bytes": store_bytes},
+        {"layout": "RenameItemResult (__slots__)", "bytes": objects_bytes},
+        {"layout": "dataclass + own strings", "bytes": plain_bytes},
+    ]
+    print(f"=== ao_renamer_poc bench: result memory ({n} results) ===")
+    for r in rows:
+        r["per_result"] = r["bytes"] / n
+        print(f"{r['layout']:<30} total: {r['bytes'] / 1024.0 / 1024.0:8.2f} MiB  per result: {r['per_result']:7.1f} B")
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Manual test (Script Editor / command line)
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    _sizes = tuple(int(a) for a in sys.argv[1:] if a.isdigit()) or DEFAULT_SIZES
+    bench_suite(_sizes)
+    bench_result_memory(max(_sizes))
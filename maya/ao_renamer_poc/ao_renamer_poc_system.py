@@ -2,21 +2,131 @@
 """
 ao_renamer_poc_system.py
 
-Renamer PoC - system module (v0.1.0)
+Renamer PoC - system module (v0.4.4)
 - Selection-based rename (transform only)
-- Name rule: [prefix]_[baseName]_[suffix]_[index]
+- Name rule: [prefix]_[baseName]_[suffix]_[index] (or a NameTemplate, compiled once per run)
 - Collision avoidance: increment index until unique
+- Name lookups against an in-memory snapshot (NameRegistry)
+- Gap-aware index allocation per name pattern (IndexAllocator)
+- Plan once (RenamePlan), then preview / execute the same plan
+- Rename engines: cmds (default) / OpenMaya 2 (one MDagModifier per run, one undo step
+  through the aoRenamerPocApiRename command of ao_renamer_poc_undo_plugin)
+- Optional two-phase mode: names held inside the selection can be reused
+- One undo chunk per run, viewport / outliner refresh suspended while renaming
+- Optional cmds call tracing (RenameInput.trace, needs ao_devtools/ao_cmds_trace)
+- Step-wise rename (iter_rename) for time-sliced UI drivers, with journal rollback
+- Snapshot on the main thread, plan anywhere (take_scene_snapshot / plan_from_snapshot)
+- Plan cache keyed on inputs + scene generation (bumped by name / selection callbacks)
+- Results kept column-wise (RenameResults), status counters updated on append
+- Scene-wide regex search / replace over one node type (run_search_replace)
+- Naming convention lint with a fix plan (lint_scene / apply_lint_fixes)
+- Rename journal (JSONL / CSV) and mapping-file driven bulk rename / revert (run_mapping)
+- Uniqueness / numbering scopes: scene, parent, namespace, selection root (RenameInput.scope)
+- Index order: selection, world position along an axis, distance from a pivot,
+  hierarchy depth, natural name sort (RenameInput.order; NumPy used if available)
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import csv
+import json
+import os
+import re
+import string
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import astuple, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import maya.cmds as cmds
 
-
-__version__ = "0.1.2"
+try:
+    import maya.api.OpenMaya as om
+except ImportError:  # OpenMaya 2 not available -> cmds engine only
+    om = None
+
+try:
+    import numpy as np
+except ImportError:  # no NumPy -> orders are sorted in plain Python
+    np = None
+
+try:
+    import ao_cmds_trace
+except ImportError:  # ao_devtools not on sys.path -> RenameInput.trace is ignored
+    ao_cmds_trace = None
+
+
+__version__ = "0.4.4"
+
+ENGINE_CMDS = "cmds"
+ENGINE_API = "api"
+
+# Undoable command wrapping the OpenMaya 2 rename (registered by the plugin, loaded on demand)
+API_RENAME_COMMAND = "aoRenamerPocApiRename"
+UNDO_PLUGIN_NAME = "ao_renamer_poc_undo_plugin"
+
+# fileInfo key prefix for per-pattern high-water marks (see IndexAllocator)
+HWM_FILEINFO_PREFIX = "aoRenamerPoc_hwm:"
+
+# Default name rule as a template (empty tokens drop their "_")
+DEFAULT_TEMPLATE = "{prefix}_{base}_{suffix}_{index}"
+TEMPLATE_FIELDS = ("prefix", "base", "suffix", "index", "parent", "type")
+
+# Non-ASCII handling for sanitized tokens
+NON_ASCII_REPLACE = "replace"  # each character -> "_"
+NON_ASCII_STRIP = "strip"  # dropped
+NON_ASCII_ASCII = "ascii"  # NFKD fold ("Ｇｅｏ" -> "Geo", "é" -> "e"), the rest dropped
+
+# Uniqueness / numbering scope of new names (RenameInput.scope)
+SCOPE_SCENE = "scene"  # short names unique in the whole scene, one counter per pattern
+SCOPE_PARENT = "parent"  # unique among siblings, one counter per parent
+SCOPE_NAMESPACE = "namespace"  # new names stay in the node's namespace, one counter per namespace
+SCOPE_ROOT = "root"  # unique inside each selected hierarchy (topmost selected node), one counter each
+
+# Order in which targets get their indices (RenameInput.order)
+ORDER_SELECTION = "selection"  # as selected
+ORDER_AXIS = "axis"  # world position along RenameInput.order_axis
+ORDER_DISTANCE = "distance"  # world distance from RenameInput.order_pivot
+ORDER_DEPTH = "depth"  # hierarchy depth, parents first
+ORDER_NATURAL = "natural"  # current short name, digit runs compared as numbers ("a2" < "a10")
+_SPATIAL_ORDERS = (ORDER_AXIS, ORDER_DISTANCE)
+_ORDERS = (ORDER_SELECTION, ORDER_AXIS, ORDER_DISTANCE, ORDER_DEPTH, ORDER_NATURAL)
+
+# Temporary names for the two-phase mode (only cycles inside the selection use them)
+TEMP_NAME_PREFIX = "aoRenamerPocTmp_"
+
+# Plans kept per scene generation (live preview retyping a field back is a cache hit)
+PLAN_CACHE_SIZE = 8
+
+# Naming convention lint rules (LintViolation.rules)
+LINT_SEPARATOR = "separator"  # empty token: "__", leading / trailing "_"
+LINT_TOKEN_COUNT = "token_count"  # no PREFIX_base part (not fixable automatically)
+LINT_PREFIX_CASE = "prefix_case"  # prefix is not upper case
+LINT_SUFFIX_CASE = "suffix_case"  # known suffix is not lower case
+LINT_NO_INDEX = "no_index"  # no trailing _NN
+LINT_INDEX_PADDING = "index_padding"  # index not padded to LintInput.padding
+LINT_DUPLICATE = "duplicate"  # short name used by more than one node
+
+# Suffix tokens checked for lower case (token right before the index)
+DEFAULT_LINT_SUFFIXES = ("grp", "geo", "jnt", "ctl", "ctrl", "loc", "crv", "msh", "drv", "null", "srf")
+# Short names never linted (Maya default cameras)
+DEFAULT_LINT_IGNORE = ("persp", "top", "front", "side")
+
+# Rename journal / mapping files (format picked from the extension: ".csv", anything else JSONL)
+JOURNAL_JSONL = "jsonl"
+JOURNAL_CSV = "csv"
+JOURNAL_FIELDS = ("uuid", "old", "new", "status")  # old / new are short names
+
+# Result status values (stored as one byte each in RenameResults)
+STATUS_RENAMED = "renamed"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+_STATUS_CODES = {STATUS_RENAMED: 1, STATUS_SKIPPED: 2, STATUS_FAILED: 3}
+_STATUS_NAMES = (None, STATUS_RENAMED, STATUS_SKIPPED, STATUS_FAILED)
 
 
 # ----------------------------
@@ -30,116 +140,1927 @@ class RenameInput:
     suffix: str = ""
     start_index: int = 1
     padding: int = 2  # 2 -> 01, 02
+    use_high_water_mark: bool = False  # continue after the index stored in fileInfo (skips the scan)
+    engine: str = ENGINE_CMDS  # ENGINE_CMDS / ENGINE_API (falls back to cmds if OpenMaya 2 or the plugin is missing)
+    two_phase: bool = False  # current names of the selection count as free (renumbering, swaps)
+    non_ascii: str = NON_ASCII_REPLACE  # NON_ASCII_REPLACE / NON_ASCII_STRIP / NON_ASCII_ASCII
+    template: str = ""  # e.g. "{prefix}_{base}_{suffix}_{index:03}", "{parent}_{type}_{index}" ("" = DEFAULT_TEMPLATE)
+    scope: str = SCOPE_SCENE  # SCOPE_SCENE / SCOPE_PARENT / SCOPE_NAMESPACE / SCOPE_ROOT
+    order: str = ORDER_SELECTION  # ORDER_SELECTION / ORDER_AXIS / ORDER_DISTANCE / ORDER_DEPTH / ORDER_NATURAL
+    order_axis: str = "x"  # ORDER_AXIS: "x" / "y" / "z"
+    order_pivot: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # ORDER_DISTANCE
+    order_reverse: bool = False  # descending (ties keep selection order)
+    undo_chunk: bool = True  # whole run = one undo step
+    suspend_refresh: bool = True  # no viewport / outliner redraw per rename
+    trace: bool = False  # record cmds call counts / timings into RenameSummary.cmds_stats
+    journal_path: str = ""  # old -> new mapping of the run, written row by row while renaming (".csv" or JSONL)
+
+
+@dataclass(slots=True)
+class RenameItemResult:
+    node: str
+    old_name: str
+    new_name: Optional[str]
+    status: str  # STATUS_RENAMED / STATUS_SKIPPED / STATUS_FAILED
+    message: str = ""
+
+
+class RenameResults:
+    """
+    Compact, list-like store of RenameItemResult (RenameSummary.results).
+    - One column per field; RenameItemResult objects are only built on access
+    - Status as one byte, repeated messages interned, strings shared with the plan
+      (old_name is the plan item's path, node is dropped when it equals new_name / old_name)
+    - The default "Used index: N" message is kept as the index only
+    - renamed / skipped / failed counters updated as results are stored
+    A row is a slot: len(), [i] and column() all count empty (not yet filled) slots,
+    column() gives None there and [i] raises IndexError; iteration skips them.
+    """
+
+    __slots__ = ("_nodes", "_old_names", "_new_names", "_messages", "_indices", "_status",
+                 "renamed", "skipped", "failed")
+
+    def __init__(self, size: int = 0):
+        # size > 0: one empty slot per plan item, filled with set(i, ...)
+        self._nodes: List[Optional[str]] = [None] * size
+        self._old_names: List[Optional[str]] = [None] * size
+        self._new_names: List[Optional[str]] = [None] * size
+        self._messages: List[Optional[str]] = [None] * size
+        self._indices = array("q", [-1]) * size
+        self._status = bytearray(size)  # 0 = empty slot
+        self.renamed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    @classmethod
+    def from_results(cls, results: Iterable[RenameItemResult]) -> "RenameResults":
+        if isinstance(results, cls):
+            return results
+        store = cls()
+        for r in results:
+            store.append(r)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def __getitem__(self, i: int) -> RenameItemResult:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        status = _STATUS_NAMES[self._status[i]]
+        if status is None:
+            raise IndexError(f"result slot {i} is empty")
+        old_name = self._old_names[i]
+        new_name = self._new_names[i]
+        node = self._nodes[i]
+        if node is None:
+            node = new_name if status == STATUS_RENAMED else old_name
+        message = self._messages[i]
+        if message is None:
+            message = _renamed_message(self._indices[i])
+        return RenameItemResult(node=node, old_name=old_name, new_name=new_name, status=status, message=message)
+
+    def __iter__(self) -> Iterator[RenameItemResult]:
+        for i in range(len(self._status)):
+            if self._status[i]:
+                yield self[i]
+
+    def append(self, result: RenameItemResult, index: Optional[int] = None) -> None:
+        self._nodes.append(None)
+        self._old_names.append(None)
+        self._new_names.append(None)
+        self._messages.append(None)
+        self._indices.append(-1)
+        self._status.append(0)
+        self.set(len(self._status) - 1, result, index)
+
+    def set(self, i: int, result: RenameItemResult, index: Optional[int] = None) -> None:
+        """
+        Store result in slot i. index: the plan item's index, lets the default
+        renamed message be rebuilt instead of stored.
+        """
+        old_code = self._status[i]
+        if old_code:
+            self._count(_STATUS_NAMES[old_code], -1)
+
+        status = result.status
+        self._status[i] = _STATUS_CODES[status]
+        self._count(status, 1)
+
+        self._old_names[i] = result.old_name
+        self._new_names[i] = result.new_name
+        same = result.new_name if status == STATUS_RENAMED else result.old_name
+        self._nodes[i] = None if result.node == same else result.node
+
+        if index is not None and status == STATUS_RENAMED and result.message == _renamed_message(index):
+            self._indices[i] = index
+            self._messages[i] = None
+        else:
+            self._indices[i] = -1
+            self._messages[i] = sys.intern(result.message)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """
+        One field per slot, aligned with [i] (sorting / filtering without building
+        objects). None for empty slots.
+        """
+        if name == "status":
+            return [_STATUS_NAMES[c] for c in self._status]
+        if name in ("old_name", "new_name"):
+            values = self._old_names if name == "old_name" else self._new_names
+            return [v if c else None for v, c in zip(values, self._status)]
+        return [getattr(self[i], name) if c else None for i, c in enumerate(self._status)]
+
+    def _count(self, status: str, delta: int) -> None:
+        if status == STATUS_RENAMED:
+            self.renamed += delta
+        elif status == STATUS_SKIPPED:
+            self.skipped += delta
+        else:
+            self.failed += delta
 
 
 @dataclass
-class RenameItemResult:
+class SearchReplaceInput:
+    """
+    Scene-wide regex rename (run_search_replace): every node of node_type whose
+    name matches is renamed, no selection involved.
+    """
+    pattern: str
+    replacement: str = ""  # re.sub replacement ("\\1" back-references allowed)
+    node_type: str = "transform"  # cmds.ls type filter: "transform", "joint", "mesh", "shadingEngine", ...
+    ignore_case: bool = False
+    max_replacements: int = 0  # per name, 0 = every match (re.sub count)
+    ignore: Tuple[str, ...] = ()  # short names never renamed (e.g. the default cameras)
+    non_ascii: str = NON_ASCII_REPLACE  # illegal characters in the result are sanitized as for tokens
+    engine: str = ENGINE_CMDS
+    undo_chunk: bool = True
+    suspend_refresh: bool = True
+    trace: bool = False
+    journal_path: str = ""  # as RenameInput.journal_path
+
+
+@dataclass
+class LintInput:
+    """
+    Naming convention check (lint_scene): PREFIX_base[_suffix]_NN, the form the
+    default template produces (upper-case prefix, lower-case suffix, padded index).
+    """
+    padding: int = 2
+    node_types: Tuple[str, ...] = ("transform",)  # exact types (ls showType)
+    suffixes: Tuple[str, ...] = DEFAULT_LINT_SUFFIXES
+    ignore: Tuple[str, ...] = DEFAULT_LINT_IGNORE
+    engine: str = ENGINE_CMDS  # used by apply_lint_fixes
+    undo_chunk: bool = True
+    suspend_refresh: bool = True
+    trace: bool = False
+    journal_path: str = ""  # apply_lint_fixes, as RenameInput.journal_path
+
+
+@dataclass
+class LintViolation:
     node: str
-    old_name: str
+    rules: Tuple[str, ...]  # LINT_* values
+    suggestion: Optional[str] = None  # conforming name before collision handling, None if not fixable
+
+
+@dataclass
+class LintReport:
+    inputs: LintInput
+    scanned: int
+    violations: List[LintViolation]
+    duplicates: Dict[str, List[str]]  # short name -> nodes sharing it
+    gaps: Dict[str, List[Tuple[int, int]]]  # pattern head ("GEO_arm_") -> missing index runs (start, end)
+    fix_plan: RenamePlan  # apply with apply_lint_fixes()
+
+
+@dataclass
+class MappingInput:
+    """
+    Bulk rename from a mapping file (run_mapping): a rename journal or rows
+    produced outside Maya.
+    - JSONL: one {"uuid", "old", "new", "status"} object per line
+    - CSV: header row with at least old,new (uuid / status optional)
+    Rows are matched by uuid first, then by the old name (short name or long path).
+    Rows may name DG nodes (materials, shadingEngines ...) with either engine.
+    Rows with a status other than "renamed" are ignored.
+    """
+    path: str = ""
+    revert: bool = False  # rename new -> old (roll a journaled run back)
+    engine: str = ENGINE_CMDS
+    undo_chunk: bool = True
+    suspend_refresh: bool = True
+    trace: bool = False
+    journal_path: str = ""  # journal of this run (must not be `path`), as RenameInput.journal_path
+
+
+@dataclass
+class RenamePlanItem:
+    node: str  # long DAG path at planning time
     new_name: Optional[str]
-    status: str  # "renamed" / "skipped" / "failed"
+    uuid: str = ""  # stable id: resolved back to a path only if an ancestor was renamed
+    index: Optional[int] = None
+    status: str = "planned"  # "planned" / "skipped" / "failed"
     message: str = ""
 
 
+@dataclass
+class RenamePlan:
+    """
+    Exact rename plan, computed in pure Python against one name snapshot.
+    Names freed or taken earlier in the batch are already accounted for,
+    so preview and run_rename(plan=...) produce the same names.
+    """
+    inputs: Union[RenameInput, SearchReplaceInput, LintInput, MappingInput]
+    selected: List[str]
+    targets: List[str]
+    items: List[RenamePlanItem]
+    # Renames in execution order: (item index, name). A name other than the
+    # item's new_name is a temporary name (two-phase mode).
+    steps: List[Tuple[int, str]] = field(default_factory=list)
+    # fileInfo key -> highest index per name pattern (stored if use_high_water_mark)
+    high_water_marks: Dict[str, int] = field(default_factory=dict)
+
+    def pairs(self) -> List[Tuple[str, Optional[str]]]:
+        return [(item.node, item.new_name) for item in self.items]
+
+
+@dataclass
+class SceneSnapshot:
+    """
+    Everything planning reads from Maya, captured on the main thread
+    (take_scene_snapshot). plan_from_snapshot() needs nothing else, so it can
+    run on a worker thread.
+    """
+    selected: List[str]
+    targets: List[str]
+    uuids: List[str]
+    names: List[str]  # long names of every node in the scene
+    shape_types: Dict[str, str] = field(default_factory=dict)  # only if the template uses {type}
+    positions: List[float] = field(default_factory=list)  # x, y, z per target, only for spatial orders
+    high_water_marks: Dict[str, int] = field(default_factory=dict)  # only if use_high_water_mark
+
+
 @dataclass
 class RenameSummary:
-    inputs: RenameInput
+    inputs: Union[RenameInput, SearchReplaceInput, LintInput, MappingInput]
     total_selected: int
     total_targets: int
     renamed: int
     skipped: int
     failed: int
-    results: List[RenameItemResult]
+    results: RenameResults
+    cmds_stats: Optional[Any] = None  # ao_cmds_trace.CmdsStats when RenameInput.trace is set
+
+
+class NameRegistry:
+    """
+    In-memory short name index of the scene.
+    - Built once from a single bulk cmds.ls snapshot
+    - O(1) short-name membership (no per-candidate Maya query)
+    - Updated in place as renames land
+    Short names keep their namespace ("ns:name"), same as cmds.ls(name) matching.
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        # short name -> number of nodes using it (DAG allows duplicates under different parents)
+        counts = Counter(n[n.rfind("|") + 1:] for n in names or ())
+        counts.pop("", None)
+        self._counts: Dict[str, int] = dict(counts)
+
+    @classmethod
+    def from_scene(cls) -> "NameRegistry":
+        return cls(cmds.ls(long=True) or [])
+
+    def __contains__(self, name: str) -> bool:
+        return _short_name(name) in self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def names(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def add(self, name: str) -> None:
+        short = _short_name(name)
+        if short:
+            self._counts[short] = self._counts.get(short, 0) + 1
+
+    def discard(self, name: str) -> None:
+        short = _short_name(name)
+        count = self._counts.get(short, 0)
+        if count > 1:
+            self._counts[short] = count - 1
+        elif count:
+            del self._counts[short]
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        self.discard(old_name)
+        self.add(new_name)
+
+
+class _ScopeRegistry(NameRegistry):
+    """
+    Names of one uniqueness scope (RenameInput.scope), plus a shared registry
+    of names that clash in every scope (DG nodes).
+    names() / add / discard only see the scope itself.
+    """
+
+    def __init__(self, shared: NameRegistry):
+        super().__init__()
+        self._shared = shared
+
+    def __contains__(self, name: str) -> bool:
+        return super().__contains__(name) or name in self._shared
+
+
+class IndexAllocator:
+    """
+    Free index lookup for one name pattern: [head][index][tail] (e.g. "GEO_arm_grp_" + "07").
+    - Used indices are kept as merged, sorted runs (starts/ends lists)
+    - next_free / allocate are O(log n) with bisect
+    - allocate_block(n) hands out a contiguous range
+    Only names that compose back exactly count as used ("GEO_arm_7" is not index 7 at padding 2).
+    """
+
+    def __init__(self, head: str, padding: int, used: Optional[Iterable[int]] = None, tail: str = ""):
+        self.head = head
+        self.tail = tail
+        self.padding = max(1, int(padding))
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._extend_sorted(sorted(set(used or [])))
+
+    @classmethod
+    def from_names(cls, head: str, padding: int, names: Iterable[str], tail: str = "") -> "IndexAllocator":
+        alloc = cls(head, padding, tail=tail)
+        used = [alloc.parse_index(n) for n in names]
+        alloc._extend_sorted(sorted(set(i for i in used if i is not None)))
+        return alloc
+
+    @classmethod
+    def from_scene(cls, head: str, padding: int, tail: str = "") -> "IndexAllocator":
+        """Build from one wildcard ls of the pattern."""
+        return cls.from_names(head, padding, cmds.ls(f"{head}*{tail}") or [], tail=tail)
+
+    @classmethod
+    def from_high_water_mark(cls, head: str, padding: int, high_water_mark: int, tail: str = "") -> "IndexAllocator":
+        """Treat 1..high_water_mark as used without scanning the scene."""
+        alloc = cls(head, padding, tail=tail)
+        if high_water_mark > 0:
+            alloc._starts.append(1)
+            alloc._ends.append(int(high_water_mark))
+        return alloc
+
+    # --- names
+
+    def format(self, index: int) -> str:
+        return self.head + str(index).zfill(self.padding) + self.tail
+
+    def parse_index(self, name: str) -> Optional[int]:
+        short = _short_name(name)
+        if not short.startswith(self.head) or not short.endswith(self.tail):
+            return None
+        digits = short[len(self.head):len(short) - len(self.tail)]
+        if not digits.isdigit():
+            return None
+        idx = int(digits)
+        if str(idx).zfill(self.padding) != digits:
+            return None
+        return idx
+
+    # --- queries
+
+    @property
+    def high_water_mark(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def is_used(self, index: int) -> bool:
+        i = bisect_right(self._starts, index) - 1
+        return i >= 0 and self._ends[i] >= index
+
+    def next_free(self, start: int = 1) -> int:
+        start = max(1, int(start))
+        i = bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] >= start:
+            # runs are merged, so the slot right after a run is always free
+            return self._ends[i] + 1
+        return start
+
+    # --- updates
+
+    def allocate(self, start: int = 1) -> int:
+        idx = self.next_free(start)
+        self.mark_used(idx)
+        return idx
+
+    def allocate_block(self, count: int, start: int = 1) -> int:
+        """
+        Reserve `count` contiguous indices at or after `start`.
+        Returns the first index of the block.
+        """
+        count = max(1, int(count))
+        idx = self.next_free(start)
+        while True:
+            # idx is free: the gap runs up to the next used run (or is open-ended)
+            i = bisect_right(self._starts, idx)
+            gap_end = self._starts[i] - 1 if i < len(self._starts) else None
+            if gap_end is None or gap_end - idx + 1 >= count:
+                break
+            idx = self._ends[i] + 1
+        self._insert_run(idx, idx + count - 1)
+        return idx
+
+    def mark_used(self, index: int) -> None:
+        self._insert_run(int(index), int(index))
+
+    def release(self, index: int) -> None:
+        i = bisect_right(self._starts, index) - 1
+        if i < 0 or self._ends[i] < index:
+            return
+        start, end = self._starts[i], self._ends[i]
+        if start == end:
+            del self._starts[i]
+            del self._ends[i]
+        elif index == start:
+            self._starts[i] = start + 1
+        elif index == end:
+            self._ends[i] = end - 1
+        else:
+            self._ends[i] = index - 1
+            self._starts.insert(i + 1, index + 1)
+            self._ends.insert(i + 1, end)
+
+    def gaps(self) -> List[Tuple[int, int]]:
+        """
+        Free index runs (start, end) between 1 and the high-water mark.
+        """
+        out: List[Tuple[int, int]] = []
+        prev_end = 0
+        for start, end in zip(self._starts, self._ends):
+            if start > prev_end + 1:
+                out.append((prev_end + 1, start - 1))
+            prev_end = end
+        return out
+
+    def mark_name(self, name: str) -> None:
+        idx = self.parse_index(name)
+        if idx is not None:
+            self.mark_used(idx)
+
+    def release_name(self, name: str) -> None:
+        idx = self.parse_index(name)
+        if idx is not None:
+            self.release(idx)
+
+    def _extend_sorted(self, indices: List[int]) -> None:
+        # Bulk load (sorted, unique, above every run): one linear pass, no bisect per index
+        for idx in indices:
+            if self._ends and idx <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], idx)
+            else:
+                self._starts.append(idx)
+                self._ends.append(idx)
+
+    def _insert_run(self, start: int, end: int) -> None:
+        # Merge [start, end] with every overlapping/adjacent run
+        lo = bisect_right(self._ends, start - 2)
+        hi = bisect_right(self._starts, end + 1)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+
+class _AllocatorPool:
+    """
+    IndexAllocators of one run, keyed by (head, tail).
+    A name is matched to its allocator through its digit runs, so freeing or
+    taking a name never loops over every pattern.
+    """
+
+    _DIGITS_RE = re.compile(r"\d+")
+
+    def __init__(self):
+        self._allocators: Dict[Tuple[str, str], IndexAllocator] = {}
+
+    def __iter__(self) -> Iterator[IndexAllocator]:
+        return iter(self._allocators.values())
+
+    def __len__(self) -> int:
+        return len(self._allocators)
+
+    def add(self, allocator: IndexAllocator) -> None:
+        self._allocators[(allocator.head, allocator.tail)] = allocator
+
+    def get(self, head: str, tail: str) -> IndexAllocator:
+        return self._allocators[(head, tail)]
+
+    def matching(self, name: str) -> Iterator[Tuple[IndexAllocator, int]]:
+        short = _short_name(name)
+        if len(self._allocators) == 1:
+            # single pattern (no per-node fields): parse directly
+            alloc = next(iter(self._allocators.values()))
+            idx = alloc.parse_index(short)
+            if idx is not None:
+                yield alloc, idx
+            return
+        for m in self._DIGITS_RE.finditer(short):
+            # the head may itself end in digits ("arm2" + "01")
+            for start in range(m.start(), m.end()):
+                alloc = self._allocators.get((short[:start], short[m.end():]))
+                if alloc is not None:
+                    idx = alloc.parse_index(short)
+                    if idx is not None:
+                        yield alloc, idx
+
+    def mark_name(self, name: str) -> None:
+        for alloc, idx in self.matching(name):
+            alloc.mark_used(idx)
+
+    def release_name(self, name: str) -> None:
+        for alloc, idx in list(self.matching(name)):
+            alloc.release(idx)
+
+
+class NameTemplate:
+    """
+    Name template compiled once per run from RenameInput.
+    Fields: {prefix} {base} {suffix} {index} {index:03} {parent} {type}
+    - prefix/base/suffix are sanitized and cased here, once
+    - parent/type are filled once per node (bind -> head, tail)
+    - per candidate, only the index is formatted (IndexAllocator.format)
+    An empty field drops one adjacent "_" (same as the default rule).
+    """
+
+    _INDEX = object()
+
+    def __init__(self, rename_input: RenameInput):
+        template = rename_input.template or DEFAULT_TEMPLATE
+        non_ascii = rename_input.non_ascii
+        static = {
+            "prefix": _format_prefix(rename_input.prefix, non_ascii),
+            "base": _format_base(rename_input.base_name, non_ascii),
+            "suffix": _format_suffix(rename_input.suffix, non_ascii),
+        }
+
+        self.template = template
+        self.non_ascii = non_ascii
+        self.padding = max(1, int(rename_input.padding))
+        # literal str / _INDEX / (field name, value or None for per-node fields)
+        self._parts: List[object] = []
+
+        has_index = False
+        for literal, field_name, spec, conversion in string.Formatter().parse(template):
+            if literal:
+                # literal text keeps its underscores, only illegal characters are replaced
+                self._parts.append(_sanitize_chars(literal, non_ascii))
+            if field_name is None:
+                continue
+            if field_name not in TEMPLATE_FIELDS or conversion:
+                raise ValueError(f"Unknown template field: {{{field_name}}}")
+            if field_name == "index":
+                if has_index:
+                    raise ValueError("Template must contain {index} only once.")
+                has_index = True
+                if spec:
+                    if not spec.isdigit():
+                        raise ValueError(f"Unsupported index format: {{index:{spec}}}")
+                    self.padding = max(1, int(spec))
+                self._parts.append(self._INDEX)
+            else:
+                self._parts.append((field_name, static.get(field_name)))
+
+        if not has_index:
+            raise ValueError("Template needs an {index} field.")
+
+        node_fields = {p[0] for p in self._parts if isinstance(p, tuple) and p[1] is None}
+        self.uses_parent = "parent" in node_fields
+        self.uses_type = "type" in node_fields
+        self._static = None if node_fields else self._resolve({})
+
+    @property
+    def per_node(self) -> bool:
+        return self._static is None
+
+    def bind(self, parent: str = "", node_type: str = "") -> Tuple[str, str]:
+        """
+        (head, tail) around the index for one node.
+        """
+        if self._static is not None:
+            return self._static
+        return self._resolve({
+            "parent": _sanitize_token(parent, self.non_ascii),
+            "type": _sanitize_token(node_type, self.non_ascii),
+        })
+
+    def format(self, index: int, parent: str = "", node_type: str = "") -> str:
+        head, tail = self.bind(parent, node_type)
+        return head + str(index).zfill(self.padding) + tail
+
+    def _resolve(self, values: Dict[str, str]) -> Tuple[str, str]:
+        parts: List[object] = []
+        for p in self._parts:
+            if isinstance(p, tuple):
+                name, value = p
+                parts.append(value if value is not None else values.get(name, ""))
+            else:
+                parts.append(p)
+
+        out: List[object] = []
+        for k, p in enumerate(parts):
+            if p == "" and isinstance(self._parts[k], tuple):
+                # empty field: drop the separator after it, else the one before it
+                nxt = parts[k + 1] if k + 1 < len(parts) else None
+                if isinstance(nxt, str) and isinstance(self._parts[k + 1], str) and nxt.startswith("_"):
+                    parts[k + 1] = nxt[1:]
+                elif out and isinstance(out[-1], str) and out[-1].endswith("_"):
+                    out[-1] = out[-1][:-1]
+                continue
+            out.append(p)
+
+        i = out.index(self._INDEX)
+        return "".join(out[:i]), "".join(out[i + 1:])
 
 
 # ----------------------------
 # Public API
 # ----------------------------
 
-def run_rename(rename_input: RenameInput) -> RenameSummary:
+def run_rename(rename_input: RenameInput, plan: Optional[RenamePlan] = None) -> RenameSummary:
     """
     Main entry point.
     - Collect selection (transform only)
-    - Build names
+    - Build names (RenamePlan)
     - Avoid collisions
-    - Execute rename
+    - Execute rename (cmds or OpenMaya 2, see RenameInput.engine)
+    A plan from build_rename_plan() (e.g. kept from Preview) is applied as-is, without replanning.
+    With rename_input.trace, the cmds calls of the run are recorded in summary.cmds_stats.
+    """
+    with _traced_cmds(rename_input.trace) as stats:
+        summary = _run_rename(rename_input, plan)
+    summary.cmds_stats = stats
+    return summary
+
+
+def _run_rename(rename_input: RenameInput, plan: Optional[RenamePlan]) -> RenameSummary:
+    if plan is None:
+        plan = build_rename_plan(rename_input)
+
+    results = _execute_plan(
+        plan,
+        engine=rename_input.engine,
+        undo_chunk=rename_input.undo_chunk,
+        suspend_refresh=rename_input.suspend_refresh,
+        store_high_water_marks=plan.inputs.use_high_water_mark,
+        journal_path=rename_input.journal_path,
+    )
+    return _summarize(plan.inputs, plan.selected, plan.targets, results)
+
+
+def _execute_plan(
+    plan: RenamePlan,
+    engine: str,
+    undo_chunk: bool,
+    suspend_refresh: bool,
+    store_high_water_marks: bool = False,
+    journal_path: str = "",
+) -> RenameResults:
+    """
+    Apply a plan with the chosen engine, inside one undo chunk / refresh suspension.
+    ENGINE_API runs the MDagModifier through API_RENAME_COMMAND, so Ctrl+Z undoes
+    the whole batch as one step; without the plugin the cmds engine is used.
+    journal_path: the journal is opened before the first rename and each row is
+    written as its rename lands, so a run that stops halfway still leaves one.
+    """
+    if undo_chunk:
+        cmds.undoInfo(openChunk=True)
+    try:
+        with _suspended_refresh(suspend_refresh), \
+                (_journal_writer(journal_path) if journal_path else nullcontext()) as write_journal:
+            if engine == ENGINE_API and _load_undo_plugin():
+                results = _apply_plan_api(plan, write_journal)
+            else:
+                results = _apply_plan_cmds(plan, write_journal)
+
+            if store_high_water_marks:
+                _store_high_water_marks(plan.high_water_marks)
+
+    finally:
+        if undo_chunk:
+            cmds.undoInfo(closeChunk=True)
+
+    return results
+
+
+def iter_rename(
+    rename_input: RenameInput,
+    plan: Optional[RenamePlan] = None,
+    journal: Optional[List[Tuple[int, str]]] = None,
+) -> Iterator[RenameItemResult]:
+    """
+    Step-wise variant of run_rename for time-sliced drivers (e.g. a QTimer in the UI).
+    - Yields each RenameItemResult as soon as it is produced
+      (skipped / failed-at-plan items first, then one per renamed node)
+    - Always the cmds engine; no undo chunk or refresh suspension of its own,
+      the driver decides how to group the slices
+    - journal: if given, every executed rename step is appended as
+      (item index, short name before the step); rollback_rename() reverts them
+    - High-water marks are stored only once the generator runs to the end
+    - rename_input.journal_path: rows are written as results are yielded
+      (the file stays open until the generator finishes or is closed)
+    Closing the generator early (cancel) leaves the scene as far as it got.
+    """
+    if plan is None:
+        plan = build_rename_plan(rename_input)
+
+    journal_path = rename_input.journal_path
+    with (_journal_writer(journal_path) if journal_path else nullcontext()) as write_journal:
+        for i, result in _iter_apply_plan_cmds(plan, journal):
+            if write_journal is not None:
+                write_journal(plan.items[i], result)
+            yield result
+
+    if plan.inputs.use_high_water_mark:
+        _store_high_water_marks(plan.high_water_marks)
+
+
+def rollback_rename(plan: RenamePlan, journal: List[Tuple[int, str]]) -> int:
     """
+    Revert journaled rename steps (iter_rename), newest first, in one undo chunk.
+    Reverting step by step restores every name exactly, temporary names included.
+    The journal is emptied; returns the number of steps reverted.
+    """
+    reverted = 0
+    cmds.undoInfo(openChunk=True)
+    try:
+        with _suspended_refresh(plan.inputs.suspend_refresh):
+            while journal:
+                i, old_short = journal.pop()
+                item = plan.items[i]
+                try:
+                    found = (cmds.ls(item.uuid, long=True) or []) if item.uuid else []
+                    cmds.rename(found[0] if found else item.node, old_short)
+                    reverted += 1
+                except Exception as e:
+                    cmds.warning(f"[ao_renamer_poc] rollback failed for {item.node}: {e}")
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return reverted
+
+
+def summarize_results(plan: RenamePlan, results: Union[RenameResults, Sequence[RenameItemResult]]) -> RenameSummary:
+    """
+    RenameSummary for results collected from iter_rename().
+    """
+    return _summarize(plan.inputs, plan.selected, plan.targets, results)
+
+
+def build_rename_plan(rename_input: RenameInput) -> RenamePlan:
+    """
+    Plan the whole rename without touching the scene.
+    - One selection query, one name snapshot, one wildcard ls for the pattern
+    - Each target frees its own current name before its new name is chosen,
+      and taken names are reserved for the rest of the batch
+    - two_phase: every target's current name is free from the start; execution
+      is ordered so each node waits for the holder of its new name, and only
+      cycles (swaps) go through a temporary name
+    """
+    return _build_plan(rename_input, None)
+
+
+def take_scene_snapshot(rename_input: RenameInput) -> SceneSnapshot:
+    """
+    Main thread part of planning: every Maya query build_rename_plan would make.
+    Raises ValueError for an invalid order / order_axis.
+    """
+    _validate_order(rename_input)
     selected = _get_selection(long_name=True)
     targets = _filter_transforms(selected)
+    template = NameTemplate(rename_input)
+
+    return SceneSnapshot(
+        selected=selected,
+        targets=targets,
+        uuids=_get_uuids(targets),
+        names=cmds.ls(long=True) or [],
+        shape_types=_get_shape_types(targets) if template.uses_type else {},
+        positions=_get_world_positions(targets) if rename_input.order in _SPATIAL_ORDERS else [],
+        high_water_marks=_load_high_water_marks() if rename_input.use_high_water_mark else {},
+    )
 
-    results: List[RenameItemResult] = []
-    index = max(1, int(rename_input.start_index))
-
-    for node in targets:
-        old = node
 
-        try:
-            # Validate node exists
-            if not cmds.objExists(node):
-                results.append(RenameItemResult(
-                    node=node, old_name=old, new_name=None,
-                    status="failed", message="Node does not exist."
-                ))
+def plan_from_snapshot(rename_input: RenameInput, snapshot: SceneSnapshot) -> RenamePlan:
+    """
+    Same plan as build_rename_plan, computed from a snapshot without any Maya call
+    (safe on a concurrent.futures worker). Index scans use the snapshot names
+    instead of a wildcard ls.
+    Check is_plan_current() on the main thread before applying it.
+    """
+    return _build_plan(rename_input, snapshot)
+
+
+def _build_plan(rename_input: RenameInput, snapshot: Optional[SceneSnapshot]) -> RenamePlan:
+    _validate_order(rename_input)
+    if snapshot is None:
+        selected = _get_selection(long_name=True)
+        targets = _filter_transforms(selected)
+        uuids = _get_uuids(targets)
+        names = cmds.ls(long=True) or []
+    else:
+        selected = list(snapshot.selected)
+        targets = list(snapshot.targets)
+        uuids = list(snapshot.uuids)
+        names = snapshot.names
+    registry = NameRegistry(names)
+    scope = rename_input.scope
+    scoped = scope in (SCOPE_PARENT, SCOPE_ROOT)
+
+    order_note = ""  # set on every planned item if the requested order could not be used
+    if rename_input.order != ORDER_SELECTION:
+        if rename_input.order not in _SPATIAL_ORDERS:
+            positions = []
+        elif snapshot is None:
+            positions = _get_world_positions(targets)
+        else:
+            positions = snapshot.positions
+        if rename_input.order in _SPATIAL_ORDERS and len(positions) != 3 * len(targets):
+            order_note = "World positions unavailable, selection order kept"
+        order = _target_order(targets, rename_input, positions)
+        targets = [targets[i] for i in order]
+        uuids = [uuids[i] for i in order]
+
+    # Compile once: per node only (head, tail), per candidate only the index
+    template = NameTemplate(rename_input)
+    if not template.uses_type:
+        shape_types = {}
+    elif snapshot is None:
+        shape_types = _get_shape_types(targets)
+    else:
+        shape_types = snapshot.shape_types
+    patterns = [
+        template.bind(_parent_name(node), shape_types.get(node, "transform"))
+        for node in targets
+    ]
+    if scope == SCOPE_NAMESPACE:
+        # the namespace becomes part of the pattern: own names, own counter
+        patterns = [(_namespace_prefix(node) + head, tail) for node, (head, tail) in zip(targets, patterns)]
+    errors = {pattern: _validate_pattern(*pattern) for pattern in dict.fromkeys(patterns)}
+
+    if scoped:
+        scope_keys, scopes = _create_scopes(scope, targets, patterns, errors, template.padding, names)
+    else:
+        pool = _create_allocators(
+            [pattern for pattern, error in errors.items() if error is None],
+            template.padding,
+            registry,
+            rename_input.use_high_water_mark,
+            snapshot,
+        )
+        scope_keys = [""] * len(targets)
+        scopes = {"": (registry, pool)}
+
+    items: List[Optional[RenamePlanItem]] = [None] * len(targets)
+    start_index = max(1, int(rename_input.start_index))
+    next_index: Dict[Tuple[str, str, str], int] = {}  # per scope and pattern
+
+    if rename_input.two_phase:
+        for node, key in zip(targets, scope_keys):
+            scope_registry, pool = scopes[key]
+            scope_registry.discard(node)
+            pool.release_name(node)
+
+    # SCOPE_ROOT: a target inside a selected root waits for that root, so the root's
+    # final name is in its own scope before its descendants are named (no
+    # |GEO_x_01|GEO_x_01). Nothing else moves: selection order is kept inside every
+    # scope, and steps run in this same order (a freed name is freed before reuse).
+    plan_order = list(range(len(targets)))
+    if scope == SCOPE_ROOT:
+        target_set = set(targets)
+        planned_roots = set()
+        waiting: Dict[str, List[int]] = {}  # root path -> descendants seen before it
+        plan_order = []
+        for i, key in enumerate(scope_keys):
+            if key in target_set and key not in planned_roots:
+                waiting.setdefault(key, []).append(i)
                 continue
+            plan_order.append(i)
+            planned_roots.add(targets[i])
+            plan_order.extend(waiting.pop(targets[i], ()))
+
+    for i in plan_order:
+        node, uuid, pattern, key = targets[i], uuids[i], patterns[i], scope_keys[i]
+        scope_registry, pool = scopes[key]
+        if scope == SCOPE_ROOT and node in scopes:
+            # the root's name (planned, or kept if this fails) is taken inside the root
+            root_registry, root_pool = scopes[node]
+        else:
+            root_registry = root_pool = None
+
+        if errors[pattern]:
+            if rename_input.two_phase:
+                scope_registry.add(node)
+                pool.mark_name(node)
+            if root_registry is not None:
+                root_registry.add(node)
+                root_pool.mark_name(_short_name(node))
+            items[i] = RenamePlanItem(node=node, new_name=None, uuid=uuid, status="failed", message=errors[pattern])
+            continue
 
-            # Create unique new name
+        # The node gives up its current name when it is renamed
+        if not rename_input.two_phase:
+            scope_registry.discard(node)
+            pool.release_name(node)
+
+        try:
             new_name, used_index = _build_unique_name(
-                rename_input=rename_input,
-                start_index=index
+                start_index=next_index.get((key, *pattern), start_index),
+                registry=scope_registry,
+                allocator=pool.get(*pattern),
             )
+        except Exception as e:
+            scope_registry.add(node)
+            pool.mark_name(node)
+            if root_registry is not None:
+                root_registry.add(node)
+                root_pool.mark_name(_short_name(node))
+            items[i] = RenamePlanItem(node=node, new_name=None, uuid=uuid, status="failed", message=str(e))
+            continue
 
-            # If we cannot create a name (shouldn't happen), skip
-            if not new_name:
-                results.append(RenameItemResult(
-                    node=node, old_name=old, new_name=None,
-                    status="skipped", message="New name is empty."
-                ))
+        scope_registry.add(new_name)
+        if scope_registry is not registry:
+            registry.add(new_name)  # temporary names stay unique scene-wide
+        if root_registry is not None:
+            root_registry.add(new_name)
+            root_pool.mark_name(new_name)
+        items[i] = RenamePlanItem(node=node, new_name=new_name, uuid=uuid, index=used_index, message=order_note)
+
+        # Next node of the same pattern (and scope) starts from used_index + 1
+        next_index[(key, *pattern)] = used_index + 1
+
+    if rename_input.two_phase:
+        steps = _order_two_phase_steps(items, registry, siblings=scoped)
+    else:
+        steps = [(i, items[i].new_name) for i in plan_order if items[i].status == "planned" and items[i].new_name]
+
+    # Stored marks are per pattern, scene-wide: per-parent / per-root counters keep none
+    high_water_marks = {} if scoped else {
+        _high_water_mark_key(alloc.head, alloc.tail, alloc.padding): alloc.high_water_mark
+        for alloc in scopes[""][1]
+        if alloc.high_water_mark > 0
+    }
+
+    return RenamePlan(
+        inputs=rename_input,
+        selected=selected,
+        targets=targets,
+        items=items,
+        steps=steps,
+        high_water_marks=high_water_marks,
+    )
+
+
+def is_plan_current(plan: RenamePlan) -> bool:
+    """
+    Cheap staleness check before applying a kept plan (two Maya calls).
+    - Selection must be unchanged
+    - No planned name may have been taken since, except by the plan's own targets
+    - SCOPE_PARENT / SCOPE_ROOT: only names taken inside the plan's own scopes count
+      (the same short name under another parent is fine)
+    """
+    if _get_selection(long_name=True) != plan.selected:
+        return False
+
+    new_names = [item.new_name for item in plan.items if item.status == "planned" and item.new_name]
+    if not new_names:
+        return True
+
+    scope = getattr(plan.inputs, "scope", SCOPE_SCENE)
+    if scope not in (SCOPE_PARENT, SCOPE_ROOT):
+        target_names = {_short_name(t) for t in plan.targets}
+        taken = cmds.ls(new_names) or []
+        return all(_short_name(n) in target_names for n in taken)
+
+    # scope key -> planned short names (a root's name is also taken inside the root)
+    target_set = set(plan.targets)
+    keys = _scope_keys(scope, plan.targets)
+    root_keys = target_set.intersection(keys)
+    wanted: Dict[str, set] = {}
+    for node, key, item in zip(plan.targets, keys, plan.items):
+        if item.status == "planned" and item.new_name:
+            wanted.setdefault(key, set()).add(item.new_name)
+            if node in root_keys:
+                wanted.setdefault(node, set()).add(item.new_name)
+
+    for path in cmds.ls(new_names, long=True) or []:
+        if path in target_set:
+            continue
+        parent, sep, short = path.rpartition("|")
+        if not sep:
+            return False  # DG node names clash in every scope
+        if short in wanted.get(parent, ()):
+            return False
+        if scope == SCOPE_ROOT:
+            ancestor = parent.rpartition("|")[0]
+            while ancestor:
+                if ancestor in root_keys and short in wanted.get(ancestor, ()):
+                    return False
+                ancestor = ancestor.rpartition("|")[0]
+    return True
+
+
+def preview_names(rename_input: RenameInput) -> List[Tuple[str, str]]:
+    """
+    Preview rename results without executing rename.
+    Returns list of (node, preview_new_name).
+    - Same RenamePlan as run_rename, so earlier renames in the sequence are accounted for.
+    - Keep the plan from build_rename_plan() instead if you want to apply it afterwards.
+    """
+    return build_rename_plan(rename_input).pairs()
+
+
+def run_search_replace(search_input: SearchReplaceInput, plan: Optional[RenamePlan] = None) -> RenameSummary:
+    """
+    Regex find / replace over every node of search_input.node_type in the scene.
+    - Only nodes whose name changes are renamed (and reported)
+    - Same collision handling, engines, undo chunk and RenameSummary as run_rename
+    summary.total_selected is the number of nodes scanned, total_targets the number matched.
+    """
+    with _traced_cmds(search_input.trace) as stats:
+        if plan is None:
+            plan = build_search_replace_plan(search_input)
+        results = _execute_plan(
+            plan,
+            engine=search_input.engine,
+            undo_chunk=search_input.undo_chunk,
+            suspend_refresh=search_input.suspend_refresh,
+            journal_path=search_input.journal_path,
+        )
+        summary = _summarize(plan.inputs, plan.selected, plan.targets, results)
+    summary.cmds_stats = stats
+    return summary
+
+
+def build_search_replace_plan(search_input: SearchReplaceInput) -> RenamePlan:
+    """
+    Plan a search / replace rename without touching the scene.
+    - Three Maya calls whatever the scene size: typed ls (paths), typed ls (uuids),
+      one name snapshot for the registry
+    - The regex is compiled once and run over the whole name list in one pass
+    - Collisions as in _plan_desired_names: shifts like "_01" -> "_02" over a whole
+      chain plan cleanly, names taken outside the batch get the next free number
+    Raises ValueError for an invalid pattern or replacement.
+    """
+    try:
+        regex = re.compile(search_input.pattern, re.IGNORECASE if search_input.ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f"Invalid search pattern: {e}") from e
+    try:
+        # the replacement template is parsed against the pattern's groups up front
+        regex.sub(search_input.replacement, "")
+    except (re.error, IndexError) as e:  # unknown \g<name>: IndexError before Python 3.12
+        raise ValueError(f"Invalid replacement: {e}") from e
+
+    type_filter = {"type": search_input.node_type} if search_input.node_type else {}
+    nodes = cmds.ls(long=True, **type_filter) or []
+    uuids = cmds.ls(uuid=True, **type_filter) or []
+    if len(uuids) != len(nodes):
+        uuids = [""] * len(nodes)
+    registry = NameRegistry.from_scene()
+
+    new_names = _replace_names(
+        nodes, regex, search_input.replacement, search_input.max_replacements, search_input.non_ascii
+    )
+    ignore = set(search_input.ignore)
+    matched = [
+        (node, uuid, new_name)
+        for node, uuid, new_name in zip(nodes, uuids, new_names)
+        if new_name is not None and _short_name(node) not in ignore
+    ]
+    return _plan_desired_names(search_input, nodes, matched, registry)
+
+
+def lint_scene(lint_input: Optional[LintInput] = None) -> LintReport:
+    """
+    Check every node of lint_input.node_types against the naming convention.
+    - One ls(long, showType) snapshot of the whole scene (plus one uuid ls for the fixes)
+    - Token rules as in the name builder: sanitized tokens, upper-case prefix,
+      lower-case suffix, index padded to lint_input.padding
+    - Duplicate short names and gaps in each PREFIX_base_ index run are reported
+    - report.fix_plan renames every fixable violation in one go (apply_lint_fixes);
+      duplicates keep their first node and are numbered after the direct fixes
+    - Names that differ only in a padded index are checked once per stem
+    """
+    lint_input = lint_input or LintInput()
+    listed = cmds.ls(long=True, showType=True) or []
+    names = listed[0::2]
+
+    node_types = set(lint_input.node_types)
+    ignore = set(lint_input.ignore)
+    suffixes = {s.lower() for s in lint_input.suffixes}
+    padding = max(1, int(lint_input.padding))
+
+    nodes: List[str] = []
+    shorts: List[str] = []
+    for n, t in zip(names, listed[1::2]):
+        if t in node_types:
+            short = n[n.rfind("|") + 1:]
+            if short not in ignore:
+                nodes.append(n)
+                shorts.append(short)
+
+    violations: List[LintViolation] = []
+    used: Dict[str, List[str]] = {}  # index head -> index digits of conforming names
+    match = _LINT_CONFORMING_RE.match
+    # "stem_NN" names with a padded index pass or break the same rules whatever the
+    # index: checked once per stem (None: conforming), the index goes back into the suggestion
+    stems: Dict[str, Optional[Tuple[Tuple[str, ...], Optional[str]]]] = {}
+    canonical_index = "1".zfill(padding)
+
+    for node, short in zip(nodes, shorts):
+        stem = short.rstrip("0123456789")
+        digits = short[len(stem):]
+        # padded: exactly `padding` digits, or more without a leading zero
+        size = len(digits)
+        if not (stem.endswith("_") and (size == padding or (size > padding and digits[0] != "0"))):
+            rules, suggestion = _lint_name(short, padding, suffixes)
+        else:
+            if stem not in stems:
+                canonical = stem + canonical_index
+                m = match(canonical)
+                suffix = m.group(2) if m is not None else None
+                if m is not None and (not suffix or suffix.lower() not in suffixes or suffix.islower()):
+                    stems[stem] = None
+                else:
+                    stems[stem] = _lint_name(canonical, padding, suffixes)
+            found = stems[stem]
+            if found is None:
+                used.setdefault(stem, []).append(digits)
                 continue
+            rules, suggestion = found
+            if suggestion is not None:
+                suggestion = suggestion[:-padding] + digits
+        if rules:
+            violations.append(LintViolation(node=node, rules=rules, suggestion=suggestion))
+
+    # duplicates: counted in one C pass, nodes collected for the repeated names only
+    repeated = {short for short, count in Counter(shorts).items() if count > 1}
+    duplicates: Dict[str, List[str]] = {}
+    if repeated:
+        for node, short in zip(nodes, shorts):
+            if short in repeated:
+                duplicates.setdefault(short, []).append(node)
+        flagged = {v.node: i for i, v in enumerate(violations)}
+        for short, found in duplicates.items():
+            for node in found[1:]:
+                i = flagged.get(node)
+                if i is None:
+                    violations.append(LintViolation(node=node, rules=(LINT_DUPLICATE,), suggestion=short))
+                else:
+                    v = violations[i]
+                    v.rules = v.rules + (LINT_DUPLICATE,)
+
+    gaps = {head: IndexAllocator(head, padding, map(int, indices)).gaps() for head, indices in used.items()}
+    gaps = {head: runs for head, runs in gaps.items() if runs}
+
+    fixes = [v for v in violations if v.suggestion is not None]
+    uuids = _get_uuids([v.node for v in fixes])
+    changes = [(v.node, uuid, v.suggestion) for v, uuid in zip(fixes, uuids)]
+    registry = NameRegistry(names) if changes else NameRegistry()  # only fixes need the scene's names
+    fix_plan = _plan_desired_names(lint_input, nodes, changes, registry)
+
+    return LintReport(
+        inputs=lint_input,
+        scanned=len(nodes),
+        violations=violations,
+        duplicates=duplicates,
+        gaps=gaps,
+        fix_plan=fix_plan,
+    )
 
-            # Perform rename (keep hierarchy path stable)
-            renamed_node = cmds.rename(node, new_name)
 
-            results.append(RenameItemResult(
-                node=renamed_node, old_name=old, new_name=new_name,
-                status="renamed", message=f"Used index: {used_index}"
-            ))
+def apply_lint_fixes(report: LintReport) -> RenameSummary:
+    """
+    Apply report.fix_plan as one rename run (one undo chunk).
+    """
+    inputs = report.inputs
+    plan = report.fix_plan
+    with _traced_cmds(inputs.trace) as stats:
+        results = _execute_plan(
+            plan,
+            engine=inputs.engine,
+            undo_chunk=inputs.undo_chunk,
+            suspend_refresh=inputs.suspend_refresh,
+            journal_path=inputs.journal_path,
+        )
+        summary = _summarize(plan.inputs, plan.selected, plan.targets, results)
+    summary.cmds_stats = stats
+    return summary
+
+
+def _lint_name(short: str, padding: int, suffixes: set) -> Tuple[Tuple[str, ...], Optional[str]]:
+    """
+    Check one short name against PREFIX_base[_suffix]_NN.
+    Returns (rules broken, conforming suggestion or None if it cannot be fixed).
+    """
+    namespace, sep, leaf = short.rpartition(":")
+    tokens = leaf.split("_")
+    rules: List[str] = []
+
+    words = [t for t in tokens if t]
+    if len(words) != len(tokens):
+        rules.append(LINT_SEPARATOR)
+
+    digits = words[-1] if words and words[-1].isdigit() else ""
+    if digits:
+        words = words[:-1]
+        if str(int(digits)).zfill(padding) != digits:
+            rules.append(LINT_INDEX_PADDING)
+    else:
+        rules.append(LINT_NO_INDEX)
+
+    if len(words) < 2:
+        # prefix and base cannot be told apart
+        rules.append(LINT_TOKEN_COUNT)
+        return tuple(rules), None
+
+    prefix = _format_prefix(words[0])
+    if prefix != words[0]:
+        rules.append(LINT_PREFIX_CASE)
+    words[0] = prefix
+
+    if len(words) > 2 and words[-1].lower() in suffixes and words[-1] != words[-1].lower():
+        rules.append(LINT_SUFFIX_CASE)
+        words[-1] = words[-1].lower()
+
+    if not rules:
+        return (), None
+
+    index = str(int(digits)).zfill(padding) if digits else "1".zfill(padding)
+    suggestion = namespace + sep + "_".join(words) + "_" + index
+    return tuple(rules), suggestion
+
+
+# ----------------------------
+# Journal / mapping files
+# ----------------------------
+
+def write_rename_journal(
+    path: str,
+    plan: RenamePlan,
+    results: Union[RenameResults, Sequence[RenameItemResult]],
+) -> int:
+    """
+    Write one row per plan item (uuid, old short name, new short name, status)
+    for results collected earlier. Runs with a journal_path write theirs while
+    renaming. run_mapping(MappingInput(path, revert=True)) undoes the renames
+    later, without the undo queue.
+    Returns the number of rows written.
+    """
+    written = 0
+    with _journal_writer(path) as write:
+        for item, result in zip(plan.items, results):
+            write(item, result)
+            written += 1
+    return written
+
+
+@contextmanager
+def _journal_writer(path: str) -> Iterator[Callable[[RenamePlanItem, RenameItemResult], None]]:
+    """
+    Open a journal and yield write(item, result), one row per call.
+    Line buffered: each row is on disk once written, so a crash keeps the renames so far.
+    """
+    with open(path, "w", encoding="utf-8", newline="", buffering=1) as f:
+        if _journal_format(path) == JOURNAL_CSV:
+            writer = csv.writer(f)
+            writer.writerow(JOURNAL_FIELDS)
+            write_row = writer.writerow
+        else:
+            def write_row(row: Tuple[str, ...]) -> None:
+                f.write(json.dumps(dict(zip(JOURNAL_FIELDS, row)), ensure_ascii=False) + "\n")
+
+        def write(item: RenamePlanItem, result: RenameItemResult) -> None:
+            write_row((item.uuid, _short_name(item.node), result.new_name or "", result.status))
+
+        yield write
+
+
+def run_mapping(mapping_input: MappingInput, plan: Optional[RenamePlan] = None) -> RenameSummary:
+    """
+    Apply (or revert) a mapping file as one rename run.
+    - Same collision handling, engines, undo chunk and RenameSummary as run_rename
+    - Rows whose node already has the wanted name are skipped, so a rerun is harmless
+    summary.total_selected is the number of rows read, total_targets the number resolved.
+    """
+    with _traced_cmds(mapping_input.trace) as stats:
+        if plan is None:
+            plan = build_mapping_plan(mapping_input)
+        results = _execute_plan(
+            plan,
+            engine=mapping_input.engine,
+            undo_chunk=mapping_input.undo_chunk,
+            suspend_refresh=mapping_input.suspend_refresh,
+            journal_path=mapping_input.journal_path,
+        )
+        summary = _summarize(plan.inputs, plan.selected, plan.targets, results)
+    summary.cmds_stats = stats
+    return summary
 
-            # Next node should start from used_index + 1
-            index = used_index + 1
+
+def build_mapping_plan(mapping_input: MappingInput) -> RenamePlan:
+    """
+    Plan a mapping file rename without touching the scene.
+    - Two Maya calls whatever the row count: ls (paths) and ls (uuids) of the
+      whole scene; every row is resolved against that snapshot
+    - Rows that match no node, several nodes, or a node listed before
+      come back as failed items
+    Raises ValueError for a malformed file.
+    """
+    names = cmds.ls(long=True) or []
+    uuids = cmds.ls(uuid=True) or []
+    registry = NameRegistry(names)
+    by_uuid = dict(zip(uuids, names)) if len(uuids) == len(names) else {}
+    # built on the first row without a known uuid
+    by_short: Optional[Dict[str, List[str]]] = None
+    uuid_of: Dict[str, str] = {}
+
+    rows: List[str] = []
+    changes: List[Tuple[str, str, str]] = []
+    unresolved: List[RenamePlanItem] = []
+    seen = set()
+
+    for uuid, old, new in _read_mapping(mapping_input.path):
+        source, target = (new, old) if mapping_input.revert else (old, new)
+        rows.append(source)
+
+        node = by_uuid.get(uuid) if uuid else None
+        if node is None:
+            if by_short is None:
+                by_short = {}
+                for n in names:
+                    by_short.setdefault(_short_name(n), []).append(n)
+                uuid_of = {n: u for u, n in by_uuid.items()} if by_uuid else dict.fromkeys(names, "")
+            if "|" in source:
+                found = [source] if source in uuid_of else []
+            else:
+                found = by_short.get(source, [])
+            if len(found) != 1:
+                message = f"More than one node is named {source}" if found else f"No node matches {source}"
+                unresolved.append(RenamePlanItem(node=source, new_name=None, uuid=uuid, status=STATUS_FAILED, message=message))
+                continue
+            node = found[0]
+            uuid = uuid_of[node]
+
+        if node in seen:
+            unresolved.append(RenamePlanItem(node=node, new_name=None, uuid=uuid, status=STATUS_FAILED, message="Node is listed twice."))
+            continue
+        seen.add(node)
+
+        if _short_name(node) == target:
+            unresolved.append(RenamePlanItem(node=node, new_name=None, uuid=uuid, status=STATUS_SKIPPED, message="Already named."))
+            continue
+        changes.append((node, uuid, target))
+
+    if changes and not by_uuid:
+        # no usable uuid snapshot: one bulk query for the resolved nodes
+        for i, uuid in enumerate(_get_uuids([c[0] for c in changes])):
+            changes[i] = (changes[i][0], uuid, changes[i][2])
+
+    # journals from SCOPE_PARENT runs / repeated short names: only siblings clash
+    plan = _plan_desired_names(mapping_input, rows, changes, registry, scene_names=names)
+    plan.items.extend(unresolved)  # steps only refer to the planned items before them
+    return plan
+
+
+def _journal_format(path: str) -> str:
+    return JOURNAL_CSV if path.lower().endswith(".csv") else JOURNAL_JSONL
+
+
+def _read_mapping(path: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    (uuid, old, new) per row of a journal / mapping file, streamed.
+    Rows with a status other than "renamed" are dropped.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if _journal_format(path) == JOURNAL_CSV:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or "old" not in reader.fieldnames or "new" not in reader.fieldnames:
+                raise ValueError(f"{path}: CSV header needs old and new columns")
+            rows: Iterator[Tuple[int, Dict[str, Any]]] = ((reader.line_num, row) for row in reader)
+        else:
+            rows = ((line_no, _parse_jsonl_row(path, line_no, line)) for line_no, line in enumerate(f, 1) if line.strip())
+
+        for line_no, row in rows:
+            status = row.get("status") or STATUS_RENAMED
+            if status != STATUS_RENAMED:
+                continue
+            old = row.get("old")
+            new = row.get("new")
+            if not old or new is None:
+                raise ValueError(f"{path}:{line_no}: row needs old and new")
+            yield str(row.get("uuid") or ""), str(old), str(new)
+
+
+def _parse_jsonl_row(path: str, line_no: int, line: str) -> Dict[str, Any]:
+    try:
+        row = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"{path}:{line_no}: {e}") from e
+    if not isinstance(row, dict):
+        raise ValueError(f"{path}:{line_no}: expected a JSON object")
+    return row
+
+
+# ----------------------------
+# Scene watch / plan cache
+# ----------------------------
+
+# Bumped by every name change, node creation / deletion, reparent, selection change
+# and scene open / new
+# while the watch is installed. Same generation = same names and selection.
+_scene_generation = 0
+_scene_watch_ids: list = []  # MCallbackIds (OpenMaya 2) or scriptJob numbers
+_plan_cache: "OrderedDict[tuple, RenamePlan]" = OrderedDict()
+_plan_cache_generation = -1
+
+
+def scene_generation() -> int:
+    return _scene_generation
+
+
+def is_scene_watch_installed() -> bool:
+    return bool(_scene_watch_ids)
+
+
+def install_scene_watch() -> bool:
+    """
+    Register the callbacks that bump the scene generation (once per session;
+    they live at module level so a reopened window keeps its cache).
+    OpenMaya 2 MMessage callbacks if available, cmds.scriptJob otherwise.
+    Returns False if it was already installed.
+    """
+    if _scene_watch_ids:
+        return False
+
+    if om is not None:
+        _scene_watch_ids.extend([
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), _bump_scene_generation),
+            om.MDGMessage.addNodeAddedCallback(_bump_scene_generation, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(_bump_scene_generation, "dependNode"),
+            # parent / instance changes: long names and sibling scopes change
+            om.MDagMessage.addAllDagChangesCallback(_bump_scene_generation),
+            om.MEventMessage.addEventCallback("SelectionChanged", _bump_scene_generation),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, _bump_scene_generation),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, _bump_scene_generation),
+        ])
+    else:
+        # scriptJob has no reparent event: a cached plan then survives a reparent
+        # until the next name / selection change (OpenMaya 2 ships with every supported Maya)
+        for event in ("NameChanged", "DagObjectCreated", "SelectionChanged", "SceneOpened", "NewSceneOpened"):
+            _scene_watch_ids.append(cmds.scriptJob(event=[event, _bump_scene_generation]))
+
+    _bump_scene_generation()
+    return True
+
+
+def remove_scene_watch() -> None:
+    """
+    Remove the callbacks; the plan cache is dropped (nothing would invalidate it).
+    """
+    global _plan_cache_generation
+    ids = list(_scene_watch_ids)
+    del _scene_watch_ids[:]
+    if om is not None:
+        for callback_id in ids:
+            try:
+                om.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+    else:
+        for job in ids:
+            if cmds.scriptJob(exists=job):
+                cmds.scriptJob(kill=job, force=True)
+
+    _plan_cache.clear()
+    _plan_cache_generation = -1
+
+
+def cached_rename_plan(rename_input: RenameInput) -> RenamePlan:
+    """
+    build_rename_plan with a cache keyed on (inputs, scene generation).
+    Without the scene watch nothing can invalidate a cached plan, so every call plans.
+    """
+    plan = peek_cached_plan(rename_input)
+    if plan is not None:
+        return plan
+
+    generation = _scene_generation
+    plan = build_rename_plan(rename_input)
+    remember_plan(plan, generation)
+    return plan
+
+
+def peek_cached_plan(rename_input: RenameInput) -> Optional[RenamePlan]:
+    """
+    Cached plan for these inputs if the scene has not changed since, else None.
+    """
+    if not _scene_watch_ids or _plan_cache_generation != _scene_generation:
+        return None
+    if rename_input.order in _SPATIAL_ORDERS:
+        return None  # moving a node does not bump the scene generation
+    key = astuple(rename_input)
+    plan = _plan_cache.get(key)
+    if plan is not None:
+        _plan_cache.move_to_end(key)
+    return plan
+
+
+def remember_plan(plan: RenamePlan, generation: int) -> None:
+    """
+    Cache a plan computed from the scene as it was at `generation`
+    (e.g. a worker plan: pass the generation read when the snapshot was taken).
+    Ignored if the scene changed since.
+    """
+    global _plan_cache_generation
+    if not _scene_watch_ids or generation != _scene_generation:
+        return
+    if getattr(plan.inputs, "order", ORDER_SELECTION) in _SPATIAL_ORDERS:
+        return
+    if _plan_cache_generation != generation:
+        _plan_cache.clear()
+        _plan_cache_generation = generation
+
+    key = astuple(plan.inputs)
+    _plan_cache[key] = plan
+    _plan_cache.move_to_end(key)
+    while len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+
+
+def _bump_scene_generation(*args) -> None:
+    # Runs for every rename / selection change: keep it to one increment
+    global _scene_generation
+    _scene_generation += 1
+
+
+# ----------------------------
+# Rename engines
+# ----------------------------
+
+# MDagModifier handed to the next API_RENAME_COMMAND call (set right before it runs)
+_pending_api_modifier = None
+
+
+if om is not None:
+    class _ApiRenameCommand(om.MPxCommand):
+        """
+        One ENGINE_API rename as one entry in Maya's undo queue: doIt() takes the
+        prepared MDagModifier, undoIt() / redoIt() replay it (Ctrl+Z / redo).
+        Registered by ao_renamer_poc_undo_plugin.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self._modifier = None
+
+        def isUndoable(self) -> bool:
+            return self._modifier is not None
+
+        def doIt(self, args) -> None:
+            global _pending_api_modifier
+            modifier, _pending_api_modifier = _pending_api_modifier, None
+            if modifier is None:
+                raise RuntimeError(f"{API_RENAME_COMMAND}: nothing to rename (internal command)")
+            try:
+                modifier.doIt()
+            except Exception:
+                modifier.undoIt()
+                raise
+            self._modifier = modifier
+
+        def redoIt(self) -> None:
+            self._modifier.doIt()
+
+        def undoIt(self) -> None:
+            self._modifier.undoIt()
+
+
+def _load_undo_plugin() -> bool:
+    """
+    Make sure API_RENAME_COMMAND is registered (loads the plugin once per session).
+    False if OpenMaya 2 or the plugin is unavailable: the caller uses the cmds engine.
+    """
+    if om is None:
+        return False
+    if cmds.pluginInfo(UNDO_PLUGIN_NAME, query=True, loaded=True):
+        return True
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), UNDO_PLUGIN_NAME + ".py")
+    try:
+        cmds.loadPlugin(path, quiet=True)
+    except RuntimeError as e:
+        cmds.warning(f"[ao_renamer_poc] {UNDO_PLUGIN_NAME} could not be loaded ({e}): using the cmds engine.")
+        return False
+    return True
+
+
+def _unplanned_result(item: RenamePlanItem) -> RenameItemResult:
+    return RenameItemResult(
+        node=item.node, old_name=item.node, new_name=None,
+        status=item.status if item.status != "planned" else STATUS_SKIPPED,
+        message=item.message or "New name is empty."
+    )
+
+
+def _renamed_result(item: RenamePlanItem, renamed_node: str) -> RenameItemResult:
+    new_short = _short_name(renamed_node)
+    message = _renamed_message(item.index)
+    if item.message:
+        # planning detail, e.g. the node holding a wanted name
+        message = f"{item.message}, {message}" if message else item.message
+    if new_short == item.new_name:
+        new_short = item.new_name  # share the plan's string
+    else:
+        message += f" (planned {item.new_name}, Maya used {new_short})"
+
+    return RenameItemResult(
+        node=renamed_node, old_name=item.node, new_name=new_short,
+        status=STATUS_RENAMED, message=message
+    )
+
+
+def _renamed_message(index: Optional[int]) -> str:
+    return f"Used index: {index}" if index is not None else ""
+
+
+def _apply_plan_cmds(
+    plan: RenamePlan,
+    on_result: Optional[Callable[[RenamePlanItem, RenameItemResult], None]] = None,
+) -> RenameResults:
+    """
+    cmds engine: one cmds.rename per step (one undo entry each).
+    Results in plan item order (every item gets exactly one).
+    on_result (journal): called with each result as it is produced.
+    """
+    results = RenameResults(len(plan.items))
+    for i, result in _iter_apply_plan_cmds(plan):
+        results.set(i, result, plan.items[i].index)
+        if on_result is not None:
+            on_result(plan.items[i], result)
+    return results
+
+
+def _iter_apply_plan_cmds(
+    plan: RenamePlan,
+    journal: Optional[List[Tuple[int, str]]] = None,
+) -> Iterator[Tuple[int, RenameItemResult]]:
+    """
+    Yields (item index, result): unplanned items first, then each item once its
+    final rename step has run (or failed).
+    Stored paths go stale once the node or an ancestor is renamed; only those
+    items are resolved again, from their uuid.
+    """
+    done = [False] * len(plan.items)
+    renamed_paths = set()  # planning-time paths already renamed
+
+    for i, item in enumerate(plan.items):
+        if item.status != "planned" or not item.new_name:
+            done[i] = True
+            yield i, _unplanned_result(item)
+
+    for i, name in plan.steps:
+        item = plan.items[i]
+        if done[i]:
+            # failed earlier (e.g. on its temporary rename)
+            continue
+
+        try:
+            node = _resolve_current_path(item, renamed_paths)
+
+            # Perform rename (cmds.rename raises if the node is gone)
+            renamed_node = cmds.rename(node, name)
+            renamed_paths.add(item.node)
+            if journal is not None:
+                journal.append((i, _short_name(node)))
+            if name == item.new_name:
+                done[i] = True
+                yield i, _renamed_result(item, renamed_node)
 
         except Exception as e:
-            results.append(RenameItemResult(
-                node=node, old_name=old, new_name=None,
-                status="failed", message=str(e)
+            done[i] = True
+            yield i, RenameItemResult(
+                node=item.node, old_name=item.node, new_name=None,
+                status=STATUS_FAILED, message=str(e)
+            )
+
+
+def _apply_plan_api(
+    plan: RenamePlan,
+    on_result: Optional[Callable[[RenamePlanItem, RenameItemResult], None]] = None,
+) -> RenameResults:
+    """
+    OpenMaya 2 engine: queue every rename step on one MDagModifier and run a single doIt().
+    - Nodes are resolved to MObjects up front (MObjects survive renames)
+    - doIt() runs inside API_RENAME_COMMAND: the batch is one undo step
+    - If doIt() fails, the modifier is undone and the plan is applied with cmds
+    - on_result (journal): called for every item once doIt() has landed (all or nothing)
+    """
+    global _pending_api_modifier
+
+    modifier = om.MDagModifier()
+    sel = om.MSelectionList()
+    results = RenameResults(len(plan.items))
+    objects: Dict[int, object] = {}
+
+    for i, item in enumerate(plan.items):
+        if item.status != "planned" or not item.new_name:
+            results.set(i, _unplanned_result(item))
+            continue
+
+        try:
+            sel.clear()
+            sel.add(item.node)
+            objects[i] = sel.getDependNode(0)
+        except Exception as e:
+            results.set(i, RenameItemResult(
+                node=item.node, old_name=item.node, new_name=None,
+                status=STATUS_FAILED, message=str(e) or "Node does not exist."
             ))
-            # Even if failed, we still increment to avoid repeating same index forever
-            index += 1
 
-    summary = _summarize(rename_input, selected, targets, results)
-    return summary
+    for i, name in plan.steps:
+        if i in objects:
+            modifier.renameNode(objects[i], name)
 
+    _pending_api_modifier = modifier
+    try:
+        getattr(cmds, API_RENAME_COMMAND)()
+    except Exception:
+        # the command undid its partial doIt(); nothing was queued for undo
+        _pending_api_modifier = None
+        return _apply_plan_cmds(plan, on_result)
 
-def preview_names(rename_input: RenameInput) -> List[Tuple[str, str]]:
+    for i, obj in objects.items():
+        results.set(i, _renamed_result(plan.items[i], _api_node_name(obj)), plan.items[i].index)
+
+    if on_result is not None:
+        for item, result in zip(plan.items, results):
+            on_result(item, result)
+
+    return results
+
+
+def _api_node_name(obj) -> str:
     """
-    Preview rename results without executing rename.
-    Returns list of (node, preview_new_name).
-    - This preview uses collision avoidance against current scene names.
-    - It does not account for renames changing later collisions in sequence perfectly,
-      but it's good enough for UI preview in v0.1.0.
+    Current name of a renamed MObject: partial DAG path, or the plain name for DG nodes
+    (shadingEngine etc. from search / replace node_type or mapping rows have no DAG path).
     """
-    selected = _get_selection(long_name=True)
-    targets = _filter_transforms(selected)
+    if obj.hasFn(om.MFn.kDagNode):
+        return om.MDagPath.getAPathTo(obj).partialPathName()
+    return om.MFnDependencyNode(obj).name()
+
+
+@contextmanager
+def _traced_cmds(enabled: bool) -> Iterator[Optional[Any]]:
+    """
+    Route this module's cmds calls through ao_cmds_trace while the block runs.
+    Yields the CmdsStats, or None if tracing is off or unavailable.
+    """
+    if not enabled:
+        yield None
+        return
+    if ao_cmds_trace is None:
+        cmds.warning("[ao_renamer_poc] ao_cmds_trace not found on sys.path: tracing skipped.")
+        yield None
+        return
 
-    previews: List[Tuple[str, str]] = []
-    index = max(1, int(rename_input.start_index))
+    with ao_cmds_trace.trace_cmds(sys.modules[__name__]) as stats:
+        yield stats
 
-    for _ in targets:
-        new_name, used_index = _build_unique_name(rename_input, index)
-        previews.append(("", new_name))
-        index = used_index + 1
 
-    # Attach node names after (keep simple)
-    return [(targets[i], previews[i][1]) for i in range(len(targets))]
+@contextmanager
+def _suspended_refresh(enabled: bool = True) -> Iterator[None]:
+    """
+    Suspend viewport redraw (cmds.refresh) and outliner repaint while renaming.
+    Both are restored in finally, even if the rename raises.
+    """
+    if not enabled:
+        yield
+        return
+
+    outliners = _outliner_widgets()
+    for w in outliners:
+        w.setUpdatesEnabled(False)
+    cmds.refresh(suspend=True)
+    try:
+        yield
+    finally:
+        cmds.refresh(suspend=False)
+        for w in outliners:
+            try:
+                w.setUpdatesEnabled(True)
+            except RuntimeError:
+                # widget deleted meanwhile
+                pass
+
+
+def _outliner_widgets() -> list:
+    """
+    Qt widgets of the open outliner editors ([] without a Maya UI / PySide6).
+    """
+    try:
+        import maya.OpenMayaUI as omui
+        from PySide6 import QtWidgets
+        from shiboken6 import wrapInstance
+    except ImportError:
+        return []
+
+    widgets = []
+    for panel in cmds.getPanel(type="outlinerPanel") or []:
+        editor = cmds.outlinerPanel(panel, query=True, outlinerEditor=True)
+        ptr = omui.MQtUtil.findControl(editor) if editor else None
+        if ptr:
+            widgets.append(wrapInstance(int(ptr), QtWidgets.QWidget))
+    return widgets
+
+
+# ----------------------------
+# Two-phase ordering
+# ----------------------------
+
+def _order_two_phase_steps(
+    items: List[RenamePlanItem],
+    registry: NameRegistry,
+    siblings: bool = False,
+) -> List[Tuple[int, str]]:
+    """
+    Execution order for a two-phase plan (pure Python).
+    - A node whose new name is still held by another pending target waits for it
+      (chains like 01..50 -> 02..51 just run back to front, no extra renames)
+    - A cycle (swap) is broken by moving one node to a temporary name first
+    - siblings: names only block under the same parent (per-parent / per-root
+      scopes, where short names repeat across the scene)
+    Returns [(item index, name)], temporary renames included.
+    """
+    if siblings:
+        def _key(node: str, short: str) -> str:
+            return node.rpartition("|")[0] + "|" + short
+    else:
+        def _key(node: str, short: str) -> str:
+            return short
+
+    # current name key -> pending item indices holding it
+    holders: Dict[str, List[int]] = {}
+    current: Dict[int, str] = {}
+    for i, item in enumerate(items):
+        if item.status == "planned" and item.new_name:
+            current[i] = key = _key(item.node, _short_name(item.node))
+            holders.setdefault(key, []).append(i)
+
+    def _release(i: int) -> None:
+        lst = holders.get(current[i])
+        if lst and i in lst:
+            lst.remove(i)
+
+    def _blocker(i: int) -> Optional[int]:
+        for j in holders.get(_key(items[i].node, items[i].new_name), ()):
+            if j != i:
+                return j
+        return None
+
+    steps: List[Tuple[int, str]] = []
+    state = [0] * len(items)  # 0: pending, 1: on stack, 2: done
+    temp_index = 0
+
+    for root, root_item in enumerate(items):
+        if state[root] or root_item.status != "planned" or not root_item.new_name:
+            continue
+
+        stack = [root]
+        state[root] = 1
+        while stack:
+            i = stack[-1]
+            j = _blocker(i)
+
+            if j is None:
+                stack.pop()
+                steps.append((i, items[i].new_name))
+                _release(i)
+                state[i] = 2
+            elif state[j] == 0:
+                state[j] = 1
+                stack.append(j)
+            else:
+                # j is waiting on i (cycle): park j under a temporary name
+                temp_index += 1
+                temp = f"{TEMP_NAME_PREFIX}{temp_index}"
+                while temp in registry or _key(items[j].node, temp) in holders:
+                    temp_index += 1
+                    temp = f"{TEMP_NAME_PREFIX}{temp_index}"
+                steps.append((j, temp))
+                _release(j)
+
+    return steps
 
 
 # ----------------------------
@@ -160,26 +2081,37 @@ def _filter_transforms(nodes: List[str]) -> List[str]:
     Keep only transform nodes.
     - If a shape is selected, convert to its parent transform.
     - Remove duplicates while preserving order.
+    Fixed number of Maya calls regardless of selection size:
+    one ls(showType) over the nodes and their parent paths.
+    Expects long names (as returned by _get_selection(long_name=True)).
     """
+    if not nodes:
+        return []
+
+    # Components ("|pCube1|pCube1Shape.vtx[0:7]") resolve to their node
+    paths = [n.split(".", 1)[0] for n in nodes]
+    # Parent derived from the DAG path itself (no listRelatives per node)
+    parents = [p.rsplit("|", 1)[0] if p.count("|") > 1 else "" for p in paths]
+
+    query = list(dict.fromkeys(p for p in paths + parents if p))
+    listed = cmds.ls(query, long=True, showType=True) or []
+    node_types: Dict[str, str] = dict(zip(listed[0::2], listed[1::2]))
+
     seen = set()
     out: List[str] = []
 
-    for n in nodes:
-        if not cmds.objExists(n):
+    for p, parent in zip(paths, parents):
+        node_type = node_types.get(p)
+        if node_type is None:
             continue
 
-        node_type = cmds.nodeType(n)
         if node_type == "transform":
-            t = n
+            t = p
         else:
-            # If it's a shape, try to get its parent transform
-            parents = cmds.listRelatives(n, parent=True, fullPath=True) or []
-            t = parents[0] if parents else None
-
-        if not t or not cmds.objExists(t):
-            continue
+            # If it's a shape, use its parent transform
+            t = parent if node_types.get(parent) == "transform" else None
 
-        if cmds.nodeType(t) != "transform":
+        if not t:
             continue
 
         if t not in seen:
@@ -189,122 +2121,619 @@ def _filter_transforms(nodes: List[str]) -> List[str]:
     return out
 
 
-def _sanitize_token(s: str) -> str:
+def _get_uuids(nodes: List[str]) -> List[str]:
+    """
+    UUIDs for nodes in one ls call ("" for each if they cannot be matched up).
+    """
+    if not nodes:
+        return []
+    uuids = cmds.ls(nodes, uuid=True) or []
+    if len(uuids) != len(nodes):
+        return [""] * len(nodes)
+    return uuids
+
+
+def _get_world_positions(nodes: List[str]) -> List[float]:
+    """
+    World-space rotate pivots of nodes as one flat [x, y, z, ...] list, in one xform query.
+    If the batched result cannot be matched up with the nodes, each node is queried on its own;
+    [] only if a node cannot be queried at all (the plan then notes the kept selection order).
+    """
+    if not nodes:
+        return []
+    values = cmds.xform(nodes, query=True, worldSpace=True, rotatePivot=True) or []
+    if len(values) == 3 * len(nodes):
+        return values
+
+    values = []
+    for node in nodes:
+        try:
+            point = cmds.xform(node, query=True, worldSpace=True, rotatePivot=True) or []
+        except (RuntimeError, ValueError):
+            return []
+        if len(point) != 3:
+            return []
+        values.extend(point)
+    return values
+
+
+def _validate_order(rename_input: RenameInput) -> None:
+    """
+    Raise ValueError for an unknown order or order_axis, instead of silently
+    numbering in another order.
+    """
+    if rename_input.order not in _ORDERS:
+        raise ValueError(f"Unknown order: {rename_input.order!r} (expected one of {', '.join(_ORDERS)})")
+    if rename_input.order == ORDER_AXIS and str(rename_input.order_axis).lower() not in ("x", "y", "z"):
+        raise ValueError(f"Invalid order axis: {rename_input.order_axis!r} (expected x, y or z)")
+
+
+def _target_order(nodes: List[str], rename_input: RenameInput, positions: List[float]) -> List[int]:
+    """
+    Indices of nodes in index-assignment order (RenameInput.order).
+    - Spatial orders sort the flat position list (vectorized with NumPy if available);
+      without usable positions the selection order is kept (_build_plan notes it per item)
+    - Stable: ties keep the selection order, also when reversed
+    """
+    count = len(nodes)
+    mode = rename_input.order
+    reverse = rename_input.order_reverse
+
+    if mode in _SPATIAL_ORDERS:
+        if len(positions) != 3 * count:
+            return list(range(count))
+        axis = "xyz".find(str(rename_input.order_axis).lower())  # checked by _validate_order
+        pivot = [float(v) for v in rename_input.order_pivot]
+
+        if np is not None:
+            points = np.asarray(positions, dtype=np.float64).reshape(count, 3)
+            if mode == ORDER_AXIS:
+                keys = points[:, axis]
+            else:
+                keys = np.square(points - np.asarray(pivot)).sum(axis=1)
+            return np.argsort(-keys if reverse else keys, kind="stable").tolist()
+
+        if mode == ORDER_AXIS:
+            keys = positions[axis::3]
+        else:
+            px, py, pz = pivot
+            xs, ys, zs = positions[0::3], positions[1::3], positions[2::3]
+            keys = [(x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2 for x, y, z in zip(xs, ys, zs)]
+    elif mode == ORDER_DEPTH:
+        keys = [n.count("|") for n in nodes]
+    elif mode == ORDER_NATURAL:
+        keys = [_natural_key(_short_name(n)) for n in nodes]
+    else:
+        return list(range(count))
+
+    return sorted(range(count), key=keys.__getitem__, reverse=reverse)
+
+
+def _natural_key(name: str) -> Tuple[Any, ...]:
+    """
+    Sort key with digit runs as numbers: "ctrl_2" < "ctrl_10" (case-insensitive).
+    """
+    parts = _DIGIT_RUN_RE.split(name)
+    parts[0::2] = [p.lower() for p in parts[0::2]]
+    parts[1::2] = [int(p) for p in parts[1::2]]
+    return tuple(parts)
+
+
+def _is_path_stale(path: str, renamed_paths: set) -> bool:
+    """
+    True if the node itself or one of its ancestors was renamed in this run.
+    """
+    if path in renamed_paths:
+        return True
+    pos = path.find("|", 1)
+    while pos != -1:
+        if path[:pos] in renamed_paths:
+            return True
+        pos = path.find("|", pos + 1)
+    return False
+
+
+def _resolve_current_path(item: RenamePlanItem, renamed_paths: set) -> str:
+    """
+    Current long path of a plan item.
+    Planning-time path unless it went stale in this run, then one ls by uuid.
+    """
+    if item.uuid and renamed_paths and _is_path_stale(item.node, renamed_paths):
+        found = cmds.ls(item.uuid, long=True) or []
+        if found:
+            return found[0]
+    return item.node
+
+
+# ASCII characters that are illegal in Maya node names -> "_"
+_ILLEGAL_ASCII_TABLE = str.maketrans({
+    chr(c): "_" for c in range(128)
+    if not (chr(c).isalnum() or chr(c) == "_")
+})
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+_UNDERSCORE_RUN_RE = re.compile(r"_{2,}")
+_DIGIT_RUN_RE = re.compile(r"(\d+)")
+# Whole node name (no namespace): must not start with a digit
+_LEGAL_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# PREFIX_base[_more][_suffix]_NN with legal tokens: groups (index head, suffix or None, index digits)
+_LINT_CONFORMING_RE = re.compile(
+    r"^((?:[A-Za-z0-9_]+:)*[A-Z][A-Z0-9]*_[A-Za-z0-9]+(?:_[A-Za-z0-9]+)*?(?:_([A-Za-z0-9]+))?_)([0-9]+)$"
+)
+
+
+def _sanitize_chars(s: str, non_ascii: str = NON_ASCII_REPLACE) -> str:
+    """
+    Replace every character Maya rejects in a node name.
+    - ASCII: one str.translate pass ("-", ".", ":", " ", ... -> "_")
+    - non-ASCII: see NON_ASCII_* (Japanese pasted from the asset DB, full-width, accents)
+    """
+    if not s.isascii():
+        if non_ascii == NON_ASCII_ASCII:
+            s = unicodedata.normalize("NFKD", s)
+            s = _NON_ASCII_RE.sub("", s)
+        elif non_ascii == NON_ASCII_STRIP:
+            s = _NON_ASCII_RE.sub("", s)
+        else:
+            s = _NON_ASCII_RE.sub("_", s)
+    return s.translate(_ILLEGAL_ASCII_TABLE)
+
+
+def _sanitize_token(s: str, non_ascii: str = NON_ASCII_REPLACE) -> str:
     """
     Sanitize for Maya node name tokens.
-    v0.1.0: minimal sanitization:
-      - strip spaces
-      - replace spaces with underscore
-      - remove leading/trailing underscores
-    (You can expand later: illegal chars, unicode handling, etc.)
+      - strip surrounding whitespace
+      - illegal characters -> "_" (see _sanitize_chars)
+      - collapse "__" runs, remove leading/trailing underscores
     """
     if s is None:
         return ""
-    s = str(s).strip()
-    s = s.replace(" ", "_")
+    s = _sanitize_chars(str(s).strip(), non_ascii)
+    s = _UNDERSCORE_RUN_RE.sub("_", s)
     s = s.strip("_")
     return s
 
 
-def _format_prefix(prefix: str) -> str:
-    p = _sanitize_token(prefix)
+def _format_prefix(prefix: str, non_ascii: str = NON_ASCII_REPLACE) -> str:
+    p = _sanitize_token(prefix, non_ascii)
     return p.upper() if p else ""
 
 
-def _format_suffix(suffix: str) -> str:
-    s = _sanitize_token(suffix)
+def _format_suffix(suffix: str, non_ascii: str = NON_ASCII_REPLACE) -> str:
+    s = _sanitize_token(suffix, non_ascii)
     return s.lower() if s else ""
 
 
-def _format_base(base_name: str) -> str:
-    return _sanitize_token(base_name)
+def _format_base(base_name: str, non_ascii: str = NON_ASCII_REPLACE) -> str:
+    return _sanitize_token(base_name, non_ascii)
 
 
-def _compose_name(prefix: str, base_name: str, suffix: str, index: int, padding: int) -> str:
+def _validate_pattern(head: str, tail: str) -> Optional[str]:
     """
-    Compose name tokens with "_" auto insertion.
-    Empty tokens are ignored.
+    Planning-time check of a name pattern (instead of one cmds.rename failure per node).
+    Returns an error message, or None if names of this pattern are legal.
     """
-    tokens = []
+    sample = (head + "0" + tail).rsplit(":", 1)[-1]
+    if _LEGAL_NAME_RE.match(sample):
+        return None
+    if sample[:1].isdigit():
+        return f"Name would start with a digit: {head}<index>{tail}"
+    return f"Name has illegal characters: {head}<index>{tail}"
 
-    p = _format_prefix(prefix)
-    b = _format_base(base_name)
-    s = _format_suffix(suffix)
 
-    if p:
-        tokens.append(p)
-    if b:
-        tokens.append(b)
-    if s:
-        tokens.append(s)
+def _validate_name(name: str) -> Optional[str]:
+    """
+    Planning-time check of one full name (namespace allowed).
+    Returns an error message, or None if Maya accepts it.
+    """
+    leaf = name.rsplit(":", 1)[-1]
+    if not leaf:
+        return "New name is empty."
+    if _LEGAL_NAME_RE.match(leaf):
+        return None
+    if leaf[:1].isdigit():
+        return f"Name would start with a digit: {name}"
+    return f"Name has illegal characters: {name}"
+
+
+def _replace_names(
+    nodes: List[str],
+    regex: "re.Pattern[str]",
+    replacement: str,
+    max_replacements: int,
+    non_ascii: str,
+) -> List[Optional[str]]:
+    """
+    New short name per node (None if unchanged), one pass over the name list.
+    The regex sees the name without namespace; the namespace is kept.
+    """
+    sub = regex.sub
+    count = max(0, int(max_replacements))
+    out: List[Optional[str]] = []
+    append = out.append
+
+    for node in nodes:
+        short = node.rsplit("|", 1)[-1]
+        namespace, sep, leaf = short.rpartition(":")
+        new_leaf = sub(replacement, leaf, count)
+        if new_leaf == leaf:
+            append(None)
+            continue
+        new_leaf = _sanitize_chars(new_leaf, non_ascii)
+        append(None if new_leaf == leaf else namespace + sep + new_leaf)
 
-    # Index token is always appended (renamer spec)
-    idx_token = str(int(index)).zfill(max(1, int(padding)))
-    tokens.append(idx_token)
+    return out
 
-    return "_".join(tokens)
+
+def _plan_desired_names(
+    inputs: Any,
+    scanned: List[str],
+    changes: List[Tuple[str, str, str]],
+    registry: NameRegistry,
+    scene_names: Optional[List[str]] = None,
+) -> RenamePlan:
+    """
+    RenamePlan for explicit (node, uuid, desired name) changes (search / replace, lint fixes, mapping).
+    - Every changed node's current name counts as free (two-phase ordering)
+    - A desired name used outside the batch, or wanted twice, gets the next free
+      number from an IndexAllocator ("arm_03" -> "arm_NN", "arm" -> "arm_01")
+    - Free desired names are placed first (in change order), numbering comes after:
+      a renumbered node never takes a name another change asked for
+    - scene_names (long names, mapping): a DAG name is only taken by a sibling
+      (parent path + short name) or a DG node, so repeated short names round-trip;
+      without it short names are unique scene-wide
+    - Children are renamed before their parents, so planned paths do not go stale
+    - A renumbered item's message names the node holding the wanted name
+      (one ls for all holders outside the batch)
+    """
+    # scope key per node: parent path of a DAG node (sibling scopes), None = whole scene
+    scopes: Dict[Optional[str], NameRegistry] = {None: registry}
+    if scene_names is None:
+        def _scope_key(node: str) -> Optional[str]:
+            return None
+    else:
+        def _scope_key(node: str) -> Optional[str]:
+            parent, sep, _ = node.rpartition("|")
+            return parent if sep else None
+
+        shared = NameRegistry()  # DG names clash in every scope
+        for node, _, _ in changes:
+            key = _scope_key(node)
+            if key is not None and key not in scopes:
+                scopes[key] = _ScopeRegistry(shared)
+        for name in scene_names:
+            parent, sep, _ = name.rpartition("|")
+            if not sep:
+                shared.add(name)
+            elif parent in scopes:
+                scopes[parent].add(name)
+
+    keys = [_scope_key(node) for node, _, _ in changes]
+    for key, (node, _, _) in zip(keys, changes):
+        registry.discard(node)
+        if key is not None:
+            scopes[key].discard(node)
+
+    # one allocator per scope and numbering head; a head never ends in a digit,
+    # so a name belongs to the allocator of its digit-stripped stem (no pattern scan)
+    wanted = Counter((key, new_name) for key, (_, _, new_name) in zip(keys, changes))
+    allocators: Dict[Optional[str], Dict[str, IndexAllocator]] = {}
+    for (key, new_name), count in wanted.items():
+        if count > 1 or new_name in scopes[key]:
+            head, padding, _ = _collision_pattern(new_name)
+            by_head = allocators.setdefault(key, {})
+            if head not in by_head:
+                by_head[head] = IndexAllocator(head, padding)
+    for key, by_head in allocators.items():
+        for name in scopes[key].names():
+            alloc = by_head.get(name.rstrip("0123456789"))
+            if alloc is not None:
+                alloc.mark_name(name)
+
+    items: List[Optional[RenamePlanItem]] = [None] * len(changes)
+    claimed: Dict[Tuple[Optional[str], str], str] = {}  # (scope, planned name) -> batch node that takes it
+    collisions: List[Tuple[RenamePlanItem, Optional[str], str]] = []  # (renumbered item, scope, wanted name)
+
+    # failing nodes keep their names: back in the registry before anything is placed
+    for i, (key, (node, uuid, new_name)) in enumerate(zip(keys, changes)):
+        error = _validate_name(new_name)
+        if error:
+            scopes[key].add(node)
+            if key is not None:
+                registry.add(node)
+            items[i] = RenamePlanItem(node=node, new_name=None, uuid=uuid, status="failed", message=error)
+
+    renumber: List[int] = []
+    for i, (key, (node, uuid, new_name)) in enumerate(zip(keys, changes)):
+        if items[i] is not None:
+            continue
+        scope_registry = scopes[key]
+        if new_name in scope_registry:
+            renumber.append(i)
+            continue
+        scope_registry.add(new_name)
+        if key is not None:
+            registry.add(new_name)  # temporary names stay unique scene-wide
+        claimed[(key, new_name)] = node
+        items[i] = RenamePlanItem(node=node, new_name=new_name, uuid=uuid)
+
+    for i in renumber:
+        key, (node, uuid, taken) = keys[i], changes[i]
+        scope_registry = scopes[key]
+        head, _, start = _collision_pattern(taken)
+        new_name, index = _build_unique_name(start, scope_registry, allocators[key][head])
+        scope_registry.add(new_name)
+        if key is not None:
+            registry.add(new_name)
+        claimed[(key, new_name)] = node
+        items[i] = RenamePlanItem(node=node, new_name=new_name, uuid=uuid, index=index)
+        collisions.append((items[i], key, taken))
+
+    if collisions:
+        holders = {(key, name): claimed[(key, name)] for _, key, name in collisions if (key, name) in claimed}
+        outside = [name for _, key, name in collisions if (key, name) not in holders]
+        changed = {node for node, _, _ in changes}
+        for path in (cmds.ls(list(dict.fromkeys(outside)), long=True) or []) if outside else []:
+            if path not in changed:
+                holders.setdefault((_scope_key(path), _short_name(path)), path)
+        for item, key, name in collisions:
+            holder = holders.get((key, name)) or holders.get((None, name))
+            item.message = f"{name} is taken by {holder}" if holder else f"{name} is taken"
+
+    # deepest first: renaming a child never changes its parent's path
+    order = sorted(range(len(changes)), key=lambda i: changes[i][0].count("|"), reverse=True)
+    items = [items[i] for i in order]
+    return RenamePlan(
+        inputs=inputs,
+        selected=scanned,
+        targets=[changes[i][0] for i in order],
+        items=items,
+        steps=_order_two_phase_steps(items, registry, siblings=scene_names is not None),
+    )
 
 
-def _short_name_exists(name: str) -> bool:
+def _collision_pattern(name: str) -> Tuple[str, int, int]:
+    """
+    (head, padding, start index) for numbering a taken name:
+    a trailing number keeps counting ("arm_03" -> "arm_" + 03..), otherwise "_01" is appended.
     """
-    Maya name collisions are effectively on short name level in many operations.
-    We'll check both exact and wildcard matches to be safe.
+    stem = name.rstrip("0123456789")
+    digits = name[len(stem):]
+    if digits and stem and not stem.endswith(":"):
+        return stem, len(digits), int(digits)
+    return name + "_", 2, 1
 
-    - cmds.objExists("name") checks existence of that name (short or long)
-    - But long path could exist even if short name is ambiguous.
-    So we also check cmds.ls(name) length.
+
+def _short_name(name: str) -> str:
+    """
+    Leaf of a DAG path ("|grp|GEO_arm_01" -> "GEO_arm_01").
+    Namespace is kept, so "ns:GEO_arm_01" does not collide with "GEO_arm_01".
     """
     if not name:
-        return False
-    if cmds.objExists(name):
-        return True
-    matches = cmds.ls(name) or []
-    return len(matches) > 0
+        return ""
+    return name[name.rfind("|") + 1:]
+
+
+def _parent_name(node: str) -> str:
+    """
+    Short name of the DAG parent, without namespace ("" for world children).
+    """
+    if node.count("|") < 2:
+        return ""
+    return node.rsplit("|", 2)[-2].rsplit(":", 1)[-1]
+
+
+def _get_shape_types(nodes: List[str]) -> Dict[str, str]:
+    """
+    Node type of each transform's first shape, in two Maya calls.
+    Transforms without shapes are left out (callers default to "transform").
+    """
+    if not nodes:
+        return {}
+    shapes = cmds.listRelatives(nodes, shapes=True, fullPath=True) or []
+    if not shapes:
+        return {}
+    listed = cmds.ls(shapes, long=True, showType=True) or []
+
+    out: Dict[str, str] = {}
+    for shape, node_type in zip(listed[0::2], listed[1::2]):
+        out.setdefault(shape.rsplit("|", 1)[0], node_type)
+    return out
+
+
+def _create_allocators(
+    patterns: List[Tuple[str, str]],
+    padding: int,
+    registry: NameRegistry,
+    use_high_water_mark: bool,
+    snapshot: Optional[SceneSnapshot] = None,
+) -> _AllocatorPool:
+    """
+    One allocator per (head, tail) pattern of the run.
+    - use_high_water_mark and a stored mark: no scan at all
+    - a single pattern: one wildcard ls
+    - many patterns (per-node templates) or a snapshot: one pass over the registry
+    """
+    pool = _AllocatorPool()
+    if not use_high_water_mark:
+        marks = {}
+    elif snapshot is None:
+        marks = _load_high_water_marks()
+    else:
+        marks = snapshot.high_water_marks
+
+    scan: List[Tuple[str, str]] = []
+    for head, tail in patterns:
+        hwm = marks.get(_high_water_mark_key(head, tail, padding))
+        if hwm is not None:
+            pool.add(IndexAllocator.from_high_water_mark(head, padding, hwm, tail=tail))
+        else:
+            scan.append((head, tail))
+
+    if len(scan) == 1 and snapshot is None:
+        head, tail = scan[0]
+        pool.add(IndexAllocator.from_scene(head, padding, tail=tail))
+    elif scan:
+        for head, tail in scan:
+            pool.add(IndexAllocator(head, padding, tail=tail))
+        for name in registry.names():
+            pool.mark_name(name)
+
+    return pool
+
+
+def _create_scopes(
+    scope: str,
+    targets: List[str],
+    patterns: List[Tuple[str, str]],
+    errors: Dict[Tuple[str, str], Optional[str]],
+    padding: int,
+    names: List[str],
+) -> Tuple[List[str], Dict[str, Tuple[NameRegistry, _AllocatorPool]]]:
+    """
+    Per-scope name sets and allocators for SCOPE_PARENT / SCOPE_ROOT.
+    - SCOPE_PARENT: every target is numbered among its siblings (key: parent path)
+    - SCOPE_ROOT: a selected root (no selected ancestor) is numbered among its
+      siblings, every other target inside its root (key: root path)
+    - One pass over the scene's long names fills every scope (children are
+      read off the DAG paths, no listRelatives per parent)
+    - DG node names clash everywhere and are shared by all scopes
+    Counters always come from the scope's names (use_high_water_mark is ignored).
+    Returns (scope key per target, {key: (registry, pool)}).
+    """
+    keys = _scope_keys(scope, targets)
+    sibling_keys = set()
+    root_keys = set()
+    for node, key in zip(targets, keys):
+        (sibling_keys if key == node.rpartition("|")[0] else root_keys).add(key)
+
+    shared = NameRegistry()
+    scopes: Dict[str, Tuple[NameRegistry, _AllocatorPool]] = {
+        key: (_ScopeRegistry(shared), _AllocatorPool()) for key in dict.fromkeys(keys)
+    }
+
+    for name in names:
+        parent, sep, _ = name.rpartition("|")
+        if not sep:
+            shared.add(name)
+            continue
+        if parent in sibling_keys:
+            scopes[parent][0].add(name)
+        if root_keys:
+            # inside a root: the root is one of the path's ancestors
+            path = parent
+            while path and path not in root_keys:
+                path = path.rpartition("|")[0]
+            if path:
+                scopes[path][0].add(name)
+
+    for key, pattern in zip(keys, patterns):
+        if errors[pattern] is None:
+            pool = scopes[key][1]
+            try:
+                pool.get(*pattern)
+            except KeyError:
+                pool.add(IndexAllocator(pattern[0], padding, tail=pattern[1]))
+    for registry, pool in scopes.values():
+        for name in registry.names():
+            pool.mark_name(name)
+
+    return keys, scopes
+
+
+def _scope_keys(scope: str, targets: List[str]) -> List[str]:
+    """
+    Scope key per target for SCOPE_PARENT / SCOPE_ROOT: the parent path, or the
+    topmost selected ancestor (root path) for a target inside a selected root.
+    """
+    target_set = set(targets)
+    keys: List[str] = []
+    for node in targets:
+        key = parent = node.rpartition("|")[0]
+        if scope == SCOPE_ROOT:
+            path = parent
+            while path:
+                if path in target_set:
+                    key = path
+                path = path.rpartition("|")[0]
+        keys.append(key)
+    return keys
+
+
+def _namespace_prefix(node: str) -> str:
+    """
+    "ns:" of a node's short name ("" in the root namespace).
+    """
+    namespace, sep, _ = _short_name(node).rpartition(":")
+    return namespace + sep
+
+
+def _high_water_mark_key(head: str, tail: str, padding: int) -> str:
+    key = f"{HWM_FILEINFO_PREFIX}{head}#{padding}"
+    return f"{key}#{tail}" if tail else key
 
 
-def _build_unique_name(rename_input: RenameInput, start_index: int) -> Tuple[str, int]:
+def _load_high_water_marks() -> Dict[str, int]:
     """
-    Generate a unique name by incrementing index until unused.
+    All stored high-water marks in one fileInfo query.
+    """
+    values = cmds.fileInfo(query=True) or []
+    marks: Dict[str, int] = {}
+    for key, value in zip(values[0::2], values[1::2]):
+        if key.startswith(HWM_FILEINFO_PREFIX):
+            try:
+                marks[key] = int(value)
+            except ValueError:
+                pass
+    return marks
+
+
+def _store_high_water_marks(marks: Dict[str, int]) -> None:
+    for key, hwm in marks.items():
+        if hwm > 0:
+            cmds.fileInfo(key, str(hwm))
+
+
+def _build_unique_name(
+    start_index: int,
+    registry: NameRegistry,
+    allocator: IndexAllocator,
+) -> Tuple[str, int]:
+    """
+    Take the next free index from the allocator (no linear probing).
     Returns (unique_name, used_index).
+    The registry is still checked, because a high-water-mark allocator has not scanned the scene.
     """
     idx = max(1, int(start_index))
-    padding = max(1, int(rename_input.padding))
 
-    # In v0.1.0, we treat uniqueness by short-name existence check.
-    # For DAG, Maya can allow same short name in different groups,
-    # but rename often becomes ambiguous and is risky.
-    # So we enforce scene-unique short name.
+    # Uniqueness is a short-name check against the registry of the node's scope:
+    # the whole scene by default (RenameInput.scope), so a short name never becomes
+    # ambiguous; SCOPE_PARENT / SCOPE_ROOT registries only hold their siblings / hierarchy.
     while True:
-        candidate = _compose_name(
-            prefix=rename_input.prefix,
-            base_name=rename_input.base_name,
-            suffix=rename_input.suffix,
-            index=idx,
-            padding=padding,
-        )
+        idx = allocator.allocate(idx)
+        candidate = allocator.format(idx)
 
-        if not _short_name_exists(candidate):
+        if candidate not in registry:
             return candidate, idx
 
         idx += 1
 
-        # Safety break (avoid infinite loop)
-        if idx > 999999:
-            raise RuntimeError("Could not find unique name (index overflow).")
 
-
-def _summarize(rename_input: RenameInput, selected: List[str], targets: List[str], results: List[RenameItemResult]) -> RenameSummary:
-    renamed = sum(1 for r in results if r.status == "renamed")
-    skipped = sum(1 for r in results if r.status == "skipped")
-    failed = sum(1 for r in results if r.status == "failed")
+def _summarize(
+    rename_input: RenameInput,
+    selected: List[str],
+    targets: List[str],
+    results: Union[RenameResults, Sequence[RenameItemResult]],
+) -> RenameSummary:
+    # counters are kept by the store, no pass over the results
+    results = RenameResults.from_results(results)
 
     return RenameSummary(
         inputs=rename_input,
         total_selected=len(selected),
         total_targets=len(targets),
-        renamed=renamed,
-        skipped=skipped,
-        failed=failed,
+        renamed=results.renamed,
+        skipped=results.skipped,
+        failed=results.failed,
         results=results,
     )
 
@@ -313,6 +2742,20 @@ def _summarize(rename_input: RenameInput, selected: List[str], targets: List[str
 # Debug / Manual test (optional)
 # ----------------------------
 
+def _debug_print_lint(report: LintReport, limit: int = 50) -> None:
+    """
+    Helper for debugging in Script Editor.
+    """
+    print("=== ao_renamer_poc lint ===")
+    print(f"scanned: {report.scanned}, violations: {len(report.violations)}, "
+          f"duplicates: {len(report.duplicates)}, gapped patterns: {len(report.gaps)}, "
+          f"fixes planned: {len(report.fix_plan.steps)}")
+    for v in report.violations[:limit]:
+        print(f"[{', '.join(v.rules)}] {v.node} -> {v.suggestion}")
+    for head, runs in list(report.gaps.items())[:limit]:
+        print(f"[gap] {head}: " + ", ".join(f"{a}" if a == b else f"{a}-{b}" for a, b in runs))
+
+
 def _debug_print_summary(summary: RenameSummary) -> None:
     """
     Helper for debugging in Script Editor.
@@ -323,3 +2766,6 @@ def _debug_print_summary(summary: RenameSummary) -> None:
     print(f"renamed: {summary.renamed}, skipped: {summary.skipped}, failed: {summary.failed}")
     for r in summary.results:
         print(f"[{r.status}] {r.old_name} -> {r.new_name} | {r.message}")
+    if summary.cmds_stats is not None:
+        for line in summary.cmds_stats.report():
+            print(line)
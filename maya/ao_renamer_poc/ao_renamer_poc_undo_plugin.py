@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+ao_renamer_poc_undo_plugin.py
+
+Renamer PoC - Maya plugin for the OpenMaya 2 rename engine
+- Registers aoRenamerPocApiRename: one undoable command per ENGINE_API run
+- The command class lives in ao_renamer_poc_system (it hands over the prepared
+  MDagModifier); this file only registers it
+- Loaded on demand by ao_renamer_poc_system (cmds.loadPlugin), no manual setup
+"""
+
+import ao_renamer_poc_system as renamer_system
+
+
+# OpenMaya 2 plugin
+maya_useNewAPI = True
+
+
+def _create_api_rename_command():
+    # looked up at call time: a reloaded system module keeps working
+    return renamer_system._ApiRenameCommand()
+
+
+def initializePlugin(plugin) -> None:
+    om = renamer_system.om
+    om.MFnPlugin(plugin, "ao_scripts_toolbox", renamer_system.__version__).registerCommand(
+        renamer_system.API_RENAME_COMMAND, _create_api_rename_command
+    )
+
+
+def uninitializePlugin(plugin) -> None:
+    om = renamer_system.om
+    om.MFnPlugin(plugin).deregisterCommand(renamer_system.API_RENAME_COMMAND)